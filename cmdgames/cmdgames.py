@@ -11,16 +11,40 @@ This file contains the following classes:
 
 This file contains the following functions:
     * main - the main function of the script, which activates the game
+
+Run the script as `cmdgames.py serve [--host HOST] [--port PORT]` to host the
+games for remote players instead. Pass `--render ansi` to only redraw what
+changed on each turn, or `--render none` to draw nothing.
+
+Pass `--real-words` to only accept secret words in two-player Hangman that are
+in the dictionary, as described in hangman/dawg.py.
+
+Pass `--record PATH` to append every game of TicTacToe and Hangman that is
+played, here or by remote players, to a log, as described in records.py.
+
+Pass `--memory-report [PATH]` to write a JSON report of the memory that the
+game engines use instead of playing, as described in memreport.py.
+
+Run the script as `cmdgames.py analyze [FILE]` to analyze TicTacToe positions
+given as JSON Lines, as described in tictactoe/analyze.py.
 """
 
+import argparse
 import random
 import threading
 import time
 
 import sys
 import os
-import tictactoe.tictactoe as tictactoe
-import hangman.hangman as hangman
+sys.path.append(os.path.dirname(os.path.realpath(__file__)))
+import gameloader
+import render
+import records
+
+tictactoe = gameloader.load_game("tictactoe")
+hangman = gameloader.load_game("hangman")
+connectfour = gameloader.load_game("connectfour")
+ultimate = gameloader.load_game("tictactoe", "ultimate")
 
 TITLE = """
                      _        _ _                                              
@@ -33,13 +57,17 @@ TITLE = """
                                                |___/                           
 """
 
-def main():
+def main(real_words=False):
+    """Run the menu of the games until the user leaves. If (real_words) is True, the secret
+    words of two-player Hangman must be in the dictionary."""
     print(TITLE)
     print("Welcome to the Command Line Game Collection!")
     while (True):
         print("What would you like to play?")
         print("(0) Tic Tac Toe")
         print("(1) Hangman")
+        print("(2) Connect Four")
+        print("(3) Ultimate Tic Tac Toe")
         print("(x) Exit Command Line Game Collection")
         user = input("Enter your choice now: ").lstrip()
         print(".")
@@ -49,10 +77,46 @@ def main():
             if (int(user) == 0):
                 tictactoe.main()
             elif(int(user) == 1):
-                hangman.main()
+                hangman.main(real_words)
+            elif(int(user) == 2):
+                connectfour.main()
+            elif(int(user) == 3):
+                ultimate.main()
             print("Welcome back!")
         elif user == 'x':
             break
 
+def _parse_args():
+    """Parse the command-line arguments of the script and return them."""
+    parser = argparse.ArgumentParser(description="A collection of terminal-based games.")
+    parser.add_argument("--render", choices=render.MODES, default=None,
+                        help="how to draw the games: whole frames (plain), only what changed (ansi), or not at all (none)")
+    parser.add_argument("--real-words", action="store_true",
+                        help="only accept secret words in two-player Hangman that are in the dictionary")
+    parser.add_argument("--record", default=None, metavar="PATH",
+                        help="append every game of TicTacToe and Hangman that is played to the log at PATH")
+    parser.add_argument("--memory-report", nargs="?", const="-", default=None, metavar="PATH",
+                        help="write a JSON report of the memory used by the game engines to PATH, or to stdout")
+    commands = parser.add_subparsers(dest="command")
+    serve = commands.add_parser("serve", help="host the games for remote players over TCP")
+    serve.add_argument("--host", default="127.0.0.1", help="the address to listen on")
+    serve.add_argument("--port", type=int, default=4023, help="the port to listen on")
+    analyze = commands.add_parser("analyze", help="analyze TicTacToe positions given as JSON Lines")
+    gameloader.load_game("tictactoe", "analyze").add_arguments(analyze)
+    return parser.parse_args()
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    args = _parse_args()
+    render.configure(args.render)
+    if args.record is not None:
+        records.configure(args.record)
+    if args.memory_report is not None:
+        import memreport
+        memreport.write_report(args.memory_report)
+    elif args.command == "serve":
+        import server
+        server.serve(args.host, args.port)
+    elif args.command == "analyze":
+        gameloader.load_game("tictactoe", "analyze").run(args)
+    else:
+        main(args.real_words)
\ No newline at end of file
@@ -0,0 +1,174 @@
+"""Command-Line Connect Four Agents
+
+This file includes the agents which manage each game of Connect Four.
+
+There are three agents which can be imported to other files:
+    -SearchAgent, which plays the best move it finds within a depth or a time limit;
+    -RandomAgent, which plays randomly for all states;
+    -PlayerAgent, which is controlled by a user.
+"""
+
+from abc import ABC, abstractmethod
+import random
+import time
+import solver
+
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/..")
+import gameio
+
+class Agent(ABC):
+    """
+    An abstract method used to implement a Connect Four Agent
+
+    ...
+
+    Attributes
+    ----------
+
+    name : str
+        the string associated with this agent's ID
+
+    player : str
+        the symbol that represents this agent on the board
+
+    last_search : dict or None
+        the depth reached and the number of positions searched by the last move, if it was searched
+
+
+    Methods
+    -------
+
+    select_move(position, deadline=None)
+        Takes in a position (position) and returns the position that the game should progress to,
+        choosing it before the time.monotonic() (deadline) if one is given.
+    move_dialog(position, deadline=None)
+        The dialog of select_move(), for any gameio backend.
+    close()
+        Release any resources held by the agent.
+
+    """
+
+    @property
+    def name(self):
+        """the string associated with this agent's ID"""
+        return self._name
+
+    @property
+    def player(self):
+        """the symbol that represents this agent on the board"""
+        return self._player
+
+    @property
+    def last_search(self):
+        """the depth reached and the number of positions searched by the last move, if it was searched"""
+        return self._last_search
+
+    @abstractmethod
+    def __init__(self, name, player):
+        """
+        Parameters
+        ----------
+        name : str
+            The string associated with this agent's ID
+        player : str
+            The symbol that represents this agent on the board
+        """
+        self._name = name
+        self._player = player
+        self._last_search = None
+
+    @abstractmethod
+    def select_move(self, position, deadline=None):
+        """Takes in a position (position) and returns the position that the game should progress to.
+
+        Agents that search return the best choice they have found by the time.monotonic() (deadline),
+        if one is given.
+        """
+        pass
+
+    def move_dialog(self, position, deadline=None):
+        """Choose the position that the game should progress to from (position) by the time.monotonic()
+        (deadline) through the backend, so that a slow choice does not block it, and return it."""
+        return (yield gameio.call(self.select_move, position, deadline))
+
+    def close(self):
+        """Release any resources held by the agent."""
+        pass
+
+class SearchAgent(Agent):
+    def __init__(self, name, player, max_depth=None, time_limit=None, mistakes=0.0):
+        """
+        Parameters
+        ----------
+        name : str
+            The string associated with this agent's ID
+        player : str
+            The symbol that represents this agent on the board
+        max_depth : int
+            The number of moves that every search looks ahead, if it is limited
+        time_limit : float
+            The number of seconds that every search may take, if it is limited
+        mistakes : float
+            The chance of playing a random move instead of searching
+        """
+        super().__init__(name, player)
+        self._max_depth = max_depth
+        self._time_limit = time_limit
+        self._mistakes = mistakes
+        self._solver = solver.Solver()
+
+    def select_move(self, position, deadline=None):
+        """Takes in a position (position) and returns the position that the game should progress to.
+
+        Plays the best move found by a search that is deepened until the position is solved or
+        the depth or time limit is reached, and sometimes plays randomly instead. The search also
+        stops at the time.monotonic() (deadline), if it comes before the time limit.
+        """
+        self._last_search = None
+        if random.random() < self._mistakes:
+            return position.play(random.choice(position.columns()))
+        time_limit = self._time_limit
+        if deadline is not None:
+            left = max(0.0, deadline - time.monotonic())
+            time_limit = left if time_limit is None else min(time_limit, left)
+        nodes = self._solver.nodes
+        col, _, depth = self._solver.best_move(position, self._max_depth, time_limit)
+        self._last_search = {"depth": depth, "nodes": self._solver.nodes - nodes}
+        return position.play(col)
+
+class RandomAgent(Agent):
+    def __init__(self, name, player):
+        super().__init__(name, player)
+
+    def select_move(self, position, deadline=None):
+        """Takes in a position (position) and returns the position that the game should progress to.
+
+        Plays randomly.
+        """
+        return position.play(random.choice(position.columns()))
+
+class PlayerAgent(Agent):
+    def __init__(self, name, player):
+        super().__init__(name, player)
+
+    def select_move(self, position, deadline=None):
+        """Takes in a position (position) and returns the position that the game should progress to.
+
+        Choices are dictated by user input.
+        """
+        return gameio.run(self.move_dialog(position))
+
+    def move_dialog(self, position, deadline=None):
+        """Ask the user for their column from the position (position) and return the position it leads to.
+
+        The user is never hurried, so (deadline) is ignored.
+        """
+        while True:
+            col = yield from gameio.ask_number("Select a column: ", 1, len(position.board[0]),
+                                               "Sorry, that is not a valid column")
+            if position.can_play(col - 1):
+                return position.play(col - 1)
+            yield gameio.say("Sorry, that column is full!")
+            yield gameio.say()
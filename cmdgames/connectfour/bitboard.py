@@ -0,0 +1,232 @@
+"""Command-Line Connect Four Bitboards
+
+This file includes the bitboards that every Connect Four position is stored as.
+
+A position is a pair of ints used as 64-bit bitboards. Each column takes
+ROWS + 1 bits, from the bottom up, and the extra bit on top of every column is
+always empty, so that lines never wrap from one column into the next:
+
+    6 13 20 27 34 41 48
+    5 12 19 26 33 40 47
+    4 11 18 25 32 39 46
+    3 10 17 24 31 38 45
+    2  9 16 23 30 37 44
+    1  8 15 22 29 36 43
+    0  7 14 21 28 35 42
+
+    current : the stones of the player to move
+    mask    : the stones of both players
+
+The pair is stored as current + mask, which is unique to the position, and a
+move is played by adding the bottom bit of its column to the mask, which
+carries into the lowest empty space.
+
+This file contains the following classes:
+    * Position - a class that represents a single position of a game
+
+This file contains the following functions:
+    * alignment - return whether a set of stones holds four in a row
+    * winning_spots - return the empty spaces that would complete four in a row
+    * possible - return the spaces that can be played next
+"""
+
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/../connectfour")
+import variables as var
+
+HEIGHT = var.ROWS + 1 # the number of bits of every column, including the empty bit on top
+CELLS = var.ROWS * var.COLUMNS # the number of spaces on the board
+BOTTOM = sum(1 << c * HEIGHT for c in range(var.COLUMNS)) # the bottom space of every column
+BOARD = BOTTOM * ((1 << var.ROWS) - 1) # every space on the board
+DIRECTIONS = (1, HEIGHT, HEIGHT - 1, HEIGHT + 1) # the shifts along a column, a row and both diagonals
+ORDER = tuple(sorted(range(var.COLUMNS), key=lambda c: (abs(2 * c - var.COLUMNS + 1), c))) # the columns from the center out
+
+def bottom_mask(col):
+    """Return the bottom space of the column (col)."""
+    return 1 << col * HEIGHT
+
+def top_mask(col):
+    """Return the top space of the column (col)."""
+    return 1 << (var.ROWS - 1 + col * HEIGHT)
+
+def column_mask(col):
+    """Return every space of the column (col)."""
+    return ((1 << var.ROWS) - 1) << col * HEIGHT
+
+def alignment(stones):
+    """Return whether the bitboard (stones) holds four in a row."""
+    for shift in DIRECTIONS:
+        pairs = stones & (stones >> shift)
+        if pairs & (pairs >> 2 * shift):
+            return True
+    return False
+
+def winning_spots(stones, mask):
+    """Return the bitboard of the empty spaces, given the stones of both players (mask),
+    that would give the stones (stones) four in a row."""
+    ret = (stones << 1) & (stones << 2) & (stones << 3)
+    for shift in DIRECTIONS[1:]:
+        pairs = (stones << shift) & (stones << 2 * shift)
+        ret |= pairs & (stones << 3 * shift)
+        ret |= pairs & (stones >> shift)
+        pairs = (stones >> shift) & (stones >> 2 * shift)
+        ret |= pairs & (stones << shift)
+        ret |= pairs & (stones >> 3 * shift)
+    return ret & (BOARD ^ mask)
+
+def possible(mask):
+    """Return the bitboard of the spaces that can be played next, given the stones of both players (mask)."""
+    return (mask + BOTTOM) & BOARD
+
+class Position:
+    """
+    A class used to represent a single position of a game of Connect Four.
+    ...
+
+    Positions never change: playing a move returns a new position.
+
+    Attributes
+    ----------
+
+    board : list
+        a representation of the game board as a 2D-list of symbols, from the top row down
+    current : int
+        the bitboard of the stones of the player to move
+    is_terminal : bool
+        whether the position is the end of a game
+    key : int
+        a number that is unique to the position
+    mask : int
+        the bitboard of the stones of both players
+    moves : int
+        the number of moves played so far
+    player : str
+        the symbol that represents the player that should take the next turn
+    winner : str or None
+        the symbol that represents the player that won, if one exists
+
+    Methods
+    -------
+    can_play(col)
+        Return whether the column (col) has an empty space.
+    play(col)
+        Return the position after the player to move drops a stone in the column (col).
+    columns()
+        Return the columns that can be played, from the center out.
+    """
+
+    @property
+    def current(self):
+        """the bitboard of the stones of the player to move"""
+        return self._current
+
+    @property
+    def mask(self):
+        """the bitboard of the stones of both players"""
+        return self._mask
+
+    @property
+    def moves(self):
+        """the number of moves played so far"""
+        return self._moves
+
+    @property
+    def key(self):
+        """a number that is unique to the position"""
+        return self._current + self._mask
+
+    @property
+    def player(self):
+        """the symbol that represents the player that should take the next turn"""
+        return var.PLAYER_ONE if self._moves % 2 == 0 else var.PLAYER_TWO
+
+    @property
+    def winner(self):
+        """the symbol that represents the player that won, if one exists"""
+        return self._winner
+
+    @property
+    def is_terminal(self):
+        """whether the position is the end of a game"""
+        return self._winner is not None or self._moves == CELLS
+
+    @property
+    def board(self):
+        """a representation of the game board as a 2D-list of symbols, from the top row down"""
+        mine, theirs = self.player, var.PLAYER_TWO if self.player == var.PLAYER_ONE else var.PLAYER_ONE
+        ret = []
+        for r in range(var.ROWS - 1, -1, -1):
+            row = []
+            for c in range(var.COLUMNS):
+                bit = 1 << (r + c * HEIGHT)
+                row.append(var.EMPTY_SPACE if not self._mask & bit else mine if self._current & bit else theirs)
+            ret.append(row)
+        return ret
+
+    def __init__(self, current=0, mask=0, moves=0, winner=None):
+        """
+        Parameters
+        ----------
+        current : int
+            The bitboard of the stones of the player to move
+        mask : int
+            The bitboard of the stones of both players
+        moves : int
+            The number of moves played so far
+        winner : str
+            The symbol that represents the player that won, if one exists
+        """
+        self._current = current
+        self._mask = mask
+        self._moves = moves
+        self._winner = winner
+
+    @classmethod
+    def from_moves(cls, moves):
+        """Return the position reached from the empty board by playing (moves), a string of
+        column numbers counted from 1, such as "4453"."""
+        ret = cls()
+        for move in moves:
+            col = int(move) - 1
+            if col < 0 or col >= var.COLUMNS or not ret.can_play(col) or ret.is_terminal:
+                raise ValueError("the move "+move+" cannot be played")
+            ret = ret.play(col)
+        return ret
+
+    def __eq__(self, other):
+        try:
+            return self.key == other.key
+        except AttributeError:
+            return False
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def can_play(self, col):
+        """Return whether the column (col) has an empty space."""
+        return not self._mask & top_mask(col)
+
+    def play(self, col):
+        """Return the position after the player to move drops a stone in the column (col)."""
+        mask = self._mask | (self._mask + bottom_mask(col))
+        stones = self._current | (mask ^ self._mask)
+        winner = self.player if alignment(stones) else None
+        return Position(self._current ^ self._mask, mask, self._moves + 1, winner)
+
+    def columns(self):
+        """Return the columns that can be played, from the center out."""
+        if self.is_terminal:
+            return []
+        return [col for col in ORDER if self.can_play(col)]
+
+    def __str__(self):
+        """Return an ASCII portrayal of the position."""
+        ret = "  " + "   ".join(str(c + 1) for c in range(var.COLUMNS)) + "\n"
+        for row in self.board:
+            ret += "| " + " | ".join(row) + " |\n"
+        return ret + "+" + "+".join(["---"] * var.COLUMNS) + "+"
+
+    def print_board(self):
+        """Print an ASCII portrayal of the position."""
+        print(self)
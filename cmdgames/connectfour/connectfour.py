@@ -0,0 +1,207 @@
+"""Command-Line Connect Four
+
+This script allows the user to play a game of Connect Four.
+
+The user can play against three levels of Artificial Intelligence
+or against a human player.
+
+This file contains the following classes:
+    * ConnectFour - a class that represents a game of Connect Four
+    and keeps track of the current game's position
+
+This file contains the following functions:
+    * play - the dialog of the game, for any gameio backend
+    * main - the main function of the script, which activates the game
+
+Each screen of the game is drawn by render.py, as a single frame.
+"""
+
+import time
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/../connectfour")
+import variables as var
+import bitboard
+import agents
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/..")
+import render
+import gameio
+
+LEVELS = ("EASY", "NORMAL", "HARD") # the names of the difficulty levels
+NORMAL_DEPTH = 4 # the number of moves that the NORMAL level looks ahead
+NORMAL_MISTAKES = 0.2 # the chance that the NORMAL level plays a random move
+HARD_TIME_LIMIT = 2.0 # the number of seconds that the HARD level searches for each move
+CPU_DELAY = 0 # the least number of seconds that each move of a CPU player takes, including its thinking
+CPU_BUDGET = HARD_TIME_LIMIT # the number of seconds that a CPU player may think about each move
+
+class ConnectFour:
+    """
+    A class used to represent a game of Connect Four.
+    ...
+
+    Attributes
+    ----------
+
+    board : list
+        a representation of the game board as a 2D-list of symbols, from the top row down
+    state : bitboard.Position
+        the current position of the game
+
+    Methods
+    -------
+    get_winner()
+        Return the winner if the game is in a terminal state, else None.
+    is_terminal()
+        Return whether the game has reached a terminal state.
+    print_board()
+        Print a representation of the current game board to the output.
+    take_turn(player)
+        Take in a player agent and progress to the position that the player agent chooses.
+    move_to(state)
+        Progress to a position that has already been chosen.
+    start_game()
+        Reset the internal state. Must be called before a game can be played.
+    """
+
+    @property
+    def board(self):
+        """a representation of the game board as a 2D-list of symbols, from the top row down"""
+        return self.state.board
+
+    def __init__(self):
+        self.start_game()
+
+    def get_winner(self):
+        """If the current position (self.state) has a winner, return it. Else None."""
+        return self.state.winner
+
+    def is_terminal(self):
+        """Return whether the current position (self.state) is a terminal position."""
+        return self.state.is_terminal
+
+    def print_board(self):
+        """Print an ASCII portrayal of the current position."""
+        self.state.print_board()
+
+    def take_turn(self, player):
+        """take_turn(player)
+        Take in a player agent and progress to the position that the player agent chooses.
+        """
+        self.move_to(player.select_move(self.state))
+
+    def move_to(self, state):
+        """move_to(state)
+        Progress to (state), which must follow the current position by one move.
+        """
+        assert state is not None and state.moves == self.state.moves + 1
+        assert state in [self.state.play(col) for col in self.state.columns()]
+        self.state = state
+
+    def start_game(self):
+        """start_game()
+        Reset the internal state. Must be called before a game can be played.
+        """
+        self.state = bitboard.Position()
+
+def _choose_ai(difficulty, name, turn):
+    """Given a difficulty level (difficulty), return the appropriate Agent"""
+    assert(difficulty > 0 and difficulty <= len(LEVELS))
+
+    ret = None
+    if difficulty == 1:
+        ret = agents.RandomAgent(name, turn)
+    elif difficulty == 2:
+        ret = agents.SearchAgent(name, turn, max_depth=NORMAL_DEPTH, mistakes=NORMAL_MISTAKES)
+    elif difficulty == 3:
+        ret = agents.SearchAgent(name, turn, time_limit=HARD_TIME_LIMIT)
+    return ret
+
+def _ask_difficulty(message):
+    """Ask for a difficulty level with (message) and return it"""
+    options = ", ".join(str(i+1)+" for "+LEVELS[i] for i in range(len(LEVELS)))
+    return (yield from gameio.ask_number(message + " (Enter " + options + "): ", 1, len(LEVELS),
+                                        "Sorry, that is not a valid difficulty level."))
+
+def _turn_frame(game, player):
+    """Return the frame shown before (player) takes a turn in the game (game)."""
+    return render.Frame().blank(2).add(game.state).blank().add(player.name+", it is your turn!")
+
+def _end_frame(game, player_1, player_2):
+    """Return the frame shown at the end of the game (game) between (player_1) and (player_2)."""
+    frame = render.Frame().blank(2).add(game.state).blank()
+    if game.get_winner() == var.PLAYER_ONE:
+        frame.add(player_1.name+" wins!!")
+    elif game.get_winner() == var.PLAYER_TWO:
+        frame.add(player_2.name+" wins!!")
+    else:
+        frame.add("It is a tie.")
+    return frame.blank()
+
+def play(delay=CPU_DELAY, budget=CPU_BUDGET):
+    """Play games of Connect Four until the user stops, as a dialog for any gameio backend.
+
+    CPU players choose each move within (budget) seconds, or with no limit if it is None,
+    so the budget alone decides how long a move takes. If (delay) is given, they take at
+    least that many seconds over each move, counting the time they thought.
+    """
+    yield gameio.say("Welcome to the Connect Four Player!")
+    yield gameio.say()
+
+    while True:
+        num_players = yield from gameio.ask_number("How many players? (Enter 1 or 2): ", 0, 2,
+                                                   "Sorry, that is not a valid number of players.")
+
+        ai_level_bonus = 0
+        ai_level = 0
+        if num_players == 0:
+            yield gameio.say()
+            yield gameio.say("You found the secret 0-player mode!")
+            ai_level_bonus = yield from _ask_difficulty("What level should the first CPU be?")
+            ai_level = yield from _ask_difficulty("What level should the second CPU be?")
+
+        if num_players == 1:
+            ai_level = yield from _ask_difficulty("What level CPU do you want to play against?")
+
+        p1_name = "Human" if num_players == 1 else "Player 1"
+        p2_name = "CPU" if num_players == 1 else "Player 2"
+
+        p1_name = "CPU_1" if num_players == 0 else p1_name
+        p2_name = "CPU_2" if num_players == 0 else p2_name
+
+        player_1 = agents.PlayerAgent(p1_name, var.PLAYER_ONE)
+        if num_players == 0:
+            player_1 = _choose_ai(ai_level_bonus, p1_name, var.PLAYER_ONE)
+
+        if num_players == 2:
+            player_2 = agents.PlayerAgent(p2_name, var.PLAYER_TWO)
+        else:
+            player_2 = _choose_ai(ai_level, p2_name, var.PLAYER_TWO)
+
+        game = ConnectFour()
+        while not game.is_terminal():
+            player = player_1 if game.state.player == player_1.player else player_2
+            yield gameio.show(_turn_frame(game, player))
+            if isinstance(player, agents.PlayerAgent):
+                game.move_to((yield from player.move_dialog(game.state)))
+                continue
+
+            start = time.monotonic()
+            deadline = None if budget is None else start + budget
+            move = yield from player.move_dialog(game.state, deadline)
+            if delay:
+                yield gameio.wait(max(0, delay - (time.monotonic() - start)))
+            game.move_to(move)
+
+        yield gameio.show(_end_frame(game, player_1, player_2))
+        player_1.close()
+        player_2.close()
+
+        if not (yield from gameio.ask_again()):
+            break
+
+def main():
+    gameio.run(play())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""Command-Line Connect Four Solver
+
+This script searches Connect Four positions for the best move.
+
+The search is a negamax with alpha-beta pruning over the bitboards of
+bitboard.py. Scores are from the point of view of the player to move:
+
+    WIN + n  : a win with n spaces left on the board after the winning move
+    -WIN - n : a loss with n spaces left on the board after the losing move
+    0        : a draw
+    other    : an estimate of a position that was not searched to the end
+
+so quicker wins and slower losses score higher. Every position is stored in a
+fixed-size transposition table with the depth it was searched to, the kind of
+bound its score is, and its best move. Moves are ordered by the move from the
+table, then by the number of four-in-a-row spaces they create, then from the
+center out. Searches are deepened one move at a time until the position is
+solved or a time budget runs out.
+
+This file contains the following classes:
+    * Solver - a class that searches positions
+
+This file contains the following functions:
+    * main - the main function of the script, which benchmarks the solver
+"""
+
+import argparse
+import time
+
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/../connectfour")
+import bitboard
+from bitboard import CELLS, ORDER, column_mask, possible, winning_spots
+
+WIN = 1000 # the score of a win with no spaces left
+TABLE_SIZE = (1 << 20) + 7 # the number of entries in the transposition table, a prime
+EXACT, LOWER, UPPER = 0, 1, 2 # the kinds of scores stored in the transposition table
+CHECK_EVERY = 1023 # the number of positions searched between checks of the time, minus one
+BENCHMARK = ("", "4", "44", "4453", "44444", "3344554", "12345671234567") # the positions timed by main()
+
+class _Timeout(Exception):
+    """A private exception used to stop a search when its time runs out."""
+
+def _popcount(bits):
+    """Return the number of set bits of (bits)."""
+    return bin(bits).count("1")
+
+class Solver:
+    """
+    A class used to search Connect Four positions.
+    ...
+
+    Attributes
+    ----------
+
+    nodes : int
+        the number of positions searched since the solver was made
+
+    Methods
+    -------
+    search(position, depth)
+        Return the score of a position searched (depth) moves ahead, and its best column.
+    best_move(position, max_depth=None, time_limit=None)
+        Return the best column of a position, its score and the depth it was searched to.
+    solve(position)
+        Return the exact score of a position.
+    """
+
+    @property
+    def nodes(self):
+        """the number of positions searched since the solver was made"""
+        return self._nodes
+
+    def __init__(self, table_size=TABLE_SIZE):
+        """
+        Parameters
+        ----------
+        table_size : int
+            The number of entries in the transposition table
+        """
+        self._table_size = table_size
+        self._table = [None] * table_size
+        self._nodes = 0
+        self._deadline = None
+
+    def _evaluate(self, current, mask):
+        """Return an estimate of the position (current, mask) for the player to move,
+        from the four-in-a-row spaces that each player has open."""
+        theirs = current ^ mask
+        mine = _popcount(winning_spots(current, mask)) - _popcount(winning_spots(theirs, mask))
+        center = column_mask(ORDER[0])
+        return 4 * mine + _popcount(current & center) - _popcount(theirs & center)
+
+    def _negamax(self, current, mask, moves, depth, alpha, beta):
+        """Return the score of the position (current, mask) after (moves) moves, searched (depth)
+        moves ahead. Scores outside of (alpha, beta) are only bounds."""
+        self._nodes += 1
+        if self._deadline is not None and not self._nodes & CHECK_EVERY and time.monotonic() > self._deadline:
+            raise _Timeout
+
+        moves_left = possible(mask)
+        if winning_spots(current, mask) & moves_left:
+            return WIN + CELLS - moves - 1
+
+        # A move the opponent must be stopped from is forced, and two of them cannot be stopped.
+        threats = winning_spots(current ^ mask, mask)
+        forced = moves_left & threats
+        if forced:
+            if forced & (forced - 1):
+                return -(WIN + CELLS - moves - 2)
+            moves_left = forced
+        moves_left &= ~(threats >> 1)
+        if not moves_left:
+            return -(WIN + CELLS - moves - 2)
+        if moves >= CELLS - 2:
+            return 0
+        if depth == 0:
+            return self._evaluate(current, mask)
+
+        key = current + mask
+        slot = key % self._table_size
+        entry = self._table[slot]
+        best_col = None
+        if entry is not None and entry[0] == key:
+            _, stored, kind, score, best_col = entry
+            if stored >= depth:
+                if kind == EXACT:
+                    return score
+                if kind == LOWER and score >= beta:
+                    return score
+                if kind == UPPER and score <= alpha:
+                    return score
+
+        children = []
+        for col in ORDER:
+            move = moves_left & column_mask(col)
+            if move:
+                rank = 100 if col == best_col else _popcount(winning_spots(current | move, mask | move))
+                children.append((-rank, len(children), col, move))
+        children.sort()
+
+        start = alpha
+        best = -WIN - CELLS
+        for _, _, col, move in children:
+            score = -self._negamax(current ^ mask, mask | move, moves + 1, depth - 1, -beta, -max(alpha, best))
+            if score > best:
+                best = score
+                best_col = col
+                if best >= beta:
+                    break
+
+        kind = LOWER if best >= beta else UPPER if best <= start else EXACT
+        self._table[slot] = (key, depth, kind, best, best_col)
+        return best
+
+    def search(self, position, depth):
+        """Return the score of (position) searched (depth) moves ahead, and the column of its best move,
+        or None if the game is over."""
+        if position.is_terminal:
+            return 0, None
+        current, mask = position.current, position.mask
+        for col in position.columns():
+            if winning_spots(current, mask) & possible(mask) & column_mask(col):
+                return WIN + CELLS - position.moves - 1, col
+
+        score = self._negamax(current, mask, position.moves, depth, -WIN - CELLS, WIN + CELLS)
+        entry = self._table[(current + mask) % self._table_size]
+        if entry is not None and entry[0] == current + mask and entry[4] is not None:
+            return score, entry[4]
+        return score, position.columns()[0]
+
+    def best_move(self, position, max_depth=None, time_limit=None):
+        """Return the column of the best move of (position), its score and the depth it was searched to.
+
+        The search is deepened one move at a time, up to (max_depth) moves if it is given, until the
+        position is solved or (time_limit) seconds have passed. At least one move is always searched,
+        so a search can run over a very short time limit.
+        """
+        remaining = CELLS - position.moves
+        max_depth = remaining if max_depth is None else min(max_depth, remaining)
+        score, col = self.search(position, 1)
+        depth = 1
+        self._deadline = None if time_limit is None else time.monotonic() + time_limit
+        try:
+            while depth < max_depth and abs(score) < WIN:
+                score, col = self.search(position, depth + 1)
+                depth += 1
+        except _Timeout:
+            pass
+        finally:
+            self._deadline = None
+        return col, score, depth
+
+    def solve(self, position):
+        """Return the exact score of (position), searching it to the end."""
+        score, _ = self.search(position, CELLS - position.moves)
+        return score
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Connect Four solver.")
+    parser.add_argument("--depth", type=int, default=8, help="the depth that every position is searched to")
+    args = parser.parse_args()
+
+    total_nodes = 0
+    total_time = 0.0
+    for moves in BENCHMARK:
+        solver = Solver()
+        position = bitboard.Position.from_moves(moves)
+        start = time.perf_counter()
+        score, col = solver.search(position, args.depth)
+        elapsed = time.perf_counter() - start
+        total_nodes += solver.nodes
+        total_time += elapsed
+        print("{:<16} score {:>5} column {} {:>9} positions {:>10.0f} positions/s".format(
+            moves or "(empty)", score, col + 1, solver.nodes, solver.nodes / max(elapsed, 1e-9)))
+    print("total {} positions in {:.2f}s, {:.0f} positions/s".format(total_nodes, total_time,
+                                                                      total_nodes / max(total_time, 1e-9)))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+"""Command-Line Connect Four Variables"""
+
+PLAYER_ONE = 'X' # the symbol that represents player one on the board
+PLAYER_TWO = 'O' # the symbol that represents player two on the board
+EMPTY_SPACE = ' ' # the symbol that represents an empty space on the board
+ROWS = 6 # the number of rows on the board
+COLUMNS = 7 # the number of columns on the board
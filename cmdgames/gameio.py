@@ -0,0 +1,282 @@
+"""Command-Line Game I/O
+
+This script lets the same game logic talk to a terminal, a network session or
+a test script.
+
+Game logic is written as a dialog: a generator that yields requests and is
+sent back their replies, such as
+
+    name = yield gameio.ask("What is your name? ")
+    yield gameio.say("Hello, "+name+"!")
+
+A dialog never reads or writes anything itself. A driver passes each request
+to a backend and sends the reply back into the dialog:
+
+    run(dialog, io)  : drives a dialog with a synchronous backend
+    arun(dialog, io) : drives a dialog from a coroutine, awaiting asynchronous backends
+
+Dialogs can be nested with `yield from`, which returns the reply of the inner
+dialog. The requests are:
+
+    say(text)          : write a line of text
+    show(frame)        : draw a render.Frame
+    ask(prompt)        : write a prompt and reply with the line that the user enters
+    ask_secret(prompt) : like ask, without echoing what the user types
+    call(function)     : reply with the result of a slow function, such as a CPU move
+    wait(seconds)      : pause, such as before a CPU move
+    keep(obj)          : let the backend move a game (obj) out of memory while the user is idle
+                         (see sessions.py), which most backends ignore
+
+This file contains the following classes:
+    * ConsoleIO - a backend that uses the terminal
+    * ScriptedIO - a backend that replays prepared answers and records the output
+    * StreamIO - an asyncio backend that uses a network connection
+
+This file contains the following functions:
+    * say, show, ask, ask_secret, call, wait, keep - return a request
+    * ask_number - a dialog that asks for a whole number in a range
+    * ask_again - a dialog that asks whether to play again
+    * run - drive a dialog with a synchronous backend
+    * arun - drive a dialog with any backend from a coroutine
+"""
+
+import asyncio
+import inspect
+import time
+
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.realpath(__file__)))
+import render
+
+SAY = "say" # the kind of a request to write a line of text
+SHOW = "show" # the kind of a request to draw a frame
+ASK = "ask" # the kind of a request for a line of input
+ASK_SECRET = "ask_secret" # the kind of a request for a line of input that is not echoed
+CALL = "call" # the kind of a request to run a slow function
+WAIT = "wait" # the kind of a request to pause
+KEEP = "keep" # the kind of a request to let the backend move a game out of memory
+
+def say(text=""):
+    """Return a request to write the line (text)."""
+    return SAY, text
+
+def show(frame):
+    """Return a request to draw the render.Frame (frame)."""
+    return SHOW, frame
+
+def ask(prompt):
+    """Return a request to write (prompt) and reply with the line that the user enters."""
+    return ASK, prompt
+
+def ask_secret(prompt):
+    """Return a request to write (prompt) and reply with the line that the user enters, without echoing it."""
+    return ASK_SECRET, prompt
+
+def call(function, *args):
+    """Return a request to reply with the result of function(*args)."""
+    return CALL, (function, args)
+
+def wait(seconds):
+    """Return a request to pause for (seconds) seconds."""
+    return WAIT, seconds
+
+def keep(obj):
+    """Return a request to let the backend move (obj), which has the methods suspend() and resume(data),
+    out of memory while the user is idle."""
+    return KEEP, obj
+
+def ask_number(prompt, low, high, error):
+    """Ask for a whole number between (low) and (high) with (prompt), saying (error) until the user gives one."""
+    while True:
+        try:
+            ret = int((yield ask(prompt)))
+            if ret < low or ret > high:
+                raise ValueError
+            return ret
+        except ValueError:
+            yield say(error)
+
+def ask_again():
+    """Ask whether the user would like to play again and return True if they would."""
+    y = yield ask("Would you like to play again? Type 'y' for yes, and anything else for no. ")
+    return y[:1] == 'y' or y[:1] == 'Y'
+
+class ConsoleIO:
+    """
+    A class used to represent a backend that uses the terminal.
+    ...
+
+    Frames are drawn by render.py, and secrets are read with pwinput.
+    """
+
+    def say(self, text):
+        print(text)
+
+    def show(self, frame):
+        render.show(frame)
+
+    def ask(self, prompt):
+        return input(prompt)
+
+    def ask_secret(self, prompt):
+        import pwinput
+        return pwinput.pwinput(prompt=prompt, mask="*")
+
+    def call(self, request):
+        function, args = request
+        return function(*args)
+
+    def wait(self, seconds):
+        time.sleep(seconds)
+
+    def keep(self, obj):
+        pass
+
+class ScriptedIO:
+    """
+    A class used to represent a backend that replays prepared answers and records the output.
+    ...
+
+    Nothing waits, so a scripted dialog runs as fast as the game logic allows.
+
+    Attributes
+    ----------
+
+    output : str
+        everything the dialog has written so far, including prompts
+
+    Methods
+    -------
+    ask(prompt)
+        Record (prompt) and return the next answer, or raise EOFError if there are none left.
+    """
+
+    @property
+    def output(self):
+        """everything the dialog has written so far, including prompts"""
+        return "".join(self._output)
+
+    def __init__(self, answers=()):
+        """
+        Parameters
+        ----------
+        answers : iterable
+            The lines that the user enters, in order
+        """
+        self._answers = iter(answers)
+        self._output = []
+
+    def say(self, text):
+        self._output.append(text + "\n")
+
+    def show(self, frame):
+        self._output.append(str(frame))
+
+    def ask(self, prompt):
+        """Record (prompt) and return the next answer, or raise EOFError if there are none left."""
+        self._output.append(prompt)
+        try:
+            return next(self._answers)
+        except StopIteration:
+            raise EOFError
+
+    def ask_secret(self, prompt):
+        return self.ask(prompt)
+
+    def call(self, request):
+        function, args = request
+        return function(*args)
+
+    def wait(self, seconds):
+        pass
+
+    def keep(self, obj):
+        pass
+
+class StreamIO:
+    """
+    A class used to represent an asyncio backend that uses a network connection.
+    ...
+
+    Output is queued on the connection and sent when the next prompt is written.
+    Waiting for a reply costs no thread, and slow functions run in an executor.
+
+    Methods
+    -------
+    ask(prompt)
+        Send (prompt) and return the next line from the connection, or raise EOFError when it closes.
+    """
+
+    def __init__(self, reader, writer, executor=None, newline="\r\n"):
+        """
+        Parameters
+        ----------
+        reader : asyncio.StreamReader
+            The stream that the user's lines arrive on
+        writer : asyncio.StreamWriter
+            The stream that the output is sent on
+        executor : concurrent.futures.Executor
+            The executor that runs slow functions, which defaults to the event loop's
+        newline : str
+            The line ending sent to the user
+        """
+        self._reader = reader
+        self._writer = writer
+        self._executor = executor
+        self._newline = newline
+
+    def say(self, text):
+        self._writer.write((text + self._newline).encode("utf8"))
+
+    def show(self, frame):
+        self._writer.write("".join(line + self._newline for line in frame.lines).encode("utf8"))
+
+    async def ask(self, prompt):
+        """Send (prompt) and return the next line from the connection without surrounding
+        whitespace, or raise EOFError when the connection closes."""
+        self._writer.write(prompt.encode("utf8"))
+        await self._writer.drain()
+        try:
+            line = await self._reader.readline()
+        except ValueError:
+            raise EOFError
+        if not line:
+            raise EOFError
+        return line.decode("utf8", "replace").strip()
+
+    async def ask_secret(self, prompt):
+        return await self.ask(prompt)
+
+    async def call(self, request):
+        function, args = request
+        return await asyncio.get_running_loop().run_in_executor(self._executor, function, *args)
+
+    async def wait(self, seconds):
+        await asyncio.sleep(seconds)
+
+    def keep(self, obj):
+        pass
+
+def run(dialog, io=None):
+    """Drive (dialog) with the synchronous backend (io), which defaults to the terminal, and return its result."""
+    io = ConsoleIO() if io is None else io
+    reply = None
+    while True:
+        try:
+            kind, payload = dialog.send(reply)
+        except StopIteration as stop:
+            return stop.value
+        reply = getattr(io, kind)(payload)
+
+async def arun(dialog, io):
+    """Drive (dialog) with the backend (io), awaiting its replies where they are awaitable, and return its result."""
+    reply = None
+    while True:
+        try:
+            kind, payload = dialog.send(reply)
+        except StopIteration as stop:
+            return stop.value
+        reply = getattr(io, kind)(payload)
+        if inspect.isawaitable(reply):
+            reply = await reply
@@ -0,0 +1,77 @@
+"""Command-Line Game Loader
+
+Each game keeps its modules in its own folder and imports them by their bare
+names (agents, variables, ...), so two games cannot normally be imported into
+the same process. This file loads a game's script with its own private copies
+of those modules so that several games can run side by side.
+
+A module loaded this way has a private name, which a new process cannot
+import, so its functions can only be run by worker processes that are forked
+and inherit it. pool_context() chooses a start method that works for them.
+
+This file contains the following functions:
+    * load_game - import the script of a game and return it as a module
+    * pool_context - return a multiprocessing context whose workers can run some functions
+"""
+
+import importlib.util
+import multiprocessing
+import os
+import sys
+
+GAMES_DIR = os.path.dirname(os.path.realpath(__file__))
+
+SHARED_NAMES = ("agents", "variables", "tictactoe", "hangman") # module names that more than one game uses
+PREFIX = "_cmdgames_" # the start of the private name of every module loaded by load_game()
+
+_loaded = {}
+
+def load_game(game, script=None):
+    """Import the script (script) of the game in the folder (game) and return it as a module.
+
+    The script defaults to the one named after the game. Each script is only loaded once.
+    """
+    script = game if script is None else script
+    key = (game, script)
+    if key in _loaded:
+        return _loaded[key]
+
+    path = os.path.join(GAMES_DIR, game)
+    saved = {name: sys.modules.pop(name) for name in SHARED_NAMES if name in sys.modules}
+    sys.path.insert(0, path)
+    try:
+        name = PREFIX + game + "_" + script
+        spec = importlib.util.spec_from_file_location(name, os.path.join(path, script + ".py"))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            del sys.modules[name]
+            raise
+    finally:
+        sys.path.remove(path)
+        for name in SHARED_NAMES:
+            sys.modules.pop(name, None)
+        sys.modules.update(saved)
+
+    _loaded[key] = module
+    return module
+
+def _importable(function):
+    """Return whether a new process can import (function) by the name of its module."""
+    module = sys.modules.get(function.__module__)
+    return not function.__module__.startswith(PREFIX) and getattr(module, function.__qualname__, None) is function
+
+def pool_context(*functions):
+    """Return the multiprocessing context of a pool whose workers run (functions), or None if there is none.
+
+    The default start method is used when every function can be imported by a new process. Otherwise
+    the workers must be forked, and None is returned where fork is not available, so that the caller
+    runs the functions in this process instead of starting workers that cannot load them.
+    """
+    if all(_importable(function) for function in functions):
+        return multiprocessing.get_context()
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return None
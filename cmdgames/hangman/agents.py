@@ -2,17 +2,27 @@
 
 This file includes the agents which manage each game of Hangman.
 
-There are four agents which can be imported to other files: 
+There are five agents which can be imported to other files: 
     -HangmanAgent, which manages Normal Mode;
     -EvilAgent, which manages Hard mode and is a sub-class of HangmanAgent;
+    -LookaheadAgent, which manages Expert Mode and is a sub-class of EvilAgent;
     -HelpAgent, which manages Easy Mode and is a sub-class of EvilAgent;
     -PlayerAgent, which manages Two-Player and is a sub-class of HangmanAgent.
 """
 
-import pwinput
 import variables as var
+import ingest
+import lookahead
+import oracle
 import random
 
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/..")
+import gameio
+import records
+import sessions
+
 class HangmanAgent():
     """
     A class used to play a normal game of Hangman
@@ -23,7 +33,7 @@ class HangmanAgent():
     ----------
     
     guesses_made : list
-        the list of characters guessed made by the player 
+        the sorted list of characters guessed by the player 
 
     num_guesses : int
         the number of wrong guesses the player has left
@@ -41,17 +51,32 @@ class HangmanAgent():
     make_guess()
         Request the user's next guess and return whether the guess was correct.
 
+    guess_dialog()
+        The dialog of make_guess(), for any gameio backend.
+
+    take_guess(guess)
+        Apply an already validated guess and return whether the guess was correct.
+
     is_terminal()
         Returns whether the game has ended.
 
     start_game()
         Reset the internal state and choose a new secret word. Must be called before a game can be played.
 
+    start_dialog()
+        The dialog of start_game(), for any gameio backend.
+
+    suspend()
+        Return the state of the game as compact bytes and release the remaining words (see sessions.py).
+
+    resume(data)
+        Rebuild the game from the bytes returned by suspend().
+
     """
 
     @property
     def pattern(self):
-        return self._get_pattern(self.secret_word)
+        return self._pattern
     
     @property
     def secret_word(self):
@@ -59,31 +84,46 @@ class HangmanAgent():
 
     @property
     def guesses_made(self):
-        return self._guesses_made.copy()
+        return sorted(self._guesses_made)
 
     @property
     def guesses_left(self):
         return self._guesses_left
     
-    def __init__(self):
-        pass
+    def __init__(self, dictionary=var.DICTIONARY):
+        """
+        Parameters
+        ----------
+        dictionary : str or WordIndex
+            The word list that secret words are chosen from, either as a shared WordIndex
+            or as the path of a word list, which may be gzip or xz compressed
+        """
+        self._dictionary = dictionary
 
     # The following methods are used for the initialization of a game.
 
     def start_game(self):
         """Reset the internal state and choose a new secret word.""" 
         self._reset()
-        f = open("dictionary.txt", "r", encoding="utf8")
-        self._secret_word = self._choose_from_dict(f.read().splitlines())
+        self._secret_word = self._choose_from_dict(self._dictionary)
+        self._pattern = self._get_pattern(self.secret_word)
+
+    def start_dialog(self):
+        """Start the game, choosing the secret word through the backend so that a slow choice does not block it."""
+        yield gameio.call(self.start_game)
 
     def _reset(self):
         """Reset the internal variables to default values."""    
         self._guesses_left = 7
-        self._guesses_made = []
+        self._guesses_made = set()
+        self._guess_order = []
+        self._pattern = ""
 
-    def _choose_from_dict(self, dict):
-        """Choose a secret word from a dictionary.""" 
-        return random.choice(dict)
+    def _choose_from_dict(self, dictionary):
+        """Choose a secret word from a WordIndex, or from the word list at a path in a single streaming pass.""" 
+        if isinstance(dictionary, str):
+            return ingest.choose_word(ingest.read_words(dictionary, self))
+        return dictionary.choose_word()
     
     # The following functions represent settings related to input and output.
 
@@ -102,6 +142,10 @@ class HangmanAgent():
 
         return ret
 
+    def _reveal(self, word, guess):
+        """Take a word matching the current pattern and return the pattern with (guess) revealed in it."""
+        return "".join(letter if letter.lower() == guess else p for letter, p in zip(word, self._pattern))
+
     def _is_valid_guess(self, guess):
         """Take a user's guess and return if it is valid."""
         return guess.isalpha()
@@ -114,91 +158,120 @@ class HangmanAgent():
 
     def make_guess(self):
         """Receive the user's next guess and update the game state. Return whether the guess was correct."""
-        guess = self._input_guess()
-        self._guesses_made.append(guess)
-        self._guesses_made.sort()
-        return self._test_guess(guess)
-
-    def _input_guess(self):
-        """Receive the user's next guess as an input and return whether the guess was correct."""
-        guess = None
+        return gameio.run(self.guess_dialog())
+
+    def guess_dialog(self):
+        """Ask for the user's next guess and update the game state. Return whether the guess was correct."""
+        guess = yield from self._ask_guess()
+        return (yield gameio.call(self.take_guess, guess))
+
+    def take_guess(self, guess):
+        """Take a guess that has already been validated and update the game state. Return whether the guess was correct.
+
+        The game is recorded when it ends, if the process records games (see records.py).
+        """
+        self._guesses_made.add(guess)
+        self._guess_order.append(guess)
+        ret = self._test_guess(guess)
+        if records.recording() and self.is_terminal():
+            misses = sum(g not in self._pattern for g in self._guess_order)
+            records.record_hangman(self.secret_word, self._guess_order, self._guesses_left + misses, self._dictionary)
+        return ret
+
+    def _ask_guess(self):
+        """Ask for the user's next guess until it is valid and new, and return it."""
         while True:
-            try:
-                guess = input("What is your next guess? ")
-                guess = guess.lstrip().lower()
-                if len(guess) != 1 or not self._is_valid_guess(guess):
-                    raise ValueError
-                
-                if guess in self._guesses_made:
-                    print("You already guessed that!")
-                else:
-                    break
-
-            except Exception:
-                print("Sorry, that is not a valid input")
-        return guess
+            guess = (yield gameio.ask("What is your next guess? ")).strip().lower()
+            if len(guess) != 1 or not self._is_valid_guess(guess):
+                yield gameio.say("Sorry, that is not a valid input")
+            elif guess in self._guesses_made:
+                yield gameio.say("You already guessed that!")
+            else:
+                return guess
     
     def _test_guess(self, guess):
         """Take a user's guess and update the game state, return whether it was a correct guess or not."""
+        self._update_pattern(guess)
         if guess not in self.pattern:
             self._guesses_left -= 1
             return False
         return True
+
+    def _update_pattern(self, guess):
+        """Take a user's guess and reveal it in the cached pattern."""
+        self._pattern = self._reveal(self._secret_word, guess)
     
     # The following functions are used to determine if the game is in an end state.
     
     def is_terminal(self):
         """Returns whether the game has ended."""
-        if self._guesses_left == 0:
-            return True
-
-        word = self.secret_word
-        for w in word:
-            if w != var.SPACE_IN and (self._is_valid_guess(w) and w.lower() not in self._guesses_made):
-                return False
+        return self._guesses_left == 0 or var.SECRET not in self._pattern
+
+    # The following functions are used to move an idle game out of memory.
+
+    def suspend(self):
+        """Return the state of the game as compact bytes and release the remaining words (see sessions.py)."""
+        return sessions.encode_hangman(self._guesses_left, self._guess_order, self._pattern,
+                                       self._suspend_words())
+
+    def resume(self, data):
+        """Rebuild the game from the bytes (data) returned by suspend()."""
+        self._guesses_left, self._guess_order, self._pattern, words = sessions.decode_hangman(data)
+        self._guesses_made = set(self._guess_order)
+        self._resume_words(words)
+
+    def _suspend_words(self):
+        """Release the words that the secret word may still be and return them, as a list of words or
+        as a bitset of their ids among the words of their length in the WordIndex."""
+        ret = [self._secret_word]
+        self._secret_word = None
+        return ret
 
-        return True
+    def _resume_words(self, words):
+        """Take the words returned by _suspend_words() and hold them again."""
+        self._secret_word = words[0]
 
 class EvilAgent(HangmanAgent):
     """
     A class used to play an evil game of Hangman. Evil Hangman changes words as much as possible so the player will lose.
     """
-    @property
-    def pattern(self):
-        return self._pattern
-
     @property
     def secret_word(self):
         return random.choice(self._secret_word)
     
-    def __init__(self):
-        pass
-
+    def __init__(self, dictionary=var.DICTIONARY):
+        super().__init__(dictionary)
 
     def _reset(self):
+        super()._reset()
         self._guesses_left = 14
-        self._guesses_made = []
-        self._pattern = ""
         self._secret_word = []
     
-    def _choose_from_dict(self, dict):
+    def _choose_from_dict(self, dictionary):
+        """Choose a word length from a WordIndex or a word list and return every word of that length.
+
+        A word list is streamed twice, so only the words of the chosen length are held in memory.
+        """
+        size = len(super()._choose_from_dict(dictionary))
+        if not isinstance(dictionary, str):
+            return dictionary.words_of_length(size)
+
         ret = []
-        tmp = random.choice(dict)
-        size = len(tmp)
-        for word in dict:
+        for word in ingest.read_words(dictionary, self):
             if len(word) == size:
                 ret.append(word)
         
-        self._pattern = self._get_pattern(tmp)
         return ret
 
-
-    def _test_guess(self, guess):
+    def _update_pattern(self, guess):
+        """Partition the remaining words into families by pattern in one pass and keep the preferred family."""
+        families = {}
         patterns = {}
         
         for word in self._secret_word:
             tmp = self._get_pattern(word).lower()
             if tmp not in patterns:
+                families[tmp] = []
                 patterns[tmp] = (0, set()) 
 
             freq, letc = patterns[tmp] 
@@ -208,16 +281,30 @@ class EvilAgent(HangmanAgent):
                 if let not in self._guesses_made:
                     letc.add(let)
 
+            families[tmp].append(word)
             patterns[tmp] = freq, letc
 
         self._pattern = self._get_best_pattern(patterns, guess)
-        new_dict = []
-        for word in self._secret_word:
-            if self.pattern == self._get_pattern(word):
-                new_dict.append(word)
-        self._secret_word = new_dict
-
-        return super()._test_guess(guess)
+        self._secret_word = families[self._pattern]
+
+    def _suspend_words(self):
+        """Release the remaining words and return them as a bitset of their ids among the words of their
+        length, or as a list of words if they were not chosen from a WordIndex."""
+        words = self._secret_word
+        self._secret_word = None
+        if isinstance(self._dictionary, str):
+            return list(words)
+        family = set(words)
+        return sessions.bitset(i for i, word in enumerate(self._dictionary.words_of_length(len(self._pattern)))
+                               if word in family)
+
+    def _resume_words(self, words):
+        """Take the words returned by _suspend_words() and hold them again."""
+        if isinstance(words, list):
+            self._secret_word = words
+        else:
+            length = self._dictionary.words_of_length(len(self._pattern))
+            self._secret_word = [length[i] for i in sessions.members(words)]
 
     def _get_best_pattern(self, patterns, guess):
         """Review the map of patterns and frequences to choose the agent's preferred solution"""
@@ -235,11 +322,81 @@ class EvilAgent(HangmanAgent):
 
         return maxkey
 
+class LookaheadAgent(EvilAgent):
+    """
+    A class used to play an expert game of Evil Hangman. Expert Hangman looks several guesses ahead
+    to keep the words that force the most wrong guesses, rather than the most words.
+    """
+    @property
+    def secret_word(self):
+        ids = []
+        candidates = self._candidates
+        while candidates:
+            low = candidates & -candidates
+            ids.append(low.bit_length() - 1)
+            candidates ^= low
+        return self._secret_word[random.choice(ids)]
+
+    def __init__(self, dictionary=var.DICTIONARY, time_limit=lookahead.TIME_LIMIT):
+        """
+        Parameters
+        ----------
+        dictionary : str or WordIndex
+            The word list that secret words are chosen from
+        time_limit : float
+            The number of seconds spent searching after each guess
+        """
+        super().__init__(dictionary)
+        self._time_limit = time_limit
+
+    def start_game(self):
+        """Reset the internal state and choose the length of the secret word."""
+        super().start_game()
+        self._candidates = self._bitsets.match(self._pattern)
+
+    def _reset(self):
+        super()._reset()
+        self._candidates = 0
+
+    def _choose_from_dict(self, dictionary):
+        """Choose a word length and index every word of that length as bitsets for the search."""
+        ret = list(super()._choose_from_dict(dictionary))
+        self._bitsets = oracle.Bitsets(ret)
+        self._search = lookahead.Search(self._bitsets, self._time_limit)
+        self._candidates = self._bitsets.all
+        return ret
+
+    def _update_pattern(self, guess):
+        """Keep the family of the remaining words that forces the most wrong guesses."""
+        secret = tuple(i for i, letter in enumerate(self._pattern) if letter == var.SECRET)
+        revealed, self._candidates = self._search.choose(self._candidates, secret, self._guesses_made,
+                                                         guess, self._guesses_left)
+        self._pattern = "".join(guess if i in revealed else letter for i, letter in enumerate(self._pattern))
+
+    def _suspend_words(self):
+        """Release the words and their search and return the remaining words as their bitset, which holds
+        their ids among the words of their length, or as a list of words if there is no WordIndex."""
+        words, candidates = self._secret_word, self._candidates
+        self._secret_word = self._bitsets = self._search = None
+        if isinstance(self._dictionary, str):
+            return [words[i] for i in sessions.members(candidates)]
+        return candidates
+
+    def _resume_words(self, words):
+        """Take the words returned by _suspend_words() and index them for the search again."""
+        if isinstance(words, list):
+            self._secret_word = words
+        else:
+            self._secret_word = list(self._dictionary.words_of_length(len(self._pattern)))
+        self._bitsets = oracle.Bitsets(self._secret_word)
+        self._search = lookahead.Search(self._bitsets, self._time_limit)
+        self._candidates = self._bitsets.all if isinstance(words, list) else words
+
 class HelpAgent(EvilAgent):
     """ 
     A class used to play a game of Hepful Hangman. Helpful Hangman changes words as much as possible so the player will win."""
-    def __init__(self):
-        super().__init__()
+    def __init__(self, dictionary=var.DICTIONARY):
+        super().__init__(dictionary)
 
     def _reset(self):
         super()._reset()
@@ -283,8 +440,15 @@ class PlayerAgent(HangmanAgent):
     """
     A class used to play a two-player game of Hangman.
     """
-    def __init__(self):
+    def __init__(self, words=None):
+        """
+        Parameters
+        ----------
+        words : Dawg
+            The words that the secret word must be one of, ignoring case, or None to allow any word
+        """
         super().__init__()
+        self._words = words
     
     def _is_valid_guess(self, guess):
         if self._numeric:
@@ -296,9 +460,13 @@ class PlayerAgent(HangmanAgent):
         return letter != var.SECRET and letter != var.SPACE_OUT 
 
     def start_game(self):
+        gameio.run(self.start_dialog())
+
+    def start_dialog(self):
+        """Ask for the secret word and the number of wrong guesses allowed, and start the game."""
         self._reset()
         while True:
-            tmp = pwinput.pwinput(prompt="Please enter the secret word: ",mask="*")
+            tmp = yield gameio.ask_secret("Please enter the secret word: ")
             valid = True
             numeric = False
             for c in tmp:
@@ -306,27 +474,33 @@ class PlayerAgent(HangmanAgent):
                 numeric |= c.isalnum() and not c.isalpha()
             
             if not valid:
-                print("Sorry, that secret word contained an illegal character.")
+                yield gameio.say("Sorry, that secret word contained an illegal character.")
+            elif self._words is not None and not self._words.contains(ingest.normalize(tmp), ignore_case=True):
+                yield gameio.say("Sorry, that secret word is not a real word.")
             else:
                 self._secret_word = tmp
                 if numeric:
-                    y = input("Your secret word contained some numbers. Would you like these to be hidden? Type 'y' for yes, and anything else for no. ")
-                    if y[0] == 'y' or y[0] == 'Y':
+                    y = yield gameio.ask("Your secret word contained some numbers. Would you like these to be hidden? Type 'y' for yes, and anything else for no. ")
+                    if y[:1] == 'y' or y[:1] == 'Y':
                         self._numeric = True
                 break
         
-        while True:
-                try:
-                    tmp = int(input("How many wrong guesses are allowed? "))
-                    if tmp <= 0 or (tmp > 26 and not self._numeric) or (tmp > 36 and self._numeric):
-                        raise ValueError
-                    self._guesses_left = tmp
-                    break 
+        self._guesses_left = yield from gameio.ask_number("How many wrong guesses are allowed? ", 1,
+                                                          36 if self._numeric else 26,
+                                                          "Sorry, that is not a valid number of guesses.")
 
-                except ValueError:
-                    print("Sorry, that is not a valid number of guesses.")
+        self._pattern = self._get_pattern(self._secret_word)
 
     def _reset(self):
+        super()._reset()
         self._guesses_left = 0
-        self._guesses_made = []
-        self._numeric = False
\ No newline at end of file
+        self._numeric = False
+
+    def suspend(self):
+        """Return the state of the game as compact bytes, with whether numbers are hidden first."""
+        return bytes([self._numeric]) + super().suspend()
+
+    def resume(self, data):
+        """Rebuild the game from the bytes (data) returned by suspend()."""
+        self._numeric = bool(data[0])
+        super().resume(data[1:])
\ No newline at end of file
@@ -0,0 +1,382 @@
+"""Command-Line Hangman Word Graph
+
+This file includes a read-only directed acyclic word graph (DAWG) of a word
+list, which answers whether a word is in the list and enumerates its words by
+prefix, by length and by Hangman pattern.
+
+The graph is the smallest automaton that accepts exactly the words of the list:
+words share the nodes of their common prefixes, as in a trie, and also the nodes
+of their common endings, so a large dictionary takes a fraction of the memory of
+a list of its words. It is built in one pass over the sorted words, registering
+every node once its edges are final and replacing it with an equal node that is
+already registered.
+
+Like a WordIndex (see wordindex.py), the graph is a single flat buffer, with no
+object for any word or node. It holds a header, a table of the
+nodes and a table of the edges, followed by the alphabet:
+
+    header   : the magic bytes b"DAWG", the number of words, nodes and edges, and
+               the size of the alphabet in bytes
+    lengths  : for every node, a mask with bit k set if a word ends k letters below
+               it, where bit 31 stands for every k of 31 or more, so bit 0 marks the
+               end of a word
+    firsts   : for every node, its first edge, plus the end of the last node's edges
+    counts   : for every node, the number of words that end below it
+    edges    : for every edge, the place of its letter in the alphabet in the top
+               8 bits and the node that it leads to in the other 24
+    alphabet : the UTF-8 text of every letter in the words, in sorted order
+
+The root is node 0, and the edges of every node are sorted by letter. The
+numbers are 32-bit unsigned integers in the native byte order. Every word has an id,
+its place in the sorted list of words, which is found from the counts without
+enumerating any words.
+
+This file contains the following classes:
+    * Dawg - a read-only view of a word graph
+
+This file contains the following functions:
+    * build - build a Dawg from a sequence of words
+    * load - read a word list into a Dawg
+    * main - the main function of the script, which compares the memory of the word lists
+"""
+
+import argparse
+import random
+import struct
+
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/../hangman")
+import variables as var
+import ingest
+
+MAGIC = b"DAWG" # the first bytes of every word graph
+HEADER = struct.Struct("=4sIIII") # the magic bytes, the numbers of words, nodes and edges, and the size of the alphabet
+TOP = 31 # the bit of a length mask that stands for every length from it up
+TARGET = (1 << 24) - 1 # the bits of an edge that hold the node it leads to
+LABEL = 24 # the shift of the place of an edge's letter in the alphabet
+MAX_LETTERS = 256 # the number of different letters that a word graph can hold
+
+class Dawg:
+    """
+    A class used to represent a read-only view of a word graph.
+    ...
+
+    A Dawg can be used as the dictionary of a HangmanAgent in place of a WordIndex.
+    Its words are sorted, and the id of a word is its place among them.
+
+    Attributes
+    ----------
+
+    buffer : bytes-like
+        the flat buffer that holds the whole graph
+
+    Methods
+    -------
+    contains(word, ignore_case=False)
+        Return whether (word) is in the graph, ignoring case if (ignore_case) is True.
+    has_prefix(prefix)
+        Return whether any word of the graph begins with (prefix).
+    words(prefix="")
+        Return the words that begin with (prefix), in order.
+    words_of_length(size)
+        Return every word with the length (size).
+    matches(pattern, guessed=())
+        Return every word that matches a Hangman pattern after the letters (guessed).
+    word(i)
+        Return the word with the id (i).
+    index(word)
+        Return the id of (word).
+    choose_word()
+        Return a word chosen uniformly at random from the whole graph.
+    """
+
+    @property
+    def buffer(self):
+        """the flat buffer that holds the whole graph"""
+        return self._buffer
+
+    def __init__(self, buffer):
+        """
+        Parameters
+        ----------
+        buffer : bytes-like
+            The flat buffer of a graph returned by build(), such as a view of shared memory
+        """
+        view = memoryview(buffer)
+        magic, count, num_nodes, num_edges, alphabet_size = HEADER.unpack_from(view, 0)
+        if magic != MAGIC:
+            raise ValueError("the buffer does not hold a word graph")
+
+        self._buffer = buffer
+        self._count = count
+        pos = HEADER.size
+        self._lengths = view[pos:pos + 4 * num_nodes].cast("I")
+        pos += 4 * num_nodes
+        self._firsts = view[pos:pos + 4 * (num_nodes + 1)].cast("I")
+        pos += 4 * (num_nodes + 1)
+        self._counts = view[pos:pos + 4 * num_nodes].cast("I")
+        pos += 4 * num_nodes
+        self._edges = view[pos:pos + 4 * num_edges].cast("I")
+        pos += 4 * num_edges
+        self._alphabet = str(view[pos:pos + alphabet_size], "utf8")
+        self._places = {letter: i for i, letter in enumerate(self._alphabet)}
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, word):
+        return self.contains(word)
+
+    def _child(self, node, letter):
+        """Return the node that (letter) leads to from (node), or None if there is no such edge."""
+        place = self._places.get(letter)
+        if place is None:
+            return None
+        for i in range(self._firsts[node], self._firsts[node + 1]):
+            edge = self._edges[i]
+            if edge >> LABEL == place:
+                return edge & TARGET
+            if edge >> LABEL > place:
+                return None
+        return None
+
+    def _find(self, prefix):
+        """Return the node reached by the letters of (prefix) from the root, or None if there is none."""
+        node = 0
+        for letter in prefix:
+            node = self._child(node, letter)
+            if node is None:
+                return None
+        return node
+
+    def _reaches(self, node, left):
+        """Return whether a word ends (left) letters below (node)."""
+        return self._lengths[node] >> min(left, TOP) & 1
+
+    def contains(self, word, ignore_case=False):
+        """Return whether (word) is in the graph. If (ignore_case) is True, any word that only
+        differs from it in case counts."""
+        if not ignore_case:
+            node = self._find(word)
+            return node is not None and self._lengths[node] & 1 == 1
+
+        nodes = [0]
+        for letter in word:
+            cases = {letter, letter.lower(), letter.upper()}
+            nodes = [child for node in nodes for child in (self._child(node, c) for c in cases) if child is not None]
+            if not nodes:
+                return False
+        return any(self._lengths[node] & 1 for node in nodes)
+
+    def has_prefix(self, prefix):
+        """Return whether any word of the graph begins with (prefix)."""
+        return self._find(prefix) is not None
+
+    def _walk(self, node, prefix, size=None, allow=None):
+        """Yield the words below (node), which is reached by (prefix), in order. Only the words with (size)
+        letters are yielded if it is given, and only the words whose letters after the prefix all pass
+        allow(position, letter) if it is given."""
+        stack = [(node, prefix)]
+        while stack:
+            node, word = stack.pop()
+            if size is None:
+                if self._lengths[node] & 1:
+                    yield word
+            else:
+                left = size - len(word)
+                if not self._reaches(node, left):
+                    continue
+                if left == 0:
+                    yield word
+                    continue
+
+            for i in range(self._firsts[node + 1] - 1, self._firsts[node] - 1, -1):
+                edge = self._edges[i]
+                letter = self._alphabet[edge >> LABEL]
+                if allow is None or allow(len(word), letter):
+                    stack.append((edge & TARGET, word + letter))
+
+    def words(self, prefix=""):
+        """Yield the words that begin with (prefix), in order."""
+        node = self._find(prefix)
+        if node is not None:
+            yield from self._walk(node, prefix)
+
+    def words_of_length(self, size):
+        """Return every word with the length (size) as a sorted list."""
+        return list(self._walk(0, "", size))
+
+    def matches(self, pattern, guessed=()):
+        """Return the sorted list of words that match (pattern), in the format of HangmanAgent._get_pattern,
+        after the letters (guessed). Only the branches of the graph that can still match are followed."""
+        guessed = set(guessed)
+
+        def allow(position, letter):
+            shown = pattern[position]
+            if shown == var.SECRET:
+                return letter.isalpha() and letter.lower() not in guessed
+            if shown == var.SPACE_OUT:
+                return letter == var.SPACE_IN
+            return letter.lower() == shown.lower()
+
+        return list(self._walk(0, "", len(pattern), allow))
+
+    def word(self, i):
+        """Return the word with the id (i)."""
+        if i < 0 or i >= self._count:
+            raise IndexError(i)
+        node = 0
+        ret = []
+        while True:
+            if self._lengths[node] & 1:
+                if i == 0:
+                    return "".join(ret)
+                i -= 1
+            for j in range(self._firsts[node], self._firsts[node + 1]):
+                edge = self._edges[j]
+                count = self._counts[edge & TARGET]
+                if i < count:
+                    ret.append(self._alphabet[edge >> LABEL])
+                    node = edge & TARGET
+                    break
+                i -= count
+
+    def index(self, word):
+        """Return the id of (word), or raise ValueError if it is not in the graph."""
+        node = 0
+        ret = 0
+        for letter in word:
+            if self._lengths[node] & 1:
+                ret += 1
+            place = self._places.get(letter)
+            child = None
+            for j in range(self._firsts[node], self._firsts[node + 1]):
+                edge = self._edges[j]
+                if edge >> LABEL == place:
+                    child = edge & TARGET
+                    break
+                ret += self._counts[edge & TARGET]
+            if child is None:
+                raise ValueError(word + " is not in the word graph")
+            node = child
+        if not self._lengths[node] & 1:
+            raise ValueError(word + " is not in the word graph")
+        return ret
+
+    def choose_word(self, rng=random):
+        """Return a word chosen uniformly at random from the whole graph."""
+        return self.word(rng.randrange(len(self)))
+
+def _minimize(edges, finals, register, unchecked, down_to):
+    """Replace the nodes of (unchecked) below the first (down_to) with equal registered nodes,
+    registering those that have no equal, until only (down_to) are left."""
+    while len(unchecked) > down_to:
+        parent, letter, child = unchecked.pop()
+        key = (finals[child], tuple(sorted(edges[child].items())))
+        if key in register:
+            edges[parent][letter] = register[key]
+            edges[child] = None
+        else:
+            register[key] = child
+
+def build(words):
+    """Build a Dawg from (words), in any order. Duplicates are ignored."""
+    edges = [{}]
+    finals = [False]
+    register = {}
+    unchecked = [] # the (parent, letter, child) edges of the last word that may still change
+    previous = ""
+    for word in sorted(set(words)):
+        common = 0
+        while common < min(len(word), len(previous)) and word[common] == previous[common]:
+            common += 1
+        _minimize(edges, finals, register, unchecked, common)
+
+        node = unchecked[-1][2] if unchecked else 0
+        for letter in word[common:]:
+            edges.append({})
+            finals.append(False)
+            edges[node][letter] = len(edges) - 1
+            unchecked.append((node, letter, len(edges) - 1))
+            node = len(edges) - 1
+        finals[node] = True
+        previous = word
+    _minimize(edges, finals, register, unchecked, 0)
+
+    # Number the nodes that are left in the order they are first reached, with the root first.
+    numbers = {0: 0}
+    order = [0]
+    for node in order:
+        for letter in sorted(edges[node]):
+            child = edges[node][letter]
+            if child not in numbers:
+                numbers[child] = len(order)
+                order.append(child)
+    if len(order) > TARGET + 1:
+        raise ValueError("too many nodes for a word graph")
+
+    alphabet = sorted({letter for node in order for letter in edges[node]})
+    if len(alphabet) > MAX_LETTERS:
+        raise ValueError("too many different letters for a word graph")
+    places = {letter: i for i, letter in enumerate(alphabet)}
+
+    # Every node is summed after its children, in the order that a depth-first search leaves them.
+    lengths = [0] * len(order)
+    counts = [0] * len(order)
+    visited = [False] * len(order)
+    stack = [(0, False)]
+    while stack:
+        number, leaving = stack.pop()
+        node = order[number]
+        if not leaving:
+            if not visited[number]:
+                visited[number] = True
+                stack.append((number, True))
+                stack.extend((numbers[child], False) for child in edges[node].values())
+            continue
+        mask = 1 if finals[node] else 0
+        count = mask
+        for child in edges[node].values():
+            below = lengths[numbers[child]] << 1
+            mask |= (below & ((1 << (TOP + 1)) - 1)) | (1 << TOP if below >> (TOP + 1) else 0)
+            count += counts[numbers[child]]
+        lengths[number] = mask
+        counts[number] = count
+
+    firsts = [0]
+    table = []
+    for node in order:
+        for letter in sorted(edges[node]):
+            table.append(places[letter] << LABEL | numbers[edges[node][letter]])
+        firsts.append(len(table))
+
+    text = "".join(alphabet).encode("utf8")
+    return Dawg(HEADER.pack(MAGIC, counts[0], len(order), len(table), len(text))
+                + struct.pack("=%dI" % len(lengths), *lengths)
+                + struct.pack("=%dI" % len(firsts), *firsts)
+                + struct.pack("=%dI" % len(counts), *counts)
+                + struct.pack("=%dI" % len(table), *table)
+                + text)
+
+def load(path, agent):
+    """Read the word list at (path), keeping the words that are valid for (agent), and return its Dawg."""
+    return build(ingest.read_words(path, agent))
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the memory of a word list held as a word graph, "
+                                                 "as a word index and as a list of strings.")
+    parser.add_argument("--dictionary", default=var.DICTIONARY, help="the word list to measure")
+    args = parser.parse_args()
+
+    import agents
+    import wordindex
+    words = list(ingest.unique(ingest.read_words(args.dictionary, agents.HangmanAgent())))
+    as_list = sys.getsizeof(words) + sum(sys.getsizeof(word) for word in words)
+    print("%d words" % len(words))
+    print("list of strings: %d bytes" % as_list)
+    print("word index: %d bytes" % len(wordindex.build(words).buffer))
+    print("word graph: %d bytes" % len(build(words).buffer))
+
+if __name__ == "__main__":
+    main()
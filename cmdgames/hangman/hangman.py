@@ -2,88 +2,100 @@
 
 This script allows the user to play a game of Hangman.
 
-There are four modes available: Normal Mode, Easy Mode, Hard Mode, and Two-Player.
-Normal Mode represents an average game of Hangman. In Easy Mode and Hard Mode,
-the game manager will choose a word based on the user's guesses to make the game
-easier or harder. In Two-Player, a human will enter the secret word and the user
-must guess it.
+There are five modes available: Normal Mode, Easy Mode, Hard Mode, Expert Mode,
+and Two-Player. Normal Mode represents an average game of Hangman. In Easy Mode
+and Hard Mode, the game manager will choose a word based on the user's guesses to
+make the game easier or harder. Expert Mode is like Hard Mode, but the game manager
+looks several guesses ahead. In Two-Player, a human will enter the secret word and
+the user must guess it. Run the script with `--real-words` to only accept secret
+words in Two-Player that are in the dictionary.
 
 This file contains the following functions:
+    * play - the dialog of the game, for any gameio backend
     * main - the main function of the script, which activates the game
+
+Each screen of the game is drawn by render.py, as a single frame.
 """
 
+import argparse
+
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/../hangman")
+import variables as var
 import agents
-
-def main():
-    print("Welcome to the Hangman Player!")
+import dawg
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/..")
+import render
+import gameio
+
+def _status_frame(game_agent):
+    """Return the frame shown before each guess of the game managed by (game_agent)."""
+    return (render.Frame().blank(2)
+            .add("guesses left:", game_agent.guesses_left)
+            .add("guessed so far :", game_agent.guesses_made)
+            .add("current word :", game_agent.pattern))
+
+def _end_frame(game_agent):
+    """Return the frame shown at the end of the game managed by (game_agent)."""
+    frame = render.Frame().blank()
+    frame.add("You win!!" if game_agent.guesses_left > 0 else "You lost.")
+    return frame.add("The word was "+game_agent.secret_word+".").blank()
+
+def play(dictionary=var.DICTIONARY, two_player=True, real_words=None):
+    """Play games of Hangman until the user stops, as a dialog for any gameio backend.
+
+    Secret words are chosen from (dictionary). If (two_player) is False, the
+    Two-Player mode is not offered. If (real_words), a Dawg, is given, the secret
+    words of Two-Player must be among its words.
+    """
+    yield gameio.say("Welcome to the Hangman Player!")
 
     while True:
-        num_players = 0
-        while True:
-            try:
-                num_players = int(input("How many players? (Enter 1 or 2): "))
-                if num_players <= 0 or num_players > 2:
-                    raise ValueError 
-                break
-
-            except ValueError:
-                print("Sorry, that is not a valid number of players.")
+        num_players = 1
+        if two_player:
+            num_players = yield from gameio.ask_number("How many players? (Enter 1 or 2): ", 1, 2,
+                                                       "Sorry, that is not a valid number of players.")
 
         ai_level = 0
         if num_players == 1:
-            while True:
-                try:
-                    ai_level = int(input("What level CPU do you want to play against? (Enter 1 for EASY, 2 for NORMAL, 3 for HARD): "))
-                    if ai_level <= 0 or ai_level > 3:
-                        raise ValueError
-                    break 
-
-                except ValueError:
-                    print("Sorry, that is not a valid difficulty level.")
-
-        assert num_players == 1 or num_players == 2
-        assert ai_level >= 0 and ai_level <= 3
+            ai_level = yield from gameio.ask_number(
+                "What level CPU do you want to play against? (Enter 1 for EASY, 2 for NORMAL, 3 for HARD, 4 for EXPERT): ",
+                1, 4, "Sorry, that is not a valid difficulty level.")
 
         game_agent = None
-        if int(num_players) == 2:
-            game_agent = agents.PlayerAgent()
-        elif int(num_players) == 1:
-            if ai_level == 1:
-                game_agent = agents.HelpAgent()
-            elif ai_level == 2:
-                game_agent = agents.HangmanAgent()
-            elif ai_level == 3:
-                game_agent = agents.EvilAgent()
+        if num_players == 2:
+            game_agent = agents.PlayerAgent(real_words)
+        elif ai_level == 1:
+            game_agent = agents.HelpAgent(dictionary)
+        elif ai_level == 2:
+            game_agent = agents.HangmanAgent(dictionary)
+        elif ai_level == 3:
+            game_agent = agents.EvilAgent(dictionary)
+        elif ai_level == 4:
+            game_agent = agents.LookaheadAgent(dictionary)
 
         assert game_agent is not None
         
-        game_agent.start_game()
+        yield from game_agent.start_dialog()
+        yield gameio.keep(game_agent)
         while not game_agent.is_terminal():
-            print()
-            print()
-            print("guesses left:",game_agent.guesses_left)
-            print("guessed so far :",game_agent.guesses_made)
-            print("current word :",game_agent.pattern)
-            
-            game_agent.make_guess()
-
-        print()
-
-        if game_agent.guesses_left > 0:
-            print("You win!!")
-        else:
-            print("You lost.")
+            yield gameio.show(_status_frame(game_agent))
+            yield from game_agent.guess_dialog()
 
-        print("The word was "+game_agent.secret_word+".")
+        yield gameio.show(_end_frame(game_agent))
 
-        print()
-
-        y = input("Would you like to play again? Type 'y' for yes, and anything else for no. ")
-        if not (y[0] == 'y' or y[0] == 'Y'):
+        if not (yield from gameio.ask_again()):
             break
 
+def main(real_words=False):
+    """Play Hangman in the terminal. If (real_words) is True, the secret words of Two-Player
+    must be in the dictionary."""
+    words = dawg.load(var.DICTIONARY, agents.HangmanAgent()) if real_words else None
+    gameio.run(play(real_words=words))
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Play a game of Hangman.")
+    parser.add_argument("--real-words", action="store_true",
+                        help="only accept secret words in Two-Player that are in the dictionary")
+    main(parser.parse_args().real_words)
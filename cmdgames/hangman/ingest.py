@@ -0,0 +1,142 @@
+"""Command-Line Hangman Dictionary Ingestion
+
+This script streams word lists of any size into the Hangman game.
+
+Word lists are read one line at a time, so they are never loaded whole. They may
+be plain text or compressed with gzip (.gz) or xz (.xz). Every word is normalized
+and checked against the same rules that a HangmanAgent applies to its secret word.
+Words are lowercased, since guesses are, so that every letter can be guessed.
+
+This file contains the following functions:
+    * open_words - open a plain or compressed word list as text
+    * read_words - stream the valid, normalized words of a word list
+    * unique - stream words with duplicates removed
+    * choose_word - choose a random word from a stream in a single pass
+    * write_shards - write a stream of words to files bucketed by length
+    * main - the main function of the script, which ingests a word list
+"""
+
+import argparse
+import gzip
+import lzma
+import os
+import random
+import unicodedata
+
+import sys
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/../hangman")
+import variables as var
+
+SHARD_NAME = "words-{}.txt" # the file name used for the shard of words with a given length
+BUFFER_SIZE = 1 << 20 # the write buffer size of a single shard, in bytes
+
+def open_words(path):
+    """Open the word list at (path) for reading as text, decompressing it if needed."""
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf8", errors="replace")
+    if path.endswith(".xz"):
+        return lzma.open(path, "rt", encoding="utf8", errors="replace")
+    return open(path, "r", encoding="utf8", errors="replace")
+
+def normalize(line):
+    """Take a raw line of a word list and return it as a normalized, lowercase word."""
+    word = unicodedata.normalize("NFC", line.strip().lower())
+    return var.SPACE_IN.join(word.split())
+
+def is_valid_word(word, agent):
+    """Return whether (word) may be used as a secret word according to the rules of (agent)."""
+    guessable = False
+    for letter in word:
+        if not agent._is_valid_letter(letter):
+            return False
+        guessable |= agent._is_valid_guess(letter)
+    return guessable
+
+def read_words(path, agent):
+    """Stream the normalized words of the word list at (path) which are valid for (agent).
+
+    Lines that are blank or that contain a letter the agent does not permit are skipped.
+    The returned generator can be consumed directly or used to feed an index builder.
+    """
+    with open_words(path) as f:
+        for line in f:
+            word = normalize(line)
+            if is_valid_word(word, agent):
+                yield word
+
+def unique(words):
+    """Stream (words) in their original order with duplicates removed.
+
+    Memory grows with the number of distinct words, so very large lists should be
+    deduplicated one shard at a time with write_shards() instead.
+    """
+    seen = set()
+    for word in words:
+        if word not in seen:
+            seen.add(word)
+            yield word
+
+def choose_word(words, rng=random):
+    """Choose a word uniformly at random from (words) in a single pass with reservoir sampling.
+
+    Raises ValueError if (words) is empty.
+    """
+    ret = None
+    for i, word in enumerate(words):
+        if rng.randrange(i + 1) == 0:
+            ret = word
+    if ret is None:
+        raise ValueError("there are no valid words to choose from")
+    return ret
+
+def write_shards(words, directory):
+    """Write (words) to one file per word length in (directory), without duplicates.
+
+    Words are appended to buffered shard files as they stream in, and each shard is
+    then deduplicated on its own, so memory is bounded by the largest shard rather
+    than by the whole list. Returns a dictionary from word length to word count.
+    """
+    os.makedirs(directory, exist_ok=True)
+    shards = {}
+    try:
+        for word in words:
+            size = len(word)
+            if size not in shards:
+                path = os.path.join(directory, SHARD_NAME.format(size))
+                shards[size] = open(path, "w", encoding="utf8", buffering=BUFFER_SIZE)
+            shards[size].write(word + "\n")
+    finally:
+        for f in shards.values():
+            f.close()
+
+    counts = {}
+    for size in sorted(shards):
+        path = os.path.join(directory, SHARD_NAME.format(size))
+        with open(path, "r", encoding="utf8") as f:
+            shard = list(unique(f.read().splitlines()))
+        with open(path, "w", encoding="utf8", buffering=BUFFER_SIZE) as f:
+            for word in shard:
+                f.write(word + "\n")
+        counts[size] = len(shard)
+    return counts
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream a plain, gzip or xz word list into Hangman.")
+    parser.add_argument("source", help="the word list to read")
+    parser.add_argument("--shards", metavar="DIR", help="write deduplicated words to length-bucketed files in DIR")
+    parser.add_argument("--sample", action="store_true", help="print one random word chosen in a single pass")
+    args = parser.parse_args()
+
+    import agents
+    words = read_words(args.source, agents.HangmanAgent())
+    if args.sample:
+        print(choose_word(words))
+    elif args.shards:
+        for size, count in write_shards(words, args.shards).items():
+            print(str(size)+": "+str(count)+" words")
+    else:
+        for word in unique(words):
+            print(word)
+
+if __name__ == "__main__":
+    main()
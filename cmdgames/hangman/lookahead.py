@@ -0,0 +1,171 @@
+"""Command-Line Hangman Lookahead Search
+
+This file includes the adversarial search behind the Expert mode of Hangman.
+
+After each guess, an evil agent splits the words it could still be thinking of
+into families by where the guess appears, and keeps one family. The search
+looks several guesses ahead to keep the family that forces the most wrong
+guesses, assuming that the player always makes the best guess in return.
+
+The words of one length are held as oracle.Bitsets, so a set of candidate words
+is a single int over their ids, and a family is one AND away from its parent.
+Every position searched is remembered by (candidate bitset, guessed mask), and
+a branch is cut as soon as it cannot change the result. The depth is deepened
+one guess at a time until a time budget runs out, so every guess is answered in
+time with the deepest result that finished.
+
+This file contains the following classes:
+    * Search - a class that chooses the family to keep after a guess
+"""
+
+import time
+
+TIME_LIMIT = 0.5 # the default number of seconds spent searching after each guess
+MAX_DEPTH = 8 # the deepest number of guesses searched after each guess
+MEMO_SIZE = 1 << 18 # the number of positions remembered before the memo is cleared
+
+class _Timeout(Exception):
+    """A private exception used to stop a search when its time runs out."""
+
+class Search:
+    """
+    A class used to choose the family of words to keep after a guess.
+    ...
+
+    Methods
+    -------
+    split(candidates, secret, letter)
+        Return the families of the candidate words after a guess of the letter.
+    choose(candidates, secret, guessed, guess, guesses_left)
+        Return the family that forces the most wrong guesses.
+    """
+
+    def __init__(self, bitsets, time_limit=TIME_LIMIT, max_depth=MAX_DEPTH):
+        """
+        Parameters
+        ----------
+        bitsets : oracle.Bitsets
+            The bitsets of the words of the length being played
+        time_limit : float
+            The number of seconds spent searching after each guess
+        max_depth : int
+            The deepest number of guesses searched after each guess
+        """
+        self._bitsets = bitsets
+        self._time_limit = time_limit
+        self._max_depth = max_depth
+        self._masks = {letter: 1 << i for i, letter in enumerate(bitsets.letters)}
+        self._memo = {}
+        self._deadline = None
+
+    def mask(self, guessed):
+        """Return the guessed mask of the letters (guessed)."""
+        ret = 0
+        for letter in guessed:
+            ret |= self._masks.get(letter, 0)
+        return ret
+
+    def split(self, candidates, secret, letter):
+        """Return the families of the bitset (candidates) after a guess of (letter).
+
+        Each family is a pair of the positions of (secret), the hidden positions, where
+        the letter is revealed, and the bitset of its words. The family where the
+        letter is missing, if any, comes first with no positions.
+        """
+        hit = candidates & self._bitsets.contains.get(letter, 0)
+        ret = []
+        if candidates ^ hit:
+            ret.append(((), candidates ^ hit))
+
+        parts = [((), hit)] if hit else []
+        for p in secret:
+            at = self._bitsets.positions[p].get(letter, 0)
+            split = []
+            for revealed, words in parts:
+                inside = words & at
+                if inside:
+                    split.append((revealed + (p,), inside))
+                if words ^ inside:
+                    split.append((revealed, words ^ inside))
+            parts = split
+        return ret + parts
+
+    def _value(self, candidates, secret, guessed, depth, cap):
+        """Return the number of wrong guesses, up to (cap), that can be forced within (depth) guesses
+        when (candidates) are left with the hidden positions (secret) and the guessed mask (guessed)."""
+        if cap <= 0 or depth == 0 or candidates & (candidates - 1) == 0:
+            return 0
+        key = (candidates, guessed, depth)
+        known = self._memo.get(key)
+        if known is not None:
+            value, bound = known
+            if value < bound:
+                return min(value, cap)
+            if cap <= bound:
+                return cap
+        if time.monotonic() > self._deadline:
+            raise _Timeout
+
+        # Try the most common letters first, since they are usually the best guesses.
+        guesses = []
+        for letter in self._bitsets.letters:
+            if not guessed & self._masks[letter]:
+                n = (candidates & self._bitsets.contains[letter]).bit_count()
+                if n:
+                    guesses.append((-n, letter))
+        guesses.sort()
+
+        best = cap if guesses else 0
+        for _, letter in guesses:
+            worst = 0
+            families = self.split(candidates, secret, letter)
+            families.sort(key=lambda family: (bool(family[0]), -family[1].bit_count()))
+            for revealed, words in families:
+                miss = 0 if revealed else 1
+                rest = tuple(p for p in secret if p not in revealed)
+                value = miss + self._value(words, rest, guessed | self._masks[letter], depth - 1, best - miss)
+                if value > worst:
+                    worst = value
+                    if worst >= best:
+                        break
+            if worst < best:
+                best = worst
+                if best == 0:
+                    break
+
+        if len(self._memo) >= MEMO_SIZE:
+            self._memo.clear()
+        self._memo[key] = (best, cap)
+        return best
+
+    def choose(self, candidates, secret, guessed, guess, guesses_left):
+        """Return the family of the bitset (candidates) to keep after (guess), as a pair of the revealed
+        positions and the bitset of its words.
+
+        (secret) holds the hidden positions before the guess, (guessed) the letters guessed so far,
+        including (guess), and (guesses_left) the number of wrong guesses left before the guess.
+        The family chosen forces the most wrong guesses within the deepest search that finished
+        in time, preferring the largest family and then the family where the guess is missing.
+        """
+        families = self.split(candidates, secret, guess)
+        order = lambda scored: (scored[0], scored[1][1].bit_count(), not scored[1][0])
+        best = max(((0, family) for family in families), key=order)[1]
+        if len(families) == 1:
+            return best
+
+        mask = self.mask(guessed)
+        self._deadline = time.monotonic() + self._time_limit
+        try:
+            for depth in range(1, self._max_depth + 1):
+                scored = []
+                for revealed, words in families:
+                    miss = 0 if revealed else 1
+                    rest = tuple(p for p in secret if p not in revealed)
+                    value = miss + self._value(words, rest, mask, depth - 1, guesses_left - miss)
+                    scored.append((value, (revealed, words)))
+                value, best = max(scored, key=order)
+                if value >= guesses_left:
+                    break
+        except _Timeout:
+            pass
+        return best
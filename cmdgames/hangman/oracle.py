@@ -0,0 +1,230 @@
+"""Command-Line Hangman Oracle
+
+This script answers questions about which words of a dictionary still fit a
+game of Hangman.
+
+A question is a pattern in the format of HangmanAgent._get_pattern, where
+var.SECRET masks a letter that has not been guessed and var.SPACE_OUT stands
+for a space, together with the letters guessed so far. The answer is the number
+of words that match, a sample of them, and how many of them contain each letter
+that has not been guessed.
+
+Nothing is scanned to answer a question. Every word of a WordIndex has an id,
+and the words of each length are described by bitsets over those ids, held as
+Python ints:
+
+    positions : for every position, the words with each letter at that position
+    counts    : for every letter, the words that hold it exactly k times
+    contains  : for every letter, the words that hold it at all
+
+A word matches when it has every revealed letter where the pattern shows it and
+holds each guessed letter exactly as many times as the pattern shows it, so an
+answer costs a few big-int ANDs and popcounts per letter rather than a pass
+over the words.
+
+This file contains the following classes:
+    * Bitsets - a class that holds the bitsets of the words of one length
+    * Oracle - a class that answers questions about a WordIndex
+
+This file contains the following functions:
+    * main - the main function of the script, which answers a question from the command line
+"""
+
+import argparse
+
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/../hangman")
+import variables as var
+import wordindex
+
+SAMPLE = 10 # the default number of matching words in an answer
+
+def _bitset(ids):
+    """Return the int whose set bits are (ids)."""
+    if not ids:
+        return 0
+    bits = bytearray(ids[-1] // 8 + 1)
+    for i in ids:
+        bits[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(bits, "little")
+
+class Bitsets:
+    """
+    A class used to hold the bitsets of the words of one length.
+    ...
+
+    Bit k of every bitset stands for the word number k of the list the bitsets were built from.
+
+    Attributes
+    ----------
+
+    all : int
+        the bitset of every word
+    positions : list
+        for every position, a dictionary of the bitset of the words with each letter there
+    counts : dict
+        the bitset of the words that hold each (letter, k) pair exactly k times
+    contains : dict
+        the bitset of the words that hold each letter at all
+    letters : list
+        the sorted list of letters, other than spaces, that appear in the words
+
+    Methods
+    -------
+    match(pattern, guessed=())
+        Return the bitset of the words that match the pattern.
+    """
+
+    def __init__(self, words):
+        """
+        Parameters
+        ----------
+        words : sequence
+            The words, which must all have the same length
+        """
+        self.all = (1 << len(words)) - 1
+        positions = [{} for _ in range(len(words[0]) if words else 0)]
+        counts = {}
+        contains = {}
+        for k, word in enumerate(words):
+            word = word.lower()
+            for p, letter in enumerate(word):
+                positions[p].setdefault(letter, []).append(k)
+            for letter in set(word):
+                contains.setdefault(letter, []).append(k)
+                counts.setdefault((letter, word.count(letter)), []).append(k)
+
+        self.positions = [{letter: _bitset(ids) for letter, ids in p.items()} for p in positions]
+        self.counts = {key: _bitset(ids) for key, ids in counts.items()}
+        self.contains = {letter: _bitset(ids) for letter, ids in contains.items()}
+        self.letters = sorted(letter for letter in contains if letter != var.SPACE_IN)
+
+    def match(self, pattern, guessed=()):
+        """Return the bitset of the words that match (pattern), in the format of
+        HangmanAgent._get_pattern, after the letters (guessed)."""
+        if len(pattern) != len(self.positions):
+            return 0
+
+        revealed = {}
+        ret = self.all
+        for p, letter in enumerate(pattern):
+            if letter == var.SECRET:
+                continue
+            letter = var.SPACE_IN if letter == var.SPACE_OUT else letter.lower()
+            ret &= self.positions[p].get(letter, 0)
+            if not ret:
+                return 0
+            revealed[letter] = revealed.get(letter, 0) + 1
+
+        # A guessed letter is either revealed everywhere it appears or not in the word at all.
+        for letter in {g.lower() for g in guessed} | set(revealed):
+            if letter == var.SPACE_IN:
+                continue
+            if letter in revealed:
+                ret &= self.counts.get((letter, revealed[letter]), 0)
+            else:
+                ret &= ~self.contains.get(letter, 0)
+            if not ret:
+                return 0
+        return ret
+
+class Oracle:
+    """
+    A class used to answer questions about which words of a WordIndex fit a game of Hangman.
+    ...
+
+    Attributes
+    ----------
+
+    index : WordIndex
+        the words that questions are answered about
+
+    Methods
+    -------
+    query(pattern, guessed=(), sample=SAMPLE)
+        Return the number of matching words, a sample of them, and the frequency of each letter among them.
+    matches(pattern, guessed=())
+        Return every word that matches the pattern.
+    """
+
+    @property
+    def index(self):
+        """the words that questions are answered about"""
+        return self._index
+
+    def __init__(self, index):
+        """
+        Parameters
+        ----------
+        index : WordIndex
+            The words to answer questions about, which are indexed up front
+        """
+        self._index = index
+        self._lengths = {}
+        for size in index.sizes:
+            self._lengths[size] = Bitsets(list(index.words_of_length(size)))
+
+    def _candidates(self, pattern, guessed):
+        """Return the Bitsets of (pattern) and the bitset of the words that match it after (guessed)."""
+        length = self._lengths.get(len(pattern))
+        if length is None:
+            return None, 0
+        return length, length.match(pattern, guessed)
+
+    def matches(self, pattern, guessed=()):
+        """Return every word that matches (pattern), in the format of HangmanAgent._get_pattern,
+        after the letters (guessed), in the order of the index."""
+        _, bits = self._candidates(pattern, guessed)
+        return self._words(len(pattern), bits, bits.bit_count())
+
+    def query(self, pattern, guessed=(), sample=SAMPLE):
+        """Return the answer to (pattern), in the format of HangmanAgent._get_pattern, after the letters (guessed).
+
+        The answer is a dictionary of the number of matching words (count), the first (sample) of
+        them in the order of the index (sample), and the number of them that contain each letter
+        that is not revealed or guessed (frequencies), from most to least common.
+        """
+        length, bits = self._candidates(pattern, guessed)
+        count = bits.bit_count()
+        frequencies = {}
+        if count:
+            skip = {g.lower() for g in guessed} | {letter.lower() for letter in pattern}
+            for letter in length.letters:
+                if letter not in skip:
+                    n = (bits & length.contains[letter]).bit_count()
+                    if n:
+                        frequencies[letter] = n
+        frequencies = dict(sorted(frequencies.items(), key=lambda item: (-item[1], item[0])))
+        return {"count": count, "sample": self._words(len(pattern), bits, sample), "frequencies": frequencies}
+
+    def _words(self, size, bits, limit):
+        """Return the words of length (size) whose bits are set in (bits), up to (limit) of them."""
+        start, _ = self._index.id_range(size)
+        ret = []
+        while bits and len(ret) < limit:
+            low = bits & -bits
+            ret.append(self._index.word(start + low.bit_length() - 1))
+            bits ^= low
+        return ret
+
+def main():
+    parser = argparse.ArgumentParser(description="Answer which words of a Hangman dictionary fit a pattern.")
+    parser.add_argument("pattern", help="the current word, with "+var.SECRET+" for a hidden letter and "
+                        +var.SPACE_OUT+" for a space")
+    parser.add_argument("guessed", nargs="?", default="", help="the letters guessed so far, such as 'aeit'")
+    parser.add_argument("--dictionary", default=var.DICTIONARY, help="the word list to answer from")
+    parser.add_argument("--sample", type=int, default=SAMPLE, help="the number of matching words to print")
+    args = parser.parse_args()
+
+    import agents
+    oracle = Oracle(wordindex.load(args.dictionary, agents.HangmanAgent()))
+    answer = oracle.query(args.pattern, args.guessed, args.sample)
+    print(str(answer["count"])+" matching words")
+    for word in answer["sample"]:
+        print("  "+word)
+    for letter, n in answer["frequencies"].items():
+        print(letter+": "+str(n))
+
+if __name__ == "__main__":
+    main()
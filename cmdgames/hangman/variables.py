@@ -1,5 +1,8 @@
 """Command-Line Hangman Variables"""
 
+import os
+
 SECRET = '*' # the character used to mask a hidden letter
 SPACE_IN = ' ' # the character that is accepted as a space input
-SPACE_OUT = '_' # the character used as a space output
\ No newline at end of file
+SPACE_OUT = '_' # the character used as a space output
+DICTIONARY = os.path.join(os.path.dirname(os.path.realpath(__file__)), "dictionary.txt") # the default word list
\ No newline at end of file
@@ -0,0 +1,169 @@
+"""Command-Line Hangman Word Index
+
+This file includes a read-only index of a word list, which can be loaded once
+and shared by any number of Hangman games.
+
+The index is a single flat buffer, which shareddata.py publishes once so that
+worker processes map it instead of copying it. It holds a header, a table of word lengths, the offset of every
+word, and the UTF-8 text of every word, with the words grouped by length:
+
+    header   : the magic bytes b"WIDX", the number of words and the number of lengths
+    lengths  : one (length, first word, last word + 1) triple per word length
+    offsets  : the start of every word in the text, plus the end of the text
+    text     : every word, one after the other
+
+All of the numbers are 32-bit unsigned integers in the native byte order.
+
+This file contains the following classes:
+    * WordIndex - a read-only view of a word index
+
+This file contains the following functions:
+    * build - build a WordIndex from a sequence of words
+    * load - read a word list into a WordIndex
+"""
+
+import bisect
+import random
+import struct
+
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/../hangman")
+import ingest
+
+MAGIC = b"WIDX" # the first bytes of every word index
+HEADER = struct.Struct("=4sII") # the magic bytes, the number of words and the number of lengths
+LENGTH = struct.Struct("=III") # a word length, its first word and its last word + 1
+
+class _Words:
+    """A private class used to represent the words of one length as a read-only sequence."""
+
+    def __init__(self, index, start, stop):
+        self._index = index
+        self._start = start
+        self._stop = stop
+
+    def __len__(self):
+        return self._stop - self._start
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if i < 0 or i >= len(self):
+            raise IndexError(i)
+        return self._index.word(self._start + i)
+
+    def __iter__(self):
+        for i in range(self._start, self._stop):
+            yield self._index.word(i)
+
+class WordIndex:
+    """
+    A class used to represent a read-only view of a word index.
+    ...
+
+    Attributes
+    ----------
+
+    buffer : bytes-like
+        the flat buffer that holds the whole index
+    sizes : list
+        the sorted list of word lengths that have at least one word
+
+    Methods
+    -------
+    choose_word()
+        Return a word chosen uniformly at random from the whole index.
+    id_range(size)
+        Return the first id and the last id + 1 of the words with the length (size).
+    word(i)
+        Return the word with the id (i).
+    words_of_length(size)
+        Return every word with the length (size).
+    """
+
+    @property
+    def buffer(self):
+        """the flat buffer that holds the whole index"""
+        return self._buffer
+
+    @property
+    def sizes(self):
+        """the sorted list of word lengths that have at least one word"""
+        return self._sizes.copy()
+
+    def __init__(self, buffer):
+        """
+        Parameters
+        ----------
+        buffer : bytes-like
+            The flat buffer of an index returned by build(), such as a view of shared memory
+        """
+        view = memoryview(buffer)
+        magic, count, num_sizes = HEADER.unpack_from(view, 0)
+        if magic != MAGIC:
+            raise ValueError("the buffer does not hold a word index")
+
+        self._buffer = buffer
+        self._sizes = []
+        self._starts = []
+        self._ends = []
+        pos = HEADER.size
+        for _ in range(num_sizes):
+            size, start, stop = LENGTH.unpack_from(view, pos)
+            self._sizes.append(size)
+            self._starts.append(start)
+            self._ends.append(stop)
+            pos += LENGTH.size
+
+        self._offsets = view[pos:pos + 4 * (count + 1)].cast("I")
+        self._text = view[pos + 4 * (count + 1):]
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def word(self, i):
+        """Return the word with the id (i)."""
+        return str(self._text[self._offsets[i]:self._offsets[i+1]], "utf8")
+
+    def choose_word(self, rng=random):
+        """Return a word chosen uniformly at random from the whole index."""
+        return self.word(rng.randrange(len(self)))
+
+    def words_of_length(self, size):
+        """Return every word with the length (size) as a read-only sequence."""
+        b = bisect.bisect_left(self._sizes, size)
+        if b == len(self._sizes) or self._sizes[b] != size:
+            return _Words(self, 0, 0)
+        return _Words(self, self._starts[b], self._ends[b])
+
+    def id_range(self, size):
+        """Return the first id and the last id + 1 of the words with the length (size)."""
+        words = self.words_of_length(size)
+        return words._start, words._stop
+
+def build(words):
+    """Build a WordIndex from (words), which should already be valid and free of duplicates."""
+    buckets = {}
+    for word in words:
+        buckets.setdefault(len(word), []).append(word.encode("utf8"))
+
+    sizes = sorted(buckets)
+    count = sum(len(buckets[size]) for size in sizes)
+    header = bytearray(HEADER.pack(MAGIC, count, len(sizes)))
+    offsets = bytearray()
+    text = bytearray()
+    i = 0
+    for size in sizes:
+        header += LENGTH.pack(size, i, i + len(buckets[size]))
+        for word in buckets[size]:
+            offsets += struct.pack("=I", len(text))
+            text += word
+        i += len(buckets[size])
+    offsets += struct.pack("=I", len(text))
+
+    return WordIndex(bytes(header + offsets + text))
+
+def load(path, agent):
+    """Read the word list at (path), keeping the words that are valid for (agent), and return its WordIndex."""
+    return build(ingest.unique(ingest.read_words(path, agent)))
@@ -0,0 +1,167 @@
+"""Command-Line Game Memory Report
+
+This script measures how much memory the game engines use.
+
+Each scenario is run once under tracemalloc, and the objects it leaves alive
+are counted by type. The scenarios are:
+
+    tictactoe_tree : building the TicTacToe game tree with TicTacToe()
+    tictactoe_game : a full game between two CPU agents on an existing tree
+    hangman_evil   : loading the Hangman dictionary and playing an evil game
+
+For every scenario the report holds the peak and the retained memory in bytes,
+the change in the number of live objects of each type (such as _State, list and
+str), and the lines of code that allocated the most memory. The report is JSON
+with sorted keys and paths relative to the repository, so two reports can be
+compared with any diff tool.
+
+Objects that the garbage collector does not track, such as strings and ints,
+are counted when a tracked object refers to them, which covers those held in
+lists, dictionaries and instances.
+
+This file contains the following functions:
+    * measure - run a function under tracemalloc and return its measurements
+    * report - measure every scenario and return the report
+    * write_report - write the report as JSON to a file or to stdout
+    * main - the main function of the script, which writes the report
+"""
+
+import argparse
+import collections
+import gc
+import json
+import platform
+import random
+import tracemalloc
+
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.realpath(__file__)))
+import gameloader
+
+ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__))) # the folder that paths are reported from
+HOTSPOTS = 10 # the number of lines of code reported per scenario
+TYPES = 25 # the number of object types reported per scenario
+GUESSES = "etaoinshrdlcumwfgypbvkjxqz" # the guesses made in the evil Hangman game, in order
+
+def _count_objects():
+    """Return a Counter of the live objects by type name, including untracked objects held by tracked ones."""
+    objects = gc.get_objects()
+    types = collections.Counter(map(type, objects))
+    untracked = {id(ref): ref for ref in gc.get_referents(*objects) if not gc.is_tracked(ref)}
+    types.update(map(type, untracked.values()))
+    ret = collections.Counter()
+    for kind, n in types.items():
+        ret[kind.__qualname__] += n
+    return ret
+
+def _location(frame):
+    """Return the file and line of a tracemalloc frame (frame), relative to the repository if it is inside it."""
+    path = frame.filename
+    if path.startswith(ROOT + os.sep):
+        path = os.path.relpath(path, ROOT).replace(os.sep, "/")
+    return path + ":" + str(frame.lineno)
+
+def measure(function, *args):
+    """Run function(*args) under tracemalloc and return its measurements as a dictionary.
+
+    The result of the function is kept alive until its objects have been counted, so
+    the report shows what the function retains as well as what it allocated on the way.
+    """
+    gc.collect()
+    before_counts = _count_objects()
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        base, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+
+        result = function(*args)
+        gc.collect()
+        current, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        if started:
+            tracemalloc.stop()
+    # The objects are counted while nothing is traced, since counting allocates and tracing slows it down.
+    after_counts = _count_objects()
+    del result
+
+    filters = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+    stats = after.filter_traces(filters).compare_to(before.filter_traces(filters), "lineno")
+    hotspots = [{"line": _location(stat.traceback[0]), "bytes": stat.size_diff, "blocks": stat.count_diff}
+                for stat in stats[:HOTSPOTS] if stat.size_diff > 0]
+
+    # Only the types that gained live objects are reported, the most first.
+    changes = {name: after_counts[name] - before_counts.get(name, 0) for name in after_counts}
+    changes = sorted(((n, name) for name, n in changes.items() if n > 0), reverse=True)[:TYPES]
+    return {"peak_bytes": peak - base, "retained_bytes": current - base, "hotspots": hotspots,
+            "objects": {name: n for n, name in changes}}
+
+def _tictactoe_tree():
+    """Build a TicTacToe game tree."""
+    return gameloader.load_game("tictactoe").TicTacToe()
+
+def _tictactoe_game(game):
+    """Play a full game between an UnbeatableAgent and a FlawedAgent on the tree of (game)."""
+    tictactoe = gameloader.load_game("tictactoe")
+    players = {tictactoe.var.PLAYER_ONE: tictactoe.agents.UnbeatableAgent("CPU_1", tictactoe.var.PLAYER_ONE),
+               tictactoe.var.PLAYER_TWO: tictactoe.agents.FlawedAgent("CPU_2", tictactoe.var.PLAYER_TWO)}
+    game.start_game()
+    while not game.is_terminal():
+        game.take_turn(players[game.state.player])
+    return players
+
+def _hangman_evil():
+    """Load the Hangman dictionary and play an evil game against a fixed order of guesses."""
+    hangman = gameloader.load_game("hangman")
+    wordindex = gameloader.load_game("hangman", "wordindex")
+    index = wordindex.load(hangman.var.DICTIONARY, hangman.agents.HangmanAgent())
+    agent = hangman.agents.EvilAgent(index)
+    agent.start_game()
+    for guess in GUESSES:
+        if agent.is_terminal():
+            break
+        agent.take_guess(guess)
+    return index, agent
+
+def _scenarios():
+    """Return the name, setup and measured function of every scenario."""
+    return [("tictactoe_tree", None, _tictactoe_tree),
+            ("tictactoe_game", _tictactoe_tree, _tictactoe_game),
+            ("hangman_evil", None, _hangman_evil)]
+
+def report(scenarios=None, seed=0):
+    """Measure every scenario and return the report as a dictionary.
+
+    (scenarios) is a list of (name, setup, function) triples, where function is measured with
+    the result of setup, if there is one, and defaults to the built-in scenarios. Random choices
+    are seeded with (seed) so that reports can be compared.
+    """
+    scenarios = _scenarios() if scenarios is None else scenarios
+    ret = {"python": platform.python_version(), "scenarios": {}}
+    for name, setup, function in scenarios:
+        random.seed(seed)
+        args = () if setup is None else (setup(),)
+        ret["scenarios"][name] = measure(function, *args)
+        del args
+    return ret
+
+def write_report(path="-", scenarios=None):
+    """Measure every scenario and write the report as JSON to the file at (path), or to stdout for "-"."""
+    text = json.dumps(report(scenarios), indent=2, sort_keys=True) + "\n"
+    if path == "-":
+        sys.stdout.write(text)
+    else:
+        with open(path, "w", encoding="utf8") as f:
+            f.write(text)
+
+def main():
+    parser = argparse.ArgumentParser(description="Report the memory used by the game engines as JSON.")
+    parser.add_argument("-o", "--output", default="-", help="the file to write the report to, or - for stdout")
+    write_report(parser.parse_args().output)
+
+if __name__ == "__main__":
+    main()
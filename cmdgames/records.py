@@ -0,0 +1,407 @@
+"""Command-Line Game Records
+
+This script records every game of TicTacToe and Hangman that is played, and
+replays any of them.
+
+Every finished game is appended to a log as one compact record, and the place
+of the record is appended to an index kept beside the log, in a file with the
+same name followed by ".idx". A game is looked up by its number, the number of
+games recorded before it, by reading its entry of the index and then its record,
+so the log is never scanned. The records are:
+
+    TicTacToe : the kind b"T", the code of the first board (see tictactoe/rules.py)
+                with the player that moves first in its top bit, the number of moves,
+                and the cell of every move, numbered in reading order, two to a byte
+                (the first in the high half)
+    Hangman   : the kind b"H", the number of wrong guesses allowed, the secret word,
+                the number of guesses, and the code of every guess, one to a byte
+
+A secret word is stored as its id in the word index that it was chosen from,
+when there is one (see hangman/wordindex.py), or else as the size of its UTF-8
+text, seven bits to a byte with the top bit set on every byte but the last,
+followed by the text. A guess is stored as its place in ALPHABET, or as ESCAPE
+followed by its UTF-8 text.
+
+Records are not written one at a time. The records of finished games are kept
+in memory and written in batches, each with a single write to the log and then
+a single write to the index, so the index never points past the end of the log.
+
+The process records games once a log has been chosen with configure() or use().
+Until then, recording a game does nothing.
+
+This file contains the following classes:
+    * Recorder - a writer that appends games to a log in batches
+    * GameLog - a reader that looks up and replays the games of a log
+
+This file contains the following functions:
+    * configure - choose the log that the process records games to
+    * use - choose the Recorder of the process
+    * recording - return whether the process records games
+    * record_tictactoe, record_hangman - record a finished game
+    * encode_tictactoe, encode_hangman - return the record of a game
+    * decode - return the game of a record
+    * main - the main function of the script, which replays a recorded game
+"""
+
+import argparse
+import atexit
+import functools
+import struct
+import threading
+
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.realpath(__file__)))
+
+TICTACTOE = b"T" # the kind of a TicTacToe record
+HANGMAN = b"H" # the kind of a Hangman record
+ENTRY = struct.Struct("<QI") # an entry of the index: the offset and the size of a record
+ROOT = struct.Struct("<H") # the code of the first board of a TicTacToe game and the player that moves first
+SECOND = 0x8000 # the bit of ROOT that is set if player two moves first
+WORD_ID = struct.Struct("<I") # the id of a secret word in its word index
+BY_ID = 0 # the secret word of a Hangman record is stored as an id
+BY_TEXT = 1 # the secret word of a Hangman record is stored as text
+ALPHABET = "abcdefghijklmnopqrstuvwxyz0123456789" # the guesses that are stored as a single code
+ESCAPE = 0xFF # the code of a guess that is stored as text
+BATCH = 64 # the number of records kept in memory before they are written
+SIZE = 3 # the number of rows and columns of a TicTacToe board
+SECRET = "*" # the character that a hidden letter is replayed as, as in Hangman
+SPACE_OUT = "_" # the character that a space is replayed as, as in Hangman
+
+_recorder = None
+
+def _pack_cells(cells):
+    """Return the cells (cells), each less than 16, packed two to a byte."""
+    ret = bytearray()
+    for i in range(0, len(cells), 2):
+        ret.append(cells[i] << 4 | (cells[i+1] if i + 1 < len(cells) else 0))
+    return bytes(ret)
+
+def _unpack_cells(data, count):
+    """Return the first (count) cells packed two to a byte in (data)."""
+    return [data[i // 2] >> 4 if i % 2 == 0 else data[i // 2] & 0x0F for i in range(count)]
+
+def _pack_size(size):
+    """Return the size (size) packed seven bits to a byte, lowest first, with the top bit set on every
+    byte but the last."""
+    ret = bytearray()
+    while size >= 0x80:
+        ret.append(size & 0x7F | 0x80)
+        size >>= 7
+    ret.append(size)
+    return bytes(ret)
+
+def _unpack_size(data, pos):
+    """Return the size packed by _pack_size() at (pos) in (data), and the position after it."""
+    size = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        size |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return size, pos
+        shift += 7
+
+@functools.lru_cache(maxsize=4)
+def _word_ids(dictionary):
+    """Return a dictionary from every word of the WordIndex (dictionary) to its id."""
+    return {dictionary.word(i): i for i in range(len(dictionary))}
+
+def encode_tictactoe(root, player, moves):
+    """Return the record of a TicTacToe game played from the board with the code (root), where the
+    player with the digit (player) moves first, with the cells (moves), in reading order."""
+    return TICTACTOE + ROOT.pack(root | (SECOND if player == 2 else 0)) + bytes([len(moves)]) + _pack_cells(moves)
+
+def encode_hangman(word, guesses, allowed, dictionary=None):
+    """Return the record of a Hangman game with the secret word (word), the guesses (guesses),
+    in order, and (allowed) wrong guesses, where (dictionary) is the word index of the word."""
+    ret = bytearray(HANGMAN)
+    ret.append(allowed)
+    word_id = None if dictionary is None or isinstance(dictionary, str) else _word_ids(dictionary).get(word)
+    if word_id is None:
+        text = word.encode("utf8")
+        ret += bytes([BY_TEXT]) + _pack_size(len(text)) + text
+    else:
+        ret += bytes([BY_ID]) + WORD_ID.pack(word_id)
+    ret.append(len(guesses))
+    for guess in guesses:
+        if len(guess) == 1 and guess in ALPHABET:
+            ret.append(ALPHABET.index(guess))
+        else:
+            text = guess.encode("utf8")
+            ret += bytes([ESCAPE, len(text)]) + text
+    return bytes(ret)
+
+def decode(record, dictionary=None):
+    """Return the game of (record) as a dictionary, where (dictionary) is the word index
+    that the ids of secret words refer to, if there is one."""
+    if record[:1] == TICTACTOE:
+        (root,) = ROOT.unpack_from(record, 1)
+        pos = 1 + ROOT.size
+        return {"game": "tictactoe", "root": root & ~SECOND, "player": 2 if root & SECOND else 1,
+                "moves": _unpack_cells(record[pos + 1:], record[pos])}
+
+    allowed, how = record[1], record[2]
+    if how == BY_ID:
+        (word_id,) = WORD_ID.unpack_from(record, 3)
+        ret = {"game": "hangman", "allowed": allowed, "word_id": word_id}
+        if dictionary is not None:
+            ret["word"] = dictionary.word(word_id)
+        pos = 3 + WORD_ID.size
+    else:
+        size, pos = _unpack_size(record, 3)
+        ret = {"game": "hangman", "allowed": allowed, "word": str(record[pos:pos + size], "utf8")}
+        pos += size
+
+    guesses = []
+    count = record[pos]
+    pos += 1
+    for _ in range(count):
+        if record[pos] == ESCAPE:
+            guesses.append(str(record[pos + 2:pos + 2 + record[pos + 1]], "utf8"))
+            pos += 2 + record[pos + 1]
+        else:
+            guesses.append(ALPHABET[record[pos]])
+            pos += 1
+    ret["guesses"] = guesses
+    return ret
+
+class Recorder:
+    """
+    A class used to represent a writer that appends games to a log in batches.
+    ...
+
+    Attributes
+    ----------
+
+    path : str
+        the path of the log
+
+    Methods
+    -------
+    append(record)
+        Keep (record) to be written with the next batch.
+    flush()
+        Write every record that is kept in memory.
+    close()
+        Write every record that is kept in memory and close the log.
+    """
+
+    @property
+    def path(self):
+        """the path of the log"""
+        return self._path
+
+    def __init__(self, path, batch=BATCH):
+        """
+        Parameters
+        ----------
+        path : str
+            The path of the log, which is created if it does not exist
+        batch : int
+            The number of records kept in memory before they are written
+        """
+        self._path = path
+        self._batch = batch
+        self._log = open(path, "ab")
+        self._index = open(path + ".idx", "ab")
+        self._end = self._log.seek(0, os.SEEK_END)
+        self._records = bytearray()
+        self._entries = bytearray()
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def append(self, record):
+        """Keep (record) to be written with the next batch, and write the batch if it is full."""
+        with self._lock:
+            self._entries += ENTRY.pack(self._end + len(self._records), len(record))
+            self._records += record
+            self._count += 1
+            if self._count >= self._batch:
+                self._flush()
+
+    def flush(self):
+        """Write every record that is kept in memory."""
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        if self._count:
+            self._log.write(self._records)
+            self._log.flush()
+            self._index.write(self._entries)
+            self._index.flush()
+            self._end += len(self._records)
+            self._records.clear()
+            self._entries.clear()
+            self._count = 0
+
+    def close(self):
+        """Write every record that is kept in memory and close the log."""
+        with self._lock:
+            if not self._log.closed:
+                self._flush()
+                self._log.close()
+                self._index.close()
+
+class GameLog:
+    """
+    A class used to represent a reader that looks up and replays the games of a log.
+    ...
+
+    Methods
+    -------
+    record(number)
+        Return the record of the game (number).
+    game(number)
+        Return the game (number) as a dictionary.
+    replay(number)
+        Return every position of the game (number), from the first to the last.
+    close()
+        Close the log.
+    """
+
+    def __init__(self, path, dictionary=None):
+        """
+        Parameters
+        ----------
+        path : str
+            The path of the log
+        dictionary : WordIndex
+            The word index that the ids of secret words refer to, if there is one
+        """
+        self._log = open(path, "rb")
+        self._index = open(path + ".idx", "rb")
+        self._dictionary = dictionary
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self._index.seek(0, os.SEEK_END) // ENTRY.size
+
+    def record(self, number):
+        """Return the record of the game (number), counted from 0, reading only its entry and itself."""
+        if number < 0 or number >= len(self):
+            raise IndexError(number)
+        self._index.seek(number * ENTRY.size)
+        offset, size = ENTRY.unpack(self._index.read(ENTRY.size))
+        self._log.seek(offset)
+        return self._log.read(size)
+
+    def game(self, number):
+        """Return the game (number) as a dictionary (see decode())."""
+        return decode(self.record(number), self._dictionary)
+
+    def replay(self, number):
+        """Return every position of the game (number), from the first to the last: the boards of
+        a TicTacToe game as lists of digits, or the patterns of a Hangman game.
+
+        The secret word of a Hangman game must be known, so a word that is stored as an id
+        needs the word index that it refers to.
+        """
+        game = self.game(number)
+        if game["game"] == "tictactoe":
+            code = game["root"]
+            cells = []
+            for _ in range(SIZE * SIZE):
+                code, digit = divmod(code, 3)
+                cells.append(digit)
+            player = game["player"]
+            ret = [cells.copy()]
+            for move in game["moves"]:
+                cells[move] = player
+                player = 3 - player
+                ret.append(cells.copy())
+            return ret
+
+        if "word" not in game:
+            raise ValueError("the secret word of game "+str(number)+" is stored as an id, so a dictionary is needed")
+        guessed = set()
+        ret = []
+        for guess in [None] + game["guesses"]:
+            if guess is not None:
+                guessed.add(guess)
+            ret.append("".join(c if c.lower() in guessed else SPACE_OUT if c == " " else SECRET if c.isalpha() else c
+                               for c in game["word"]))
+        return ret
+
+    def close(self):
+        """Close the log."""
+        self._log.close()
+        self._index.close()
+
+def configure(path, batch=BATCH):
+    """Record every game that the process plays to the log at (path), writing (batch) games at a time.
+
+    The games that are still in memory are written when the process exits.
+    """
+    recorder = Recorder(path, batch)
+    atexit.register(recorder.close)
+    old = use(recorder)
+    if old is not None:
+        old.close()
+
+def use(recorder):
+    """Choose (recorder) as the Recorder of the process, or None to stop recording, and return the one it replaces."""
+    global _recorder
+    ret = _recorder
+    _recorder = recorder
+    return ret
+
+def recording():
+    """Return whether the process records games."""
+    return _recorder is not None
+
+def record_tictactoe(root, player, moves):
+    """Record a TicTacToe game played from the board with the code (root), where the player with
+    the digit (player) moves first, with the cells (moves), if the process records games."""
+    if _recorder is not None:
+        _recorder.append(encode_tictactoe(root, player, moves))
+
+def record_hangman(word, guesses, allowed, dictionary=None):
+    """Record a Hangman game with the secret word (word), the guesses (guesses) and (allowed)
+    wrong guesses, where (dictionary) is the word list that the word was chosen from."""
+    if _recorder is not None:
+        _recorder.append(encode_hangman(word, guesses, allowed, dictionary))
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded game.")
+    parser.add_argument("log", help="the path of the log")
+    parser.add_argument("number", type=int, nargs="?", help="the number of the game, or none to count the games")
+    parser.add_argument("--dictionary", default=None, metavar="PATH",
+                        help="the word list that the ids of secret words refer to, the Hangman dictionary if not given")
+    args = parser.parse_args()
+
+    with GameLog(args.log) as log:
+        if args.number is None:
+            print(len(log), "games")
+            return
+        by_id = "word_id" in log.game(args.number)
+
+    dictionary = None
+    if by_id:
+        import gameloader
+        hangman = gameloader.load_game("hangman")
+        path = hangman.var.DICTIONARY if args.dictionary is None else args.dictionary
+        dictionary = gameloader.load_game("hangman", "wordindex").load(path, hangman.agents.HangmanAgent())
+    with GameLog(args.log, dictionary) as log:
+        print(log.game(args.number))
+        for position in log.replay(args.number):
+            if isinstance(position, str):
+                print(position)
+            else:
+                print("/".join("".join(".XO"[c] for c in position[r * SIZE:(r + 1) * SIZE]) for r in range(SIZE)))
+
+if __name__ == "__main__":
+    main()
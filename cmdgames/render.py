@@ -0,0 +1,187 @@
+"""Command-Line Game Renderer
+
+This script draws the screens of the games.
+
+Instead of printing a line at a time, a game composes each screen into a Frame
+and shows it once. Frames are written by a sink, chosen once for the whole
+process:
+
+    plain : writes every frame to the terminal in a single write (the default)
+    ansi  : repaints only the lines that changed since the last frame
+    none  : skips drawing entirely, for tests and headless runs
+
+The sink defaults to the CMDGAMES_RENDER environment variable, and can be
+changed with configure() or use().
+
+This file contains the following classes:
+    * Frame - a screen of text composed line by line
+    * StreamSink - a sink that writes whole frames to a stream
+    * NullSink - a sink that discards every frame
+    * AnsiSink - a sink that repaints only the lines that changed
+
+This file contains the following functions:
+    * configure - choose the sink of the process by name
+    * use - choose the sink of the process
+    * show - draw a frame with the sink of the process
+"""
+
+import os
+import sys
+
+PLAIN = "plain" # the name of the sink that writes whole frames
+ANSI = "ansi" # the name of the sink that repaints changed lines
+NONE = "none" # the name of the sink that draws nothing
+MODES = (PLAIN, ANSI, NONE) # the names of every sink
+
+CLEAR_SCREEN = "\x1b[2J" # the ANSI code that clears the terminal
+CLEAR_LINE = "\x1b[2K" # the ANSI code that clears the line under the cursor
+CLEAR_BELOW = "\x1b[J" # the ANSI code that clears the terminal below the cursor
+
+class Frame:
+    """
+    A class used to represent a screen of text composed line by line.
+    ...
+
+    Attributes
+    ----------
+
+    lines : list
+        the lines of the frame, without line endings
+
+    Methods
+    -------
+    add(*parts)
+        Add a line made of (parts) separated by spaces, like print().
+    blank(count)
+        Add (count) empty lines.
+    """
+
+    @property
+    def lines(self):
+        """the lines of the frame, without line endings"""
+        return list(self._lines)
+
+    def __init__(self):
+        self._lines = []
+
+    def add(self, *parts):
+        """Add a line made of (parts) separated by spaces, like print(). Text with line breaks adds several lines."""
+        self._lines.extend(" ".join(str(part) for part in parts).split("\n"))
+        return self
+
+    def blank(self, count=1):
+        """Add (count) empty lines."""
+        self._lines.extend([""] * count)
+        return self
+
+    def __str__(self):
+        """Return the text of the frame, ending with a line break like the prints it replaces."""
+        return "".join(line + "\n" for line in self._lines)
+
+class StreamSink:
+    """
+    A class used to represent a sink that writes whole frames to a stream.
+    ...
+
+    Methods
+    -------
+    show(frame)
+        Write (frame) to the stream in a single write.
+    """
+
+    def __init__(self, stream=None):
+        """
+        Parameters
+        ----------
+        stream : file
+            The stream to write to, which defaults to the standard output at the time of each write
+        """
+        self._stream = stream
+
+    def show(self, frame):
+        """Write (frame) to the stream in a single write."""
+        stream = sys.stdout if self._stream is None else self._stream
+        stream.write(str(frame))
+        stream.flush()
+
+class NullSink:
+    """
+    A class used to represent a sink that discards every frame.
+    ...
+
+    Methods
+    -------
+    show(frame)
+        Do nothing.
+    """
+
+    def show(self, frame):
+        """Do nothing."""
+        pass
+
+class AnsiSink(StreamSink):
+    """
+    A class used to represent a sink that repaints only the lines that changed.
+    ...
+
+    Every frame is drawn from the top of the terminal. Lines that are the same as
+    in the last frame are left alone, and anything below the frame, such as the
+    answers to the last prompts, is cleared.
+
+    Methods
+    -------
+    show(frame)
+        Repaint the lines of (frame) that differ from the last frame.
+    """
+
+    def __init__(self, stream=None):
+        """
+        Parameters
+        ----------
+        stream : file
+            The terminal to write to, which defaults to the standard output at the time of each write
+        """
+        super().__init__(stream)
+        self._last = None
+
+    def show(self, frame):
+        """Repaint the lines of (frame) that differ from the last frame, in a single write."""
+        stream = sys.stdout if self._stream is None else self._stream
+        lines = frame.lines
+        if self._last is None:
+            text = CLEAR_SCREEN + "".join(_move_to(row) + line for row, line in enumerate(lines))
+        else:
+            text = "".join(_move_to(row) + CLEAR_LINE + line for row, line in enumerate(lines)
+                           if row >= len(self._last) or self._last[row] != line)
+        text += _move_to(len(lines)) + CLEAR_BELOW
+        self._last = lines
+
+        stream.write(text)
+        stream.flush()
+
+def _move_to(row):
+    """Return the ANSI code that moves the cursor to the start of line (row), counting from 0."""
+    return "\x1b[" + str(row + 1) + ";1H"
+
+_sink = None
+
+def configure(mode=None):
+    """Choose the sink of the process by name, from MODES. The name defaults to the
+    CMDGAMES_RENDER environment variable, or PLAIN if it is not set."""
+    mode = os.environ.get("CMDGAMES_RENDER", PLAIN) if mode is None else mode
+    if mode not in MODES:
+        raise ValueError("unknown render mode "+mode)
+    use({PLAIN: StreamSink, ANSI: AnsiSink, NONE: NullSink}[mode]())
+
+def use(sink):
+    """Choose (sink) as the sink of the process and return the sink it replaces."""
+    global _sink
+    ret = _sink
+    _sink = sink
+    return ret
+
+def show(frame):
+    """Draw (frame) with the sink of the process."""
+    if _sink is None:
+        configure()
+    _sink.show(frame)
@@ -0,0 +1,163 @@
+"""Command-Line Game Server
+
+This script hosts games of TicTacToe and Hangman for remote players over TCP.
+
+Players connect with any line-based client, such as telnet or netcat. Every
+session runs in a single asyncio event loop, so one process can serve
+thousands of players at once. All sessions share one TicTacToe game tree and
+one Hangman word index. The games run as gameio dialogs, so waiting for a
+player costs no thread, and the CPU agents do their work in an executor so
+that they never block the event loop. Each of their moves is chosen within
+MOVE_BUDGET seconds, so a busy server still replies to every player quickly.
+
+The games of every session are kept in a sessions.SessionStore, so however many
+players are connected, only a bounded number of sessions are held in memory,
+and the games of the players that have been idle the longest wait on disk. The
+store reads and writes their files in the same executor as the agents.
+
+This file contains the following classes:
+    * GameServer - a class that hosts game sessions for remote players
+
+This file contains the following functions:
+    * serve - start a GameServer and run it until it is interrupted
+"""
+
+import asyncio
+import concurrent.futures
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.realpath(__file__)))
+import gameloader
+import gameio
+import sessions
+
+tictactoe = gameloader.load_game("tictactoe")
+hangman = gameloader.load_game("hangman")
+wordindex = gameloader.load_game("hangman", "wordindex")
+
+HOST = "127.0.0.1" # the default address that the server listens on
+PORT = 4023 # the default port that the server listens on
+NEWLINE = "\r\n" # the line ending sent to clients
+MOVE_BUDGET = 0.5 # the number of seconds that a CPU player may think about each move, so no reply waits longer
+
+class GameServer:
+    """
+    A class used to host games of TicTacToe and Hangman for remote players.
+    ...
+
+    Attributes
+    ----------
+
+    sessions : int
+        the number of players that are currently connected
+
+    Methods
+    -------
+    start(host, port)
+        Start listening for players and return the asyncio server.
+    serve_forever(host, port)
+        Listen for players until the server is cancelled.
+    """
+
+    @property
+    def sessions(self):
+        """the number of players that are currently connected"""
+        return self._sessions
+
+    def __init__(self, tree=None, dictionary=None, executor=None, store=None):
+        """
+        Parameters
+        ----------
+        tree : TicTacToe
+            The game whose tree is shared by every TicTacToe session, built if not given
+        dictionary : WordIndex
+            The word index shared by every Hangman session, loaded if not given
+        executor : concurrent.futures.Executor
+            The executor that agents do their work in, created if not given
+        store : SessionStore
+            The store that idle sessions are moved to disk by, created with the executor if not given
+        """
+        if tree is None:
+            tree = tictactoe.TicTacToe()
+        if dictionary is None:
+            dictionary = wordindex.load(hangman.agents.var.DICTIONARY, hangman.agents.HangmanAgent())
+        if executor is None:
+            executor = concurrent.futures.ThreadPoolExecutor()
+        if store is None:
+            store = sessions.SessionStore(executor=executor)
+
+        self._tree = tree
+        self._dictionary = dictionary
+        self._executor = executor
+        self._store = store
+        self._sessions = 0
+
+    async def start(self, host=HOST, port=PORT):
+        """Start listening for players on (host) and (port) and return the asyncio server."""
+        return await asyncio.start_server(self._handle, host, port, backlog=1024)
+
+    async def serve_forever(self, host=HOST, port=PORT):
+        """Listen for players on (host) and (port) until the server is cancelled."""
+        server = await self.start(host, port)
+        async with server:
+            await server.serve_forever()
+
+    async def _handle(self, reader, writer):
+        """Run the game menu for a single connection until the player leaves."""
+        self._sessions += 1
+        session = self._store.open()
+        try:
+            io = gameio.StreamIO(reader, writer, self._executor, NEWLINE)
+            await gameio.arun(self._menu(), sessions.SessionIO(io, self._store, session))
+        except (EOFError, ConnectionError):
+            pass
+        finally:
+            self._sessions -= 1
+            self._store.discard(session)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    def _menu(self):
+        """The dialog of the game menu, which plays games until the player leaves."""
+        yield gameio.say("Welcome to the Command Line Game Collection!")
+        while True:
+            yield gameio.say("What would you like to play?")
+            yield gameio.say("(0) Tic Tac Toe")
+            yield gameio.say("(1) Hangman")
+            yield gameio.say("(x) Exit Command Line Game Collection")
+            user = yield gameio.ask("Enter your choice now: ")
+            if user == '0':
+                yield from tictactoe.play(self._new_tictactoe, levels=3, delay=0, budget=MOVE_BUDGET)
+                yield gameio.say("Welcome back!")
+            elif user == '1':
+                yield from hangman.play(self._dictionary, two_player=False)
+                yield gameio.say("Welcome back!")
+            elif user == 'x':
+                yield gameio.say("Goodbye!")
+                break
+
+    def _new_tictactoe(self):
+        """Return a new game of TicTacToe that shares the server's tree."""
+        return tictactoe.TicTacToe(self._tree.root)
+
+def serve(host=HOST, port=PORT):
+    """Start a GameServer on (host) and (port) and run it until it is interrupted."""
+    print("Loading Games...")
+    executor = concurrent.futures.ThreadPoolExecutor()
+    store = sessions.SessionStore(executor=executor)
+    server = GameServer(executor=executor, store=store)
+    print("Serving on "+host+":"+str(port))
+    try:
+        asyncio.run(server.serve_forever(host, port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        store.close()
+        executor.shutdown()
+
+if __name__ == "__main__":
+    serve()
@@ -0,0 +1,384 @@
+"""Command-Line Game Sessions
+
+This script keeps the memory of a long-running server bounded, however many
+players are connected, by moving the games of idle players to disk.
+
+A session is the set of games and agents that one player's dialog keeps with
+the gameio request keep(obj) (see gameio.py). Every kept object can be written
+out as compact bytes and read back in:
+
+    suspend()    : return the state of the object as bytes, and release the memory
+                   that can be rebuilt from them
+    resume(data) : rebuild the object from the bytes returned by suspend()
+
+A SessionStore holds at most a fixed number of sessions in memory. When a
+player is asked for input, their session becomes idle. If too many sessions
+are then in memory, the sessions that have been idle the longest are suspended
+and written to a file of their own in the store's folder. When the player's
+next line arrives, their session is read back and resumed before the dialog
+goes on, so the dialog never sees that it was moved. A session that is busy,
+such as one whose CPU player is thinking, is never moved. Given an executor,
+the store reads and writes the files there, so that an event loop never waits
+on the disk.
+
+The states are:
+
+    TicTacToe : the record of the game so far (see records.py), which is the
+                code of its first board and the cell of every move
+    CPU players : nothing, since they only hold what they have worked out
+                  before, which they forget until it is needed again
+    Hangman   : a header of the kind of the remaining words, the number of wrong
+                guesses left and the sizes of the next two parts, then the guesses
+                in order, the pattern and the remaining words
+
+The remaining words of a Hangman game are stored as a bitset of their ids
+among the words of their length in the word index, when the words were chosen
+from one (see hangman/wordindex.py), or else as their UTF-8 text, one per line.
+
+This file contains the following classes:
+    * SessionStore - a store that moves idle sessions to disk
+    * SessionIO - a gameio backend that keeps the session of one player in a SessionStore
+
+This file contains the following functions:
+    * encode_hangman - return the state of a game of Hangman
+    * decode_hangman - return the game of a Hangman state
+    * bitset - return the bitset of a list of ids
+    * members - return the ids of a bitset
+"""
+
+import asyncio
+import collections
+import concurrent.futures
+import inspect
+import shutil
+import struct
+import tempfile
+import weakref
+
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.realpath(__file__)))
+
+CAPACITY = 256 # the number of sessions that are kept in memory before idle ones are moved to disk
+HANGMAN = struct.Struct("<BBHH") # the kind of the words, the guesses left and the sizes of the guesses and the pattern
+BY_IDS = 0 # the remaining words of a Hangman state are stored as a bitset of ids
+BY_TEXT = 1 # the remaining words of a Hangman state are stored as text
+SIZE = struct.Struct("<I") # the size of the state of one kept object in a session file
+SUFFIX = ".session" # the end of the name of every session file
+
+def bitset(ids):
+    """Return the ids (ids) as a bitset, with the bit of every id set."""
+    ids = list(ids)
+    bits = bytearray(max(ids) // 8 + 1 if ids else 0)
+    for i in ids:
+        bits[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(bits, "little")
+
+def members(bits):
+    """Return the sorted ids whose bits are set in the bitset (bits)."""
+    return [i for i, bit in enumerate(reversed(bin(bits)[2:])) if bit == "1"]
+
+def encode_hangman(guesses_left, guesses, pattern, words):
+    """Return the state of a game of Hangman with (guesses_left) wrong guesses left, the guesses
+    (guesses) in order and the pattern (pattern), whose remaining words (words) are either a
+    bitset of their ids among the words of their length or a list of their text."""
+    guesses = "".join(guesses).encode("utf8")
+    pattern = pattern.encode("utf8")
+    if isinstance(words, int):
+        kind, words = BY_IDS, words.to_bytes((words.bit_length() + 7) // 8, "little")
+    else:
+        kind, words = BY_TEXT, "\n".join(words).encode("utf8")
+    return HANGMAN.pack(kind, guesses_left, len(guesses), len(pattern)) + guesses + pattern + words
+
+def decode_hangman(data):
+    """Return the number of wrong guesses left, the guesses in order, the pattern and the remaining
+    words of the Hangman state (data), as returned by encode_hangman()."""
+    kind, guesses_left, num_guesses, num_pattern = HANGMAN.unpack_from(data, 0)
+    pos = HANGMAN.size
+    guesses = list(str(data[pos:pos + num_guesses], "utf8"))
+    pos += num_guesses
+    pattern = str(data[pos:pos + num_pattern], "utf8")
+    pos += num_pattern
+    if kind == BY_IDS:
+        words = int.from_bytes(data[pos:], "little")
+    else:
+        text = str(data[pos:], "utf8")
+        words = text.split("\n") if text else []
+    return guesses_left, guesses, pattern, words
+
+def _write(path, data):
+    """Write (data) to the file (path)."""
+    with open(path, "wb") as f:
+        f.write(data)
+
+def _read(path, written):
+    """Return the data of the file (path) once the future (written) of its writing is done, and delete it."""
+    written.result()
+    with open(path, "rb") as f:
+        data = f.read()
+    os.remove(path)
+    return data
+
+def _remove(path, pending):
+    """Delete the file (path), if it is there, once the future (pending) of its reading or writing is done."""
+    concurrent.futures.wait([pending])
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+class SessionStore:
+    """
+    A class used to represent a store that moves idle sessions to disk.
+    ...
+
+    Sessions are numbered from 0. The objects of a session are only held weakly,
+    even while it is on disk, so a game that its dialog has finished with is never
+    kept alive by the store, and a suspended session costs the store no more than
+    the name of its file. The store is not thread-safe, so it should only be used
+    by one thread, such as the thread of an asyncio event loop, though its files
+    are read and written in its executor.
+
+    Attributes
+    ----------
+
+    folder : str
+        the folder that suspended sessions are written to
+    resident : int
+        the number of open sessions that are in memory
+    suspended : int
+        the number of open sessions that are on disk
+
+    Methods
+    -------
+    open()
+        Start a new session and return its number.
+    keep(session, obj)
+        Add the object (obj) to the session (session).
+    idle(session)
+        Mark the session (session) as waiting for its player, and move idle sessions to disk if there are too many.
+    fetch(session)
+        Start reading the file of the session (session) if it was moved, and return the future of its data.
+    restore(session)
+        Bring the session (session) back into memory if it was moved, and mark it as busy.
+    discard(session)
+        Forget the session (session) and delete its file.
+    close()
+        Forget every session, and delete the folder if the store created it.
+    """
+
+    @property
+    def folder(self):
+        """the folder that suspended sessions are written to"""
+        return self._folder
+
+    @property
+    def resident(self):
+        """the number of open sessions that are in memory"""
+        return len(self._resident)
+
+    @property
+    def suspended(self):
+        """the number of open sessions that are on disk"""
+        return len(self._suspended)
+
+    def __init__(self, folder=None, capacity=CAPACITY, executor=None):
+        """
+        Parameters
+        ----------
+        folder : str
+            The folder that suspended sessions are written to, a new temporary folder if not given,
+            which is deleted with the store
+        capacity : int
+            The number of sessions that are kept in memory before idle ones are moved to disk
+        executor : concurrent.futures.Executor
+            The executor that the files are read and written in, or None to do it at once
+        """
+        if folder is None:
+            folder = tempfile.mkdtemp(prefix="cmdgames-sessions-")
+            self._cleanup = weakref.finalize(self, shutil.rmtree, folder, True)
+        else:
+            os.makedirs(folder, exist_ok=True)
+            self._cleanup = None
+        self._folder = folder
+        self._capacity = capacity
+        self._executor = executor
+        self._next = 0
+        self._kept = {}
+        self._resident = collections.OrderedDict() # every session in memory, least recently idle first
+        self._suspended = {} # every session on disk, as the future of writing or reading its file and whether it is read
+        self._removals = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _path(self, session):
+        """Return the path of the file of the session (session)."""
+        return os.path.join(self._folder, str(session) + SUFFIX)
+
+    def _submit(self, fn, *args):
+        """Call (fn) with (args) in the store's executor, or at once if it has none, and return the future."""
+        if self._executor is not None:
+            return self._executor.submit(fn, *args)
+        future = concurrent.futures.Future()
+        try:
+            future.set_result(fn(*args))
+        except Exception as error:
+            future.set_exception(error)
+        return future
+
+    def open(self):
+        """Start a new session, which is in memory and busy, and return its number."""
+        session = self._next
+        self._next += 1
+        self._kept[session] = []
+        self._resident[session] = False
+        return session
+
+    def keep(self, session, obj):
+        """Add the object (obj), which has the methods suspend() and resume(data), to the session (session)."""
+        kept = [ref for ref in self._kept[session] if ref() is not None]
+        kept.append(weakref.ref(obj))
+        self._kept[session] = kept
+
+    def idle(self, session):
+        """Mark the session (session) as waiting for its player, and move the sessions that have been
+        idle the longest to disk while there are more sessions in memory than the store's capacity."""
+        if session not in self._resident:
+            return
+        self._resident[session] = True
+        self._resident.move_to_end(session)
+        if len(self._resident) <= self._capacity:
+            return
+        for victim in [s for s, idle in self._resident.items() if idle]:
+            self._suspend(victim)
+            if len(self._resident) <= self._capacity:
+                break
+
+    def _suspend(self, session):
+        """Release the memory of every live object of the session (session) and start writing their states
+        to its file."""
+        refs = [ref for ref in self._kept[session] if ref() is not None]
+        data = bytearray()
+        for ref in refs:
+            state = ref().suspend()
+            data += SIZE.pack(len(state)) + state
+        del self._resident[session]
+        self._kept[session] = refs
+        self._suspended[session] = (self._submit(_write, self._path(session), bytes(data)), False)
+
+    def fetch(self, session):
+        """Start reading the file of the session (session) if it was moved to disk, and return the
+        concurrent.futures.Future of its data, or None if the session is in memory."""
+        if session not in self._suspended:
+            return None
+        future, read = self._suspended[session]
+        if not read:
+            future = self._submit(_read, self._path(session), future)
+            self._suspended[session] = (future, True)
+        return future
+
+    def restore(self, session):
+        """Bring the session (session) back into memory if it was moved to disk, and mark it as busy.
+        Waits for its file to be read, unless the future returned by fetch() is already done."""
+        if session not in self._kept:
+            return
+        if session in self._suspended:
+            data = self.fetch(session).result()
+            del self._suspended[session]
+            pos = 0
+            for ref in self._kept[session]:
+                size, = SIZE.unpack_from(data, pos)
+                pos += SIZE.size
+                obj = ref()
+                if obj is not None:
+                    obj.resume(data[pos:pos + size])
+                pos += size
+        self._resident[session] = False
+        self._resident.move_to_end(session)
+
+    def discard(self, session):
+        """Forget the session (session) and delete its file, if it has one."""
+        self._kept.pop(session, None)
+        self._resident.pop(session, None)
+        pending = self._suspended.pop(session, None)
+        if pending is not None:
+            self._removals = [f for f in self._removals if not f.done()]
+            self._removals.append(self._submit(_remove, self._path(session), pending[0]))
+
+    def close(self):
+        """Forget every session and delete their files, and the folder if the store created it."""
+        for session in list(self._kept):
+            self.discard(session)
+        concurrent.futures.wait(self._removals)
+        self._removals = []
+        if self._cleanup is not None:
+            self._cleanup()
+
+class SessionIO:
+    """
+    A class used to represent a gameio backend that keeps the session of one player in a SessionStore.
+    ...
+
+    Every request is passed on to another backend. The session is idle while the
+    backend waits for the player's input, and it is restored as soon as the input
+    arrives. If the input must be awaited, the session's file is read without
+    blocking the event loop. Objects that the dialog keeps are added to the session.
+
+    Methods
+    -------
+    ask(prompt)
+        Ask the other backend with (prompt), with the session idle until the reply arrives.
+    keep(obj)
+        Add the object (obj) to the session.
+    """
+
+    def __init__(self, io, store, session):
+        """
+        Parameters
+        ----------
+        io : object
+            The backend that the requests are passed on to
+        store : SessionStore
+            The store of the session
+        session : int
+            The number of the session in the store
+        """
+        self._io = io
+        self._store = store
+        self._session = session
+
+    def __getattr__(self, name):
+        return getattr(self._io, name)
+
+    def _idle(self, reply):
+        """Return (reply), the reply of a request for input, restoring the session once it has arrived."""
+        if not inspect.isawaitable(reply):
+            self._store.restore(self._session)
+            return reply
+
+        async def restored():
+            try:
+                return await reply
+            finally:
+                fetched = self._store.fetch(self._session)
+                if fetched is not None:
+                    await asyncio.wrap_future(fetched)
+                self._store.restore(self._session)
+        return restored()
+
+    def ask(self, prompt):
+        """Ask the other backend with (prompt), with the session idle until the reply arrives."""
+        self._store.idle(self._session)
+        return self._idle(self._io.ask(prompt))
+
+    def ask_secret(self, prompt):
+        self._store.idle(self._session)
+        return self._idle(self._io.ask_secret(prompt))
+
+    def keep(self, obj):
+        """Add the object (obj) to the session."""
+        self._store.keep(self._session, obj)
@@ -0,0 +1,182 @@
+"""Command-Line Game Shared Data
+
+This script publishes the read-only data of the games once, so that worker
+processes can attach to it instead of each building their own copy.
+
+The data is written to a single file that every worker maps read-only. Where
+/dev/shm exists the file lives in shared memory. The operating system keeps one
+copy of the mapped pages however many workers attach, and attaching only maps
+the file, so a worker is ready in milliseconds.
+
+The file starts with the magic bytes b"CMDGDATA" and the number of sections,
+followed by a (name, offset, length) entry for every section. The sections
+themselves follow, each aligned to 8 bytes. The games publish three sections:
+
+    tictactoe      : the bytes of a TicTacToe SolvedTable
+    tictactoe_tree : the buffer of the TicTacToe FlatTree from the empty board
+    hangman        : the buffer of a Hangman WordIndex
+
+This file contains the following classes:
+    * SharedData - a read-only view of a published file
+
+This file contains the following functions:
+    * publish - write sections to a new file and return its path
+    * attach - map a published file
+    * unpublish - delete a published file
+    * publish_games - publish the data of every game
+    * attach_games - map the data of every game
+    * init_worker - attach a worker process to the data of every game
+    * main - the main function of the script, which publishes the data of every game
+"""
+
+import mmap
+import os
+import struct
+import tempfile
+
+import sys
+sys.path.append(os.path.dirname(os.path.realpath(__file__)))
+import gameloader
+
+MAGIC = b"CMDGDATA" # the first bytes of every published file
+HEADER = struct.Struct("=8sI") # the magic bytes and the number of sections
+ENTRY = struct.Struct("=16sQQ") # the name, offset and length of a section
+ALIGNMENT = 8 # the alignment of every section, in bytes
+
+TICTACTOE = "tictactoe" # the name of the section that holds the TicTacToe solved table
+TICTACTOE_TREE = "tictactoe_tree" # the name of the section that holds the TicTacToe flat tree
+HANGMAN = "hangman" # the name of the section that holds the Hangman word index
+
+table = None # the SolvedTable of a worker that was attached by init_worker()
+tree = None # the FlatTree of a worker that was attached by init_worker()
+words = None # the WordIndex of a worker that was attached by init_worker()
+_data = None
+
+class SharedData:
+    """
+    A class used to represent a read-only view of a published file.
+    ...
+
+    Attributes
+    ----------
+
+    names : list
+        the names of the sections in the file
+
+    Methods
+    -------
+    section(name)
+        Return a read-only memoryview of the section called (name).
+    close()
+        Unmap the file.
+    """
+
+    @property
+    def names(self):
+        """the names of the sections in the file"""
+        return list(self._sections)
+
+    def __init__(self, path):
+        """
+        Parameters
+        ----------
+        path : str
+            The path of a file written by publish()
+        """
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+
+        magic, count = HEADER.unpack_from(self._view, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(path+" was not published by shareddata")
+
+        self._sections = {}
+        for i in range(count):
+            name, offset, length = ENTRY.unpack_from(self._view, HEADER.size + i * ENTRY.size)
+            self._sections[name.rstrip(b"\0").decode("ascii")] = self._view[offset:offset + length]
+
+    def section(self, name):
+        """Return a read-only memoryview of the section called (name)."""
+        return self._sections[name]
+
+    def close(self):
+        """Unmap the file. Every object that still uses one of its sections must be released first."""
+        for view in self._sections.values():
+            view.release()
+        self._sections = {}
+        self._view.release()
+        self._map.close()
+
+def _default_path():
+    """Return a new path for a published file, in shared memory where it is available."""
+    directory = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(directory, "cmdgames-"+str(os.getpid())+".dat")
+
+def publish(sections, path=None):
+    """Write (sections), a dictionary from names to bytes-like objects, to a new file and return its path.
+
+    The file is written under a temporary name and then renamed, so a worker never sees it half-written.
+    """
+    path = _default_path() if path is None else path
+    offset = HEADER.size + ENTRY.size * len(sections)
+    header = bytearray(HEADER.pack(MAGIC, len(sections)))
+    layout = []
+    for name, data in sections.items():
+        offset += -offset % ALIGNMENT
+        header += ENTRY.pack(name.encode("ascii"), offset, len(data))
+        layout.append((offset, data))
+        offset += len(data)
+
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(header)
+        for offset, data in layout:
+            f.write(b"\0" * (offset - f.tell()))
+            f.write(data)
+    os.replace(tmp, path)
+    return path
+
+def attach(path):
+    """Map the file at (path), which was written by publish(), and return its SharedData."""
+    return SharedData(path)
+
+def unpublish(path):
+    """Delete the file at (path). Workers that are already attached keep their mapping."""
+    os.remove(path)
+
+def publish_games(path=None):
+    """Solve TicTacToe, flatten its tree, index the Hangman dictionary, publish them and return the path of the file."""
+    solved = gameloader.load_game("tictactoe", "solved")
+    flattree = gameloader.load_game("tictactoe", "flattree")
+    wordindex = gameloader.load_game("hangman", "wordindex")
+    hangman_agents = gameloader.load_game("hangman").agents
+    index = wordindex.load(hangman_agents.var.DICTIONARY, hangman_agents.HangmanAgent())
+    return publish({TICTACTOE: solved.solve(), TICTACTOE_TREE: flattree.build().buffer, HANGMAN: index.buffer}, path)
+
+def attach_games(path):
+    """Map the file at (path), which was written by publish_games(), and return its SharedData,
+    SolvedTable, FlatTree and WordIndex."""
+    solved = gameloader.load_game("tictactoe", "solved")
+    flattree = gameloader.load_game("tictactoe", "flattree")
+    wordindex = gameloader.load_game("hangman", "wordindex")
+    data = attach(path)
+    return (data, solved.SolvedTable(data.section(TICTACTOE)), flattree.FlatTree(data.section(TICTACTOE_TREE)),
+            wordindex.WordIndex(data.section(HANGMAN)))
+
+def init_worker(path):
+    """Attach the current process to the file at (path), which was written by publish_games().
+
+    Meant to be used as the initializer of a multiprocessing pool. The data is then available
+    as shareddata.table, shareddata.tree and shareddata.words.
+    """
+    global _data, table, tree, words
+    _data, table, tree, words = attach_games(path)
+
+def main():
+    path = publish_games(sys.argv[1] if len(sys.argv) > 1 else None)
+    print(path)
+
+if __name__ == "__main__":
+    main()
@@ -2,16 +2,30 @@
 
 This file includes the agents which manage each game of TicTacToe.
 
-There are four agents which can be imported to other files: 
+There are five agents which can be imported to other files: 
     -UnbeatableAgent, which plays optimally for all states;
     -FlawedAgent, which plays sub-optimally and may occassionally play randomly;
     -RandomAgent, which plays randomly for all states;
+    -MCTSAgent, which plays the moves that win the most random games;
     -PlayerAgent, which is controlled by a user.
 """
 
 from abc import ABC, abstractmethod
+import concurrent.futures
 import random
+import time
 from variables import EMPTY_SPACE
+import book
+import retrograde
+import mcts
+import parallel
+import anytime
+
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/..")
+import gameio
+import gameloader
 
 class Agent(ABC):
     """
@@ -28,12 +42,24 @@ class Agent(ABC):
     player : str
         the symbol that represents this agent on the board
 
+    last_search : dict or None
+        the depth reached and the number of positions searched by the last move, if it was searched
+
 
     Methods
     -------
 
-    select_move(board)
-        Takes in a game state (board) and returns the child state that the game should progress to.
+    select_move(board, deadline=None)
+        Takes in a game state (board) and returns the child state that the game should progress to,
+        choosing it before the time.monotonic() (deadline) if one is given.
+    move_dialog(board, deadline=None)
+        The dialog of select_move(), for any gameio backend.
+    close()
+        Release any resources held by the agent.
+    suspend()
+        Forget what the agent has worked out, while its game is idle (see sessions.py).
+    resume(data)
+        Take back the state returned by suspend().
 
     """
         
@@ -47,6 +73,11 @@ class Agent(ABC):
         """the symbol that represents this agent on the board"""
         return self._player
 
+    @property
+    def last_search(self):
+        """the depth reached and the number of positions searched by the last move, if it was searched"""
+        return self._last_search
+
     @abstractmethod
     def __init__(self, name, player):
         """
@@ -59,97 +90,219 @@ class Agent(ABC):
         """
         self._name = name
         self._player = player
+        self._solutions = {}
+        self._last_search = None
     
-    def _choose_successor(self, game_state, win=0, lose=0, draw=0):
+    def _choose_successor(self, game_state, win=0, lose=0, draw=0, quick=False):
         """
         Take in a game state (game_state) and the most optimal child. 
         
         Take a win value, lose value, and draw value, and return a child state that
         is optimal according to these values. Makes the assumption that both agents
-        use the same values.
+        use the same values. If (quick) is True, prefer the children that reach the
+        best score in the fewest moves, or the worst score in the most moves.
         """
         if win == lose and lose == draw:
             return random.choice(game_state.children)
         
         assert win is not None and lose is not None and draw is not None
-        return self._run_min_max(game_state, win, lose, draw)[0]
-        
-    def _run_min_max(self, game_state, win, lose, draw):
+        if win >= draw and draw >= lose:
+            ret = self._choose_from_book(game_state, win, lose, draw, quick)
+            if ret is not None:
+                return ret
+        return self._choose_from_solution(game_state, win, lose, draw, quick)
+
+    def _choose_from_book(self, game_state, win, lose, draw, quick=False):
         """
-        Run the min-max algorithm.
-         
-        Takes in a game state (game_state) and returns an optimal child
-        according to the values of (win), (lose), and (draw).
+        Take in a game state (game_state) and return an optimal child from the opening book
+        or the endgame table, or None if neither covers the state.
+
+        Takes a win value, lose value, and draw value, which must be ordered like the outcomes
+        they stand for. Only used for states that have a child for every empty space, since the
+        book describes the full game rather than a hand-built tree. The book does not know how
+        long a game lasts, so if (quick) is True it is only used when the best outcome is a draw.
         """
-        is_terminal = game_state.is_terminal
-        winner = game_state.winner
+        board = game_state.board
+        empty = [(r, c) for r in range(len(board)) for c in range(len(board[r])) if board[r][c] == EMPTY_SPACE]
         children = game_state.children
-        if is_terminal or len(children) == 0:
-            if winner == None:
-                return game_state, draw
-            elif winner == self.player:
-                return game_state, win
-            else:
-                return game_state, lose
-            
-        else:
-            best = lose if self.player == game_state.player else win
-            ret = None
-
-            max_score = max(win, max(lose, draw))
-            min_score = min(win, min(lose, draw))
-
-            for child in children:
-                _, score = self._run_min_max(child, win, lose, draw)
-                if self.player != child.player:
-                    # MAX
-                    if score == max_score:
-                        return child, max_score
-                    
-                    if score >= best:
-                        best = score
-                        ret = child
-                
-                else:
-                    # MIN
-                    if score == min_score:
-                        return child, min_score
-                    
-                    if score <= best:
-                        best = score
-                        ret = child
-
-            assert ret is not None
-            return ret, best
+        if game_state.is_terminal or game_state.player != self.player or len(children) != len(empty):
+            return None
+
+        outcomes = book.lookup(board, game_state.player)
+        if outcomes is None:
+            return None
+
+        scores = {book.WIN: win, book.DRAW: draw, book.LOSE: lose}
+        best = max(scores[outcomes[r * len(board[r]) + c]] for r, c in empty)
+        if quick and any(outcomes[r * len(board[r]) + c] != book.DRAW
+                         for r, c in empty if scores[outcomes[r * len(board[r]) + c]] == best):
+            return None
+        for child in children:
+            child_board = child.board
+            for r, c in empty:
+                if child_board[r][c] != EMPTY_SPACE and scores[outcomes[r * len(board[r]) + c]] == best:
+                    return child
+        return None
+
+    def _choose_from_solution(self, game_state, win, lose, draw, quick=False):
+        """
+        Take in a game state (game_state) and return an optimal child according to the values
+        of (win), (lose), and (draw), using the retrograde solution of the tree.
+
+        The tree below a state is solved the first time the state is seen, and the solution is
+        kept, so every later move only compares the scores of the children.
+        """
+        labels = self._solutions.setdefault((win, lose, draw), {})
+        if retrograde.key(game_state) not in labels:
+            labels.update(retrograde.solve(game_state, self.player, win, lose, draw))
+
+        children = game_state.children
+        scores = [labels[retrograde.key(child)] for child in children]
+        maximize = game_state.player == self.player
+        best = max(s for s, _ in scores) if maximize else min(s for s, _ in scores)
+        if not quick:
+            return next(child for child, (s, _) in zip(children, scores) if s == best)
+
+        distances = [d for s, d in scores if s == best]
+        hurry = best == (max(win, lose, draw) if maximize else min(win, lose, draw))
+        distance = min(distances) if hurry else max(distances)
+        return next(child for child, (s, d) in zip(children, scores) if s == best and d == distance)
+
+    def _moves_of(self, game_state):
+        """Take in a game state (game_state) and return a dictionary from the cell of every move,
+        numbered in reading order, to the child state it leads to."""
+        board = game_state.board
+        ret = {}
+        for child in game_state.children:
+            child_board = child.board
+            for r in range(len(board)):
+                for c in range(len(board[r])):
+                    if board[r][c] != child_board[r][c]:
+                        ret[r * len(board[r]) + c] = child
+        return ret
+
+    def _child_for_move(self, game_state, row, col):
+        """Take in a game state (game_state) and return the child state in which the player to move
+        has taken the space at (row) and (col), or None if there is no such child."""
+        board = game_state.board
+        if board[row][col] != EMPTY_SPACE:
+            return None
+        board[row][col] = game_state.player
+        for child in game_state.children:
+            if board == child.board:
+                return child
+        return None
+
+    def _search(self, game_state, deadline):
+        """
+        Take in a game state (game_state) and return the child states of its best moves found with an
+        anytime search before the time.monotonic() (deadline), or None if the state is not a normal
+        position with a child for every empty space. The depth and size of the search are kept.
+        """
+        children = self._moves_of(game_state)
+        cells = [anytime.rules.DIGITS[symbol] for row in game_state.board for symbol in row]
+        if not children or len(children) != cells.count(0):
+            return None
+        score, moves, depth, nodes, _ = anytime.search(cells, anytime.rules.DIGITS[game_state.player], deadline)
+        self._last_search = {"depth": depth, "nodes": nodes}
+        return score, [children[move] for move in moves]
 
     @abstractmethod
-    def select_move(self, board):
-        """Takes in a game state (board) and returns the child state that the game should progress to."""
+    def select_move(self, board, deadline=None):
+        """Takes in a game state (board) and returns the child state that the game should progress to.
+
+        Agents that search return the best choice they have found by the time.monotonic() (deadline),
+        if one is given.
+        """
+        pass
+
+    def move_dialog(self, game_state, deadline=None):
+        """Choose the child state that the game should progress to from (game_state) by the time.monotonic()
+        (deadline) through the backend, so that a slow choice does not block it, and return it."""
+        return (yield gameio.call(self.select_move, game_state, deadline))
+
+    def close(self):
+        """Release any resources held by the agent."""
+        pass
+
+    def suspend(self):
+        """Forget the solutions that the agent has worked out, which it works out again when it needs
+        them, and return its state, which is empty."""
+        self._solutions = {}
+        return b""
+
+    def resume(self, data):
+        """Take back the state (data) returned by suspend()."""
         pass
 
 class UnbeatableAgent(Agent):
-    def __init__(self, name, player):
+    def __init__(self, name, player, processes=1):
+        """
+        Parameters
+        ----------
+        name : str
+            The string associated with this agent's ID
+        player : str
+            The symbol that represents this agent on the board
+        processes : int
+            The number of processes that search each move at once, or 1 to use the solution of the tree
+        """
         super().__init__(name, player)
+        self._parallel = parallel.ParallelSearch(processes) if processes > 1 else None
 
-    def select_move(self, game_state):
+    def select_move(self, game_state, deadline=None):
         """Takes in a game state (board) and returns the child state that the game should progress to.
         
-        Plays optimally.
+        Plays optimally, winning as quickly as it can and losing as slowly as it can. Given a
+        time.monotonic() (deadline), positions outside the opening book are searched one ply
+        deeper at a time instead of being solved, and the best move found by the deadline is played.
         """
-        return super()._choose_successor(game_state, 1, -1, 0)
+        self._last_search = None
+        if deadline is not None and game_state.player == self.player:
+            ret = self._choose_from_book(game_state, 1, -1, 0, quick=True)
+            if ret is not None:
+                return ret
+            found = self._search(game_state, deadline)
+            if found is not None:
+                return random.choice(found[1])
+
+        if self._parallel is not None and game_state.player == self.player:
+            ret = self._choose_from_book(game_state, 1, -1, 0, quick=True)
+            if ret is not None:
+                return ret
+
+            children = self._moves_of(game_state)
+            cells = [parallel.rules.DIGITS[symbol] for row in game_state.board for symbol in row]
+            if children and len(children) == cells.count(0):
+                _, moves, nodes = self._parallel.best_moves(cells, parallel.rules.DIGITS[self.player])
+                self._last_search = {"depth": cells.count(0), "nodes": nodes}
+                return children[random.choice(moves)]
+        return super()._choose_successor(game_state, 1, -1, 0, quick=True)
+
+    def close(self):
+        """Shut down the processes of the agent, if it started any."""
+        if self._parallel is not None:
+            self._parallel.close()
+            self._parallel = None
     
 class FlawedAgent(Agent):
     def __init__(self, name, player):
         super().__init__(name, player)
 
-    def select_move(self, game_state):
+    def select_move(self, game_state, deadline=None):
         """Takes in a game state (board) and returns the child state that the game should progress to.
 
         Plays sub-optimally 80% of the time (sub-optimal is defined as being unable to distinguish between
-        a loss and a tie), and randomly 20% of the time.
+        a loss and a tie), and randomly 20% of the time. Given a time.monotonic() (deadline), the wins
+        are found by a search that stops at the deadline instead of by solving the position.
         """
+        self._last_search = None
         if random.randint(1, 10) <= 8:
-            return super()._choose_successor(game_state, 1, 0, 0)
+            found = None if deadline is None else self._search(game_state, deadline)
+            if found is None:
+                return super()._choose_successor(game_state, 1, 0, 0)
+            score, best = found
+            return random.choice(best) if score > 0 else random.choice(game_state.children)
         else:
             return super()._choose_successor(game_state)
 
@@ -157,57 +310,137 @@ class RandomAgent(Agent):
     def __init__(self, name, player):
         super().__init__(name, player)
     
-    def select_move(self, game_state):
+    def select_move(self, game_state, deadline=None):
         """Takes in a game state (board) and returns the child state that the game should progress to.
 
         Plays randomly.
         """
         return super()._choose_successor(game_state)
 
+class MCTSAgent(Agent):
+    def __init__(self, name, player, iterations=None, time_limit=None, processes=1, seed=None):
+        """
+        Parameters
+        ----------
+        name : str
+            The string associated with this agent's ID
+        player : str
+            The symbol that represents this agent on the board
+        iterations : int
+            The number of iterations of every search, which defaults to mcts.ITERATIONS without a time limit
+        time_limit : float
+            The number of seconds that every search may take, if it is limited
+        processes : int
+            The number of processes that search at once, or 1 if no start method can run the workers
+            (see gameloader.pool_context())
+        seed : int
+            The seed of the agent's random choices, if they should be repeatable
+        """
+        super().__init__(name, player)
+        self._iterations = iterations
+        self._time_limit = time_limit
+        self._context = gameloader.pool_context(mcts.rollouts)
+        self._processes = processes if self._context is not None else 1
+        self._rng = random.Random(seed)
+        self._root = None
+        self._pool = None
+
+    def _find_root(self, cells, player, moves):
+        """Return the node of the board (cells) from the last search if it is there, else a new node."""
+        if self._root is not None and moves is None:
+            for node in [self._root] + list(self._root.children.values()):
+                if node.cells == cells and node.player == player:
+                    node.parent = None
+                    return node
+        return mcts.Node(cells, player, moves=moves, rng=self._rng)
+
+    def select_move(self, game_state, deadline=None):
+        """Takes in a game state (board) and returns the child state that the game should progress to.
+
+        Plays the move that won the most random games in a Monte Carlo tree search. The search of the
+        previous move is reused, and it is split between several processes if there are more than one.
+        The search stops at the time.monotonic() (deadline), if it comes before the agent's time limit,
+        but only once every move has been tried, so a deadline that has passed still gives a move.
+        """
+        children = self._moves_of(game_state)
+        cells = [mcts.rules.DIGITS[symbol] for row in game_state.board for symbol in row]
+        player = mcts.rules.DIGITS[game_state.player]
+        moves = None if len(children) == cells.count(0) else sorted(children)
+        root = self._find_root(cells, player, moves)
+
+        share = None if self._iterations is None else max(1, self._iterations // self._processes)
+        if share is None and self._time_limit is None:
+            share = max(1, mcts.ITERATIONS // self._processes)
+        if self._time_limit is not None:
+            deadline = time.monotonic() + self._time_limit if deadline is None else \
+                       min(deadline, time.monotonic() + self._time_limit)
+        time_limit = None if deadline is None else max(0.0, deadline - time.monotonic())
+
+        futures = []
+        if self._processes > 1:
+            if self._pool is None:
+                self._pool = concurrent.futures.ProcessPoolExecutor(self._processes - 1, self._context)
+            futures = [self._pool.submit(mcts.rollouts, cells, player, moves, share, time_limit,
+                                         self._rng.getrandbits(32)) for _ in range(self._processes - 1)]
+
+        mcts.search(root, share, deadline, self._rng)
+        stats = mcts.merge([mcts.statistics(root)] + [f.result() for f in futures])
+        move = mcts.best_move(stats)
+        if move is None:
+            move = self._rng.choice(sorted(children))
+
+        depth = 0
+        node = root
+        while node.children:
+            node = max(node.children.values(), key=lambda child: child.visits)
+            depth += 1
+        self._last_search = {"depth": depth, "nodes": sum(visits for visits, _ in stats.values())}
+
+        self._root = root.children.get(move)
+        return children[move]
+
+    def suspend(self):
+        """Forget the search of the last move as well as the solutions, and return the empty state."""
+        self._root = None
+        return super().suspend()
+
+    def close(self):
+        """Shut down the processes of the agent, if it started any."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
 class PlayerAgent(Agent):
     def __init__(self, name, player):
         super().__init__(name, player)
 
-    def select_move(self, game_state):
+    def select_move(self, game_state, deadline=None):
         """Takes in a game state (board) and returns the child state that the game should progress to.
 
         Choices are dictated by user input.
         """
+        return gameio.run(self.move_dialog(game_state))
+
+    def move_dialog(self, game_state, deadline=None):
+        """Ask the user for their move from the game state (game_state) and return the child state it leads to.
+
+        The user is never hurried, so (deadline) is ignored.
+        """
         tmp = game_state.board
 
         while True:
-            col = 0
-            while True:
-                try:
-                    col = int(input("Select a column: "))
-                    if col <= 0 or col > len(tmp[0]):
-                        raise ValueError
-                    break
-                except ValueError:
-                    print("Sorry, "+str(col)+" is not a valid column")
-                    print()
-
-            row = 0
-            while True:
-                try:
-                    row = int(input("Select a row: "))
-                    if row <= 0 or row > len(tmp):
-                        raise ValueError
-                    break
-                except ValueError:
-                    print("Sorry, "+str(row)+" is not a valid row")
-                    print()
+            col = yield from gameio.ask_number("Select a column: ", 1, len(tmp[0]), "Sorry, that is not a valid column")
+            row = yield from gameio.ask_number("Select a row: ", 1, len(tmp), "Sorry, that is not a valid row")
             
             if tmp[row-1][col-1] != EMPTY_SPACE:
-                print("Sorry, that space has already been taken!")
-                print()
+                yield gameio.say("Sorry, that space has already been taken!")
+                yield gameio.say()
             else:
-                tmp[row-1][col-1] = self.player
                 break
 
-        for child in game_state.children:
-            if tmp == child.board:
-                return child
+        child = self._child_for_move(game_state, row-1, col-1)
+        if child is not None:
+            return child
         
-        print("Sorry, there was a problem")
-        return None
\ No newline at end of file
+        yield gameio.say("Sorry, there was a problem")
+        return None
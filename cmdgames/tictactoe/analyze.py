@@ -0,0 +1,238 @@
+"""Command-Line TicTacToe Position Analysis
+
+This script analyzes TicTacToe positions in bulk.
+
+Positions are read as JSON Lines, one object per line, such as
+
+    {"board": "XO_/_X_/__O", "player": "X"}
+
+The board is a string of the nine cells in reading order, where X and O are
+the players and any of " ._-" is an empty space. Slashes between the rows are
+ignored. The player to move is optional, and defaults to the player whose turn
+it is in a normal game. A board may also be given as a 2D-list of symbols.
+
+Every object is written back with these fields added:
+
+    value       : 1, 0 or -1 if the player to move wins, draws or loses with perfect play
+    best_moves  : the cells, in reading order, of every move that keeps that value
+    forced_draw : whether every game through the position is a tie
+    terminal    : whether the position is the end of a game
+    winner      : the symbol of the player that won, or null
+    reachable   : whether the position can be reached from the empty board in a normal game
+
+Lines that cannot be read are written back as {"line": n, "error": "..."}.
+
+Every position that can be reached from the empty board is answered from a
+FlatTree, which every worker process attaches to instead of building its own
+(see shareddata.py). Any other position is solved with negamax
+the first time it is seen. The input is read and written in batches, so memory stays bounded
+however long the stream is, and batches can be spread over several processes.
+
+This file contains the following classes:
+    * Analyzer - a class that answers positions
+
+This file contains the following functions:
+    * parse_board - return the digits of a board given as a string or a 2D-list
+    * analyze_batch - analyze a batch of JSON lines and return the output
+    * add_arguments - add the arguments of the analysis to an argument parser
+    * run - analyze positions with parsed arguments
+    * main - the main function of the script, which analyzes positions from the command line
+"""
+
+import argparse
+import functools
+import itertools
+import json
+
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/../tictactoe")
+import variables as var
+import rules
+import flattree
+import parallel
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/..")
+import gameloader
+import shareddata
+
+EMPTY_CHARACTERS = " ._-" # the characters that stand for an empty space in a board string
+BATCH = 4096 # the default number of lines analyzed at a time
+
+class Analyzer:
+    """
+    A class used to answer TicTacToe positions.
+    ...
+
+    Methods
+    -------
+    analyze(cells, player)
+        Return the analysis of a board as a dictionary.
+    """
+
+    def __init__(self, tree=None):
+        """
+        Parameters
+        ----------
+        tree : FlatTree
+            The tree of every position reachable from the empty board, built if not given
+        """
+        self._tree = flattree.build() if tree is None else tree
+        self._numbers = {code: i for i, code in enumerate(self._tree._codes)}
+
+    def analyze(self, cells, player):
+        """Return the analysis of the board (cells), as digits, with the digit (player) to move."""
+        code = sum(d * p for d, p in zip(cells, rules.POWERS))
+        i = self._numbers.get(code)
+        tree = self._tree
+        if i is None or tree.mover(i) != player:
+            return dict(_search(code, player))
+
+        value = tree.value(i)
+        best = []
+        for c in tree._children[tree._offsets[i]:tree._offsets[i+1]]:
+            if tree.value(c) == -value:
+                best.append(rules.POWERS.index((tree._codes[c] - code) // player))
+        winner = tree._winners[i]
+        return {"value": value, "best_moves": sorted(best), "forced_draw": tree.will_tie(i),
+                "terminal": bool(tree._terminals[i]), "winner": rules.SYMBOLS[winner] if winner else None,
+                "reachable": True}
+
+@functools.lru_cache(maxsize=2 * rules.NUM_CODES)
+def _search(code, player):
+    """Return the analysis of the board (code) that cannot be reached in a normal game, remembering it."""
+    return _solve(rules.digits(code), player)
+
+def _solve(cells, player):
+    """Return the analysis of a board that cannot be reached in a normal game, by searching it."""
+    winner = rules.winner_of(cells)
+    terminal = winner != 0 or 0 not in cells
+    ret = {"value": 0, "best_moves": [], "forced_draw": _will_tie(tuple(cells), player), "terminal": terminal,
+           "winner": rules.SYMBOLS[winner] if winner else None, "reachable": False}
+    if terminal:
+        ret["value"] = 0 if winner == 0 else (1 if winner == player else -1)
+        return ret
+
+    scores = {}
+    empty = cells.count(0)
+    cells = list(cells)
+    for i in range(rules.CELLS):
+        if cells[i] == 0:
+            cells[i] = player
+            score = empty if rules.wins_at(cells, i) else -parallel.negamax(cells, 3 - player, empty - 1)
+            cells[i] = 0
+            scores[i] = (score > 0) - (score < 0)
+
+    ret["value"] = max(scores.values())
+    ret["best_moves"] = [i for i in sorted(scores) if scores[i] == ret["value"]]
+    return ret
+
+@functools.lru_cache(maxsize=65536)
+def _will_tie(cells, player):
+    """Return whether every game through the board (cells), with (player) to move, is a tie."""
+    if rules.winner_of(cells):
+        return False
+    ret = True
+    for i in range(rules.CELLS):
+        if cells[i] == 0:
+            ret = _will_tie(cells[:i] + (player,) + cells[i+1:], 3 - player)
+            if not ret:
+                break
+    return ret
+
+def parse_board(board):
+    """Return the digits of (board), given as a string of cells or a 2D-list of symbols, in reading order."""
+    if isinstance(board, list):
+        board = "".join("".join(row) for row in board)
+    board = board.replace("/", "")
+    if len(board) != rules.CELLS:
+        raise ValueError("a board must have "+str(rules.CELLS)+" cells")
+
+    ret = []
+    for c in board:
+        if c in EMPTY_CHARACTERS:
+            ret.append(0)
+        elif c.upper() in (var.PLAYER_ONE, var.PLAYER_TWO):
+            ret.append(rules.DIGITS[c.upper()])
+        else:
+            raise ValueError("a board cannot contain "+repr(c))
+    return ret
+
+_analyzer = None
+
+def _init_worker(path):
+    """Attach a worker process to the game tree published at (path) by shareddata.publish_games(),
+    and build its Analyzer on it."""
+    global _analyzer
+    shareddata.init_worker(path)
+    _analyzer = Analyzer(shareddata.tree)
+
+def analyze_batch(batch, analyzer=None):
+    """Analyze (batch), a list of (line number, line) pairs of JSON Lines, and return the output as a string."""
+    analyzer = _analyzer if analyzer is None else analyzer
+    out = []
+    for number, line in batch:
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            cells = parse_board(record["board"])
+            player = record.get("player")
+            player = rules.to_move(cells) if player is None else rules.DIGITS[player.upper()]
+            if player == 0:
+                raise KeyError(record["player"])
+            record["player"] = rules.SYMBOLS[player]
+            record.update(analyzer.analyze(cells, player))
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            record = {"line": number, "error": type(e).__name__+": "+str(e)}
+        out.append(json.dumps(record))
+    return "".join(line + "\n" for line in out)
+
+def _batches(lines, size):
+    """Split (lines) into lists of (line number, line) pairs of at most (size) lines."""
+    numbered = enumerate(lines, 1)
+    while True:
+        batch = list(itertools.islice(numbered, size))
+        if not batch:
+            return
+        yield batch
+
+def add_arguments(parser):
+    """Add the arguments of the analysis to the argparse parser (parser)."""
+    parser.add_argument("input", nargs="?", default="-", help="a JSON Lines file of positions, or - for stdin")
+    parser.add_argument("-o", "--output", default="-", help="the file to write the analysis to, or - for stdout")
+    parser.add_argument("--batch", type=int, default=BATCH, help="the number of lines analyzed at a time")
+    parser.add_argument("--processes", type=int, default=1, help="the number of processes that analyze batches")
+
+def run(args):
+    """Analyze the positions named by (args), parsed by a parser from add_arguments()."""
+    source = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf8")
+    sink = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf8")
+    try:
+        batches = _batches(source, args.batch)
+        context = gameloader.pool_context(_init_worker, analyze_batch)
+        if args.processes > 1 and context is not None:
+            path = shareddata.publish_games()
+            try:
+                with context.Pool(args.processes, initializer=_init_worker, initargs=(path,)) as pool:
+                    for text in pool.imap(analyze_batch, batches):
+                        sink.write(text)
+            finally:
+                shareddata.unpublish(path)
+        else:
+            analyzer = Analyzer()
+            for batch in batches:
+                sink.write(analyze_batch(batch, analyzer))
+        sink.flush()
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyze TicTacToe positions given as JSON Lines.")
+    add_arguments(parser)
+    run(parser.parse_args())
+
+if __name__ == "__main__":
+    main()
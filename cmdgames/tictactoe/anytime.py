@@ -0,0 +1,119 @@
+"""Command-Line TicTacToe Anytime Search
+
+This script searches TicTacToe positions with a negamax that is deepened one
+ply at a time until the position is solved or a deadline passes.
+
+The scores are the same as those of parallel.py: a win scores one more than the
+number of empty spaces left when it happens, a loss scores the same amount below
+zero, and a draw scores zero. A position at the end of a depth-limited search
+whose game is not over also scores zero, so the scores of a search that did not
+reach the end of the game only count the wins and losses it could see.
+
+Every ply is searched in full before the next one is started, so when the
+deadline passes, the moves of the deepest finished ply are returned. The first
+ply is always finished, so a search can run over a deadline that has already
+passed, by at most the time it takes to try every move once.
+
+This file contains the following functions:
+    * search - return the best moves of a position found before a deadline
+"""
+
+import time
+
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/../tictactoe")
+import rules
+
+ORDER = (4, 0, 2, 6, 8, 1, 3, 5, 7) # the cells in the order that they are searched: center, corners, edges
+INFINITY = rules.CELLS + 2 # a score larger than any real score
+CHECK_EVERY = 255 # the deadline is checked once every CHECK_EVERY + 1 positions
+
+class _Timeout(Exception):
+    """A private exception raised when a search passes its deadline."""
+    pass
+
+class _Search:
+    """A private class used to represent the state of one search: its deadline and the positions it has searched."""
+
+    def __init__(self, deadline):
+        self.deadline = deadline
+        self.nodes = 0
+
+    def negamax(self, cells, player, empty, depth, alpha, beta):
+        """Return the score of the board (cells) for (player), who moves next, with (empty) empty spaces,
+        searched (depth) plies ahead. Scores outside of (alpha, beta) are only bounds."""
+        self.nodes += 1
+        if self.deadline is not None and not self.nodes & CHECK_EVERY and time.monotonic() > self.deadline:
+            raise _Timeout
+        if empty == 0 or depth == 0:
+            return 0
+
+        best = -INFINITY
+        for move in ORDER:
+            if cells[move] != 0:
+                continue
+            cells[move] = player
+            if rules.wins_at(cells, move):
+                score = empty
+            else:
+                score = -self.negamax(cells, 3 - player, empty - 1, depth - 1, -beta, -max(alpha, best))
+            cells[move] = 0
+
+            if score > best:
+                best = score
+                if best >= beta:
+                    break
+        return best
+
+    def root(self, cells, player, depth):
+        """Return the best score of the board (cells) for (player) searched (depth) plies ahead, and the
+        sorted cells of every move that reaches it. Only moves that are strictly worse are cut off."""
+        self.nodes += 1
+        empty = cells.count(0)
+        best = -INFINITY
+        moves = []
+        for move in ORDER:
+            if cells[move] != 0:
+                continue
+            cells[move] = player
+            try:
+                if rules.wins_at(cells, move):
+                    score = empty
+                else:
+                    score = -self.negamax(cells, 3 - player, empty - 1, depth - 1, -INFINITY, -(best - 1))
+            finally:
+                cells[move] = 0
+
+            if score > best:
+                best = score
+                moves = [move]
+            elif score == best:
+                moves.append(move)
+        return best, sorted(moves)
+
+def search(cells, player, deadline=None):
+    """Search the board (cells) for (player), who moves next, one ply deeper at a time until it is solved
+    or the time.monotonic() (deadline) passes.
+
+    Return the best score and the sorted cells of the best moves of the deepest ply that was searched
+    in full, that depth, the number of positions searched, and whether the position was solved.
+    A board whose game is over has no moves and scores zero.
+    """
+    cells = list(cells)
+    empty = cells.count(0)
+    if empty == 0 or rules.winner_of(cells):
+        return 0, [], 0, 0, True
+
+    state = _Search(None)
+    score, moves = state.root(cells, player, 1)
+    depth = 1
+    state.deadline = deadline
+    try:
+        # A win that is found is the quickest, since a quicker one would have been found a ply sooner.
+        while depth < empty and score <= 0:
+            score, moves = state.root(cells, player, depth + 1)
+            depth += 1
+    except _Timeout:
+        pass
+    return score, moves, depth, state.nodes, depth == empty or score > 0
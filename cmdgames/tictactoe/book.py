@@ -0,0 +1,126 @@
+"""Command-Line TicTacToe Opening Book
+
+This script manages the opening book and the endgame table of the TicTacToe agents.
+
+Both tell an agent the outcome of every move from a position, so that it can
+choose its best moves without searching. The opening book covers the first
+OPENING_PLIES plies of a normal game and is read from book.txt, which this
+script generates. The endgame table covers positions with at most ENDGAME_EMPTY
+empty spaces and is filled in as positions are looked up.
+
+Each line of book.txt holds the code of a position (see rules.py), the digit
+of the player to move, and one letter per cell in reading order: W, D or L if
+moving there wins, draws or loses for that player with perfect play, or - if
+the cell is taken.
+
+This file contains the following functions:
+    * opening - return the outcome of every move from a position in the opening book
+    * endgame - return the outcome of every move from a position near the end of a game
+    * lookup - return the outcome of every move from a position in the book or the table
+    * generate - write the opening book to a file
+    * main - the main function of the script, which regenerates book.txt
+"""
+
+import functools
+
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/../tictactoe")
+import rules
+
+BOOK = os.path.join(os.path.dirname(os.path.realpath(__file__)), "book.txt") # the default opening book
+OPENING_PLIES = 2 # the number of plies from the empty board that the opening book covers
+ENDGAME_EMPTY = 4 # the largest number of empty spaces that the endgame table covers
+
+WIN = 'W' # the outcome of a move that wins with perfect play
+DRAW = 'D' # the outcome of a move that draws with perfect play
+LOSE = 'L' # the outcome of a move that loses with perfect play
+TAKEN = '-' # the outcome of a cell that is already taken
+
+_OUTCOMES = {1: LOSE, 0: DRAW, -1: WIN} # the outcome of a move for each value of the position it leads to
+_book = None
+
+def _read_book(path=BOOK):
+    """Read the opening book at (path) and return it as a dictionary from (code, player) to outcomes."""
+    ret = {}
+    with open(path, "r", encoding="utf8") as f:
+        for line in f:
+            if line.startswith("#") or not line.strip():
+                continue
+            code, player, outcomes = line.split()
+            ret[(int(code), int(player))] = outcomes
+    return ret
+
+def opening(cells, player):
+    """Take the digits of a board and the digit of the player to move, and return their outcomes.
+
+    Returns None if the position is not in the opening book.
+    """
+    global _book
+    if _book is None:
+        _book = _read_book()
+    return _book.get((sum(d * p for d, p in zip(cells, rules.POWERS)), player))
+
+@functools.lru_cache(maxsize=None)
+def _value(code, player):
+    """Return 1, 0 or -1 if (player) wins, draws or loses the position (code) when they move next."""
+    cells = rules.digits(code)
+    winner = rules.winner_of(cells)
+    if winner:
+        return 1 if winner == player else -1
+    if 0 not in cells:
+        return 0
+
+    ret = -1
+    for i in range(rules.CELLS):
+        if cells[i] == 0:
+            ret = max(ret, -_value(code + player * rules.POWERS[i], 3 - player))
+            if ret == 1:
+                break
+    return ret
+
+def _outcomes(code, player):
+    """Return the outcome of every move of (player) from the position (code), one letter per cell."""
+    cells = rules.digits(code)
+    return "".join(TAKEN if cells[i] else _OUTCOMES[_value(code + player * rules.POWERS[i], 3 - player)]
+                   for i in range(rules.CELLS))
+
+def endgame(cells, player):
+    """Take the digits of a board and the digit of the player to move, and return their outcomes.
+
+    Returns None if the position has more than ENDGAME_EMPTY empty spaces or is already over.
+    """
+    if cells.count(0) > ENDGAME_EMPTY or cells.count(0) == 0 or rules.winner_of(cells):
+        return None
+    return _outcomes(sum(d * p for d, p in zip(cells, rules.POWERS)), player)
+
+def lookup(board, player):
+    """Take a board as a 2D-list of symbols and the symbol of the player to move, and return
+    the outcome of every move from the opening book or the endgame table, or None if neither has it."""
+    cells = [rules.DIGITS[symbol] for row in board for symbol in row]
+    digit = rules.DIGITS[player]
+    ret = opening(cells, digit)
+    return ret if ret is not None else endgame(cells, digit)
+
+def generate(path=BOOK):
+    """Write the outcomes of every position in the first OPENING_PLIES plies of a normal game to (path)."""
+    positions = {0}
+    lines = ["# code player outcomes, generated by book.py"]
+    for ply in range(OPENING_PLIES):
+        player = 1 if ply % 2 == 0 else 2
+        following = set()
+        for code in sorted(positions):
+            outcomes = _outcomes(code, player)
+            lines.append(str(code)+" "+str(player)+" "+outcomes)
+            cells = rules.digits(code)
+            following.update(code + player * rules.POWERS[i] for i in range(rules.CELLS) if cells[i] == 0)
+        positions = following
+
+    with open(path, "w", encoding="utf8") as f:
+        f.write("\n".join(lines) + "\n")
+
+def main():
+    generate(sys.argv[1] if len(sys.argv) > 1 else BOOK)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+"""Command-Line TicTacToe Flat Tree
+
+This file includes a compact store of a TicTacToe game tree.
+
+Instead of one TicTacToe._State object per node, every position that can be
+reached from the root is stored once, in flat arrays indexed by node number.
+The edges are kept in compressed sparse row (CSR) form: the children of node n
+are children[offsets[n]:offsets[n+1]]. Nodes are numbered in breadth-first
+order, so every child comes after its parent and the nodes are sorted by ply.
+
+The whole store is a single buffer, so it can be written to a file or shared
+between processes as it is. The buffer holds a header followed by the arrays:
+
+    header    : the magic bytes b"TTTF", the number of nodes, the number of edges and the root player
+    codes     : the code of every node (see rules.py)
+    offsets   : the start of the children of every node, plus the number of edges
+    children  : the node number of every child
+    plies     : the number of moves from the root to every node
+    winners   : the digit of the winner of every node, or 0 if there is none
+    terminals : 1 if the node is the end of a game, else 0
+    ties      : 1 if every game through the node is a tie, else 0
+    values    : 1, 0 or -1 if the player to move wins, draws or loses the node with perfect play
+
+The codes, offsets and children are 32-bit unsigned integers in the native byte
+order, and the other arrays have one byte per node.
+
+This file contains the following classes:
+    * FlatTree - a read-only view of a flat game tree
+
+This file contains the following functions:
+    * build - build the FlatTree of every position that can be reached from a board
+"""
+
+import array
+import random
+import struct
+
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/../tictactoe")
+import variables as var
+import rules
+
+MAGIC = b"TTTF" # the first bytes of every flat tree
+HEADER = struct.Struct("=4sIII") # the magic bytes, the number of nodes, the number of edges and the root player
+
+class _Node:
+    """
+    A private class used to represent a single state of a FlatTree.
+
+    It has the same interface as TicTacToe._State, so it can be used anywhere a
+    state can, but it only holds the tree and a node number.
+    """
+    __slots__ = ("_tree", "_index")
+
+    @property
+    def board(self):
+        """a representation of the game board as a 2D-list of symbols"""
+        return rules.decode(self._tree._codes[self._index])
+
+    @property
+    def children(self):
+        """the list of states that the current state can progress to"""
+        ret = self._children
+        random.shuffle(ret)
+        return ret
+
+    @property
+    def _children(self):
+        """the list of states that the current state can progress to, in the order of their moves"""
+        tree = self._tree
+        return [_Node(tree, c) for c in tree._children[tree._offsets[self._index]:tree._offsets[self._index+1]]]
+
+    @property
+    def is_terminal(self):
+        """whether the current state is a terminal state"""
+        return bool(self._tree._terminals[self._index])
+
+    @property
+    def player(self):
+        """the symbol that represents the player that should take the next turn"""
+        return rules.SYMBOLS[self._tree.mover(self._index)]
+
+    @property
+    def winner(self):
+        """the symbol that represents the player that won, if one exists"""
+        winner = self._tree._winners[self._index]
+        return rules.SYMBOLS[winner] if winner else None
+
+    @property
+    def index(self):
+        """the node number of the current state in its tree"""
+        return self._index
+
+    def __init__(self, tree, index):
+        self._tree = tree
+        self._index = index
+
+    def __eq__(self, other):
+        if isinstance(other, _Node):
+            return self._tree._codes[self._index] == other._tree._codes[other._index]
+        try:
+            return self.board == other.board
+        except AttributeError:
+            return False
+
+    def __hash__(self):
+        return self._tree._codes[self._index]
+
+    def __str__(self):
+        return rules.format_board(self.board)
+
+    def print_board(self):
+        """Print an ASCII portrayal of the TicTacToe State."""
+        print(self)
+
+class FlatTree:
+    """
+    A class used to represent a read-only view of a flat game tree.
+    ...
+
+    Attributes
+    ----------
+
+    buffer : bytes-like
+        the flat buffer that holds the whole tree
+    root : _Node
+        the state at the root of the tree
+
+    Methods
+    -------
+    node(index)
+        Return the state of the node number (index).
+    find(board)
+        Return the state with the board (board), or None if it is not in the tree.
+    mover(index)
+        Return the digit of the player that moves next in the node number (index).
+    value(index)
+        Return 1, 0 or -1 if the player to move wins, draws or loses the node number (index).
+    will_tie(index)
+        Return whether every game through the node number (index) is a tie.
+    """
+
+    @property
+    def buffer(self):
+        """the flat buffer that holds the whole tree"""
+        return self._buffer
+
+    @property
+    def root(self):
+        """the state at the root of the tree"""
+        return _Node(self, 0)
+
+    def __init__(self, buffer):
+        """
+        Parameters
+        ----------
+        buffer : bytes-like
+            The flat buffer of a tree returned by build(), such as a view of shared memory
+        """
+        view = memoryview(buffer)
+        magic, n, m, root_player = HEADER.unpack_from(view, 0)
+        if magic != MAGIC:
+            raise ValueError("the buffer does not hold a flat tree")
+
+        self._buffer = buffer
+        self._root_player = root_player
+        pos = HEADER.size
+        sizes = (("_codes", "I", 4 * n), ("_offsets", "I", 4 * (n + 1)), ("_children", "I", 4 * m),
+                 ("_plies", "B", n), ("_winners", "B", n), ("_terminals", "B", n), ("_ties", "B", n),
+                 ("_values", "b", n))
+        for name, kind, size in sizes:
+            setattr(self, name, view[pos:pos + size].cast(kind))
+            pos += size
+
+        self._index = None
+
+    def __len__(self):
+        return len(self._codes)
+
+    def node(self, index):
+        """Return the state of the node number (index)."""
+        return _Node(self, index)
+
+    def find(self, board):
+        """Return the state with the board (board), or None if it is not in the tree."""
+        if self._index is None:
+            self._index = {code: i for i, code in enumerate(self._codes)}
+        i = self._index.get(rules.encode(board))
+        return None if i is None else _Node(self, i)
+
+    def mover(self, index):
+        """Return the digit of the player that moves next in the node number (index)."""
+        return self._root_player if self._plies[index] % 2 == 0 else 3 - self._root_player
+
+    def value(self, index):
+        """Return 1, 0 or -1 if the player to move wins, draws or loses the node number (index) with perfect play."""
+        return self._values[index]
+
+    def will_tie(self, index):
+        """Return whether every game through the node number (index) is a tie."""
+        return bool(self._ties[index])
+
+def build(board=None, player=var.PLAYER_ONE):
+    """Build the FlatTree of every position that can be reached from (board) with (player) to move.
+
+    The board defaults to an empty board. Positions are visited in breadth-first order,
+    and positions reached by different orders of moves are stored only once.
+    """
+    root_code = 0 if board is None else rules.encode(board)
+    root_player = rules.DIGITS[player]
+
+    codes = array.array("I", [root_code])
+    plies = bytearray([0])
+    moves = bytearray([rules.CELLS]) # the cell of the move that first reached every node, or CELLS for the root
+    offsets = array.array("I")
+    children = array.array("I")
+    winners = bytearray()
+    terminals = bytearray()
+    numbers = {root_code: 0}
+    root_empty = rules.digits(root_code).count(0)
+
+    # Only the lines through the last move can be new, so only those are tested below the root.
+    for n, code in enumerate(codes):
+        cells = rules.digits(code)
+        winner = rules.winner_of(cells) if n == 0 else rules.wins_at(cells, moves[n])
+        winners.append(winner)
+        terminals.append(winner != 0 or plies[n] == root_empty)
+        offsets.append(len(children))
+        if terminals[n]:
+            continue
+
+        mover = root_player if plies[n] % 2 == 0 else 3 - root_player
+        for i in range(rules.CELLS):
+            if cells[i] == 0:
+                child = code + mover * rules.POWERS[i]
+                if child not in numbers:
+                    numbers[child] = len(codes)
+                    codes.append(child)
+                    plies.append(plies[n] + 1)
+                    moves.append(i)
+                children.append(numbers[child])
+    offsets.append(len(children))
+
+    # Solve the tree from the last ply back to the root.
+    size = len(codes)
+    values = array.array("b", bytes(size))
+    ties = bytearray(size)
+    for n in range(size - 1, -1, -1):
+        mover = root_player if plies[n] % 2 == 0 else 3 - root_player
+        kids = children[offsets[n]:offsets[n+1]]
+        if terminals[n]:
+            values[n] = 0 if winners[n] == 0 else (1 if winners[n] == mover else -1)
+        else:
+            values[n] = max(-values[c] for c in kids)
+        ties[n] = winners[n] == 0 and all(ties[c] for c in kids)
+
+    header = HEADER.pack(MAGIC, size, len(children), root_player)
+    return FlatTree(header + codes.tobytes() + offsets.tobytes() + children.tobytes()
+                    + bytes(plies) + bytes(winners) + bytes(terminals) + bytes(ties) + values.tobytes())
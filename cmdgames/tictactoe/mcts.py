@@ -0,0 +1,192 @@
+"""Command-Line TicTacToe Monte Carlo Tree Search
+
+This file includes the Monte Carlo tree search (UCT) used by the MCTSAgent.
+
+The search works on boards alone, as lists of digits (see rules.py), so it does
+not need the TicTacToe game tree. Every iteration walks down the search tree
+choosing the child with the best upper confidence bound, adds one new child,
+plays the rest of the game at random, and records the result on the way back
+up. The move that was tried the most is the best move.
+
+Searches can run in several processes at once: every process searches the same
+position on its own, and their counts are added together (root parallelism).
+
+This file contains the following classes:
+    * Node - a position in a search tree
+
+This file contains the following functions:
+    * search - run iterations of the search from a node
+    * statistics - return the visits and wins of every move from a node
+    * merge - add together the statistics of several searches
+    * best_move - return the move that was tried the most
+    * rollouts - search a board from scratch and return its statistics
+"""
+
+import math
+import random
+import time
+
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/../tictactoe")
+import rules
+
+ITERATIONS = 5000 # the default number of iterations of a search
+EXPLORATION = math.sqrt(2) # the exploration constant of the upper confidence bound
+
+class Node:
+    """
+    A class used to represent a position in a search tree.
+    ...
+
+    Attributes
+    ----------
+
+    cells : list
+        the digits of the board in reading order
+    player : int
+        the digit of the player that moves next
+    move : int or None
+        the cell of the move that led to this position, if it is known
+    parent : Node or None
+        the position before the move, if it is in the tree
+    children : dict
+        the positions that have been searched, by the cell of their move
+    untried : list
+        the cells of the moves that have not been searched yet
+    visits : int
+        the number of iterations that went through this position
+    wins : float
+        the number of those iterations won by the player that made the move, counting draws as half
+    winner : int
+        the digit of the winner of the position, or 0 if there is none
+    """
+    __slots__ = ("cells", "player", "move", "parent", "children", "untried", "visits", "wins", "winner")
+
+    def __init__(self, cells, player, move=None, parent=None, moves=None, rng=random):
+        """
+        Parameters
+        ----------
+        cells : list
+            The digits of the board in reading order
+        player : int
+            The digit of the player that moves next
+        move : int
+            The cell of the move that led to this position, if it is known
+        parent : Node
+            The position before the move, if it is in the tree
+        moves : list
+            The cells that may be played from this position, if not every empty cell
+        rng : random.Random
+            The source of randomness that orders the untried moves
+        """
+        self.cells = cells
+        self.player = player
+        self.move = move
+        self.parent = parent
+        self.children = {}
+        self.visits = 0
+        self.wins = 0.0
+        self.winner = rules.winner_of(cells) if move is None else rules.wins_at(cells, move)
+        if self.winner:
+            self.untried = []
+        else:
+            self.untried = [i for i in range(len(cells)) if cells[i] == 0] if moves is None else list(moves)
+            rng.shuffle(self.untried)
+
+    @property
+    def is_terminal(self):
+        """whether the position is the end of a game"""
+        return not self.untried and not self.children
+
+    def _select(self, exploration):
+        """Return the child with the best upper confidence bound."""
+        log_visits = math.log(self.visits)
+        return max(self.children.values(),
+                   key=lambda c: c.wins / c.visits + exploration * math.sqrt(log_visits / c.visits))
+
+    def _expand(self, rng):
+        """Add the child of an untried move to the tree and return it."""
+        move = self.untried.pop()
+        cells = self.cells[:]
+        cells[move] = self.player
+        child = Node(cells, 3 - self.player, move, self, rng=rng)
+        self.children[move] = child
+        return child
+
+def _rollout(node, rng):
+    """Play the game on from (node) with random moves and return the digit of the winner, or 0 for a tie."""
+    if node.winner or not node.untried:
+        return node.winner
+
+    cells = node.cells[:]
+    player = node.player
+    empty = [i for i in range(len(cells)) if cells[i] == 0]
+    rng.shuffle(empty)
+    for move in empty:
+        cells[move] = player
+        if rules.wins_at(cells, move):
+            return player
+        player = 3 - player
+    return 0
+
+def search(root, iterations=None, deadline=None, rng=random, exploration=EXPLORATION):
+    """Run iterations of the search from the node (root) and return how many were run.
+
+    Stops after (iterations) iterations or at the time.monotonic() (deadline), whichever
+    comes first. If neither is given, runs ITERATIONS iterations. Every move from (root)
+    is always tried at least once, even if the deadline has already passed.
+    """
+    if iterations is None and deadline is None:
+        iterations = ITERATIONS
+
+    count = 0
+    while root.untried or ((iterations is None or count < iterations)
+                           and (deadline is None or time.monotonic() < deadline)):
+        node = root
+        while not node.untried and node.children:
+            node = node._select(exploration)
+        if node.untried:
+            node = node._expand(rng)
+
+        winner = _rollout(node, rng)
+        while node is not None:
+            node.visits += 1
+            if winner == 0:
+                node.wins += 0.5
+            elif winner != node.player:
+                node.wins += 1
+            node = node.parent
+        count += 1
+    return count
+
+def statistics(node):
+    """Return a dictionary from the cell of every searched move from (node) to its (visits, wins)."""
+    return {move: (child.visits, child.wins) for move, child in node.children.items()}
+
+def merge(results):
+    """Add together the statistics of several searches of the same position and return them."""
+    ret = {}
+    for result in results:
+        for move, (visits, wins) in result.items():
+            total = ret.get(move, (0, 0.0))
+            ret[move] = (total[0] + visits, total[1] + wins)
+    return ret
+
+def best_move(stats):
+    """Return the cell of the move that was tried the most, preferring the lowest cell on a tie,
+    or None if no move was tried."""
+    if not stats:
+        return None
+    return max(sorted(stats), key=lambda move: stats[move][0])
+
+def rollouts(cells, player, moves=None, iterations=None, time_limit=None, seed=None):
+    """Search the board (cells) with (player) to move from scratch and return its statistics.
+
+    Meant to be run in a worker process, so it only takes and returns plain data.
+    """
+    rng = random.Random(seed)
+    deadline = None if time_limit is None else time.monotonic() + time_limit
+    root = Node(cells, player, moves=moves, rng=rng)
+    search(root, iterations, deadline, rng)
+    return statistics(root)
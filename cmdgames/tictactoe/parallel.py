@@ -0,0 +1,175 @@
+"""Command-Line TicTacToe Parallel Search
+
+This script searches TicTacToe positions with negamax and alpha-beta pruning,
+splitting the moves of the root between several processes.
+
+The search works on boards alone, as lists of digits (see rules.py). Scores
+count how soon the game ends: a win scores one more than the number of empty
+spaces left when it happens, a loss scores the same amount below zero, and a
+draw scores zero. The best score is therefore the quickest win or the slowest
+loss, the same play as the UnbeatableAgent.
+
+Every move of the root is searched as its own task. The best score found so far
+is kept in a multiprocessing.Value that every worker reads when it starts a
+task, so a move that cannot match it is cut off early. Only moves that are
+strictly worse than the best score are cut off, so the best moves and their
+scores are the same however the tasks are scheduled.
+
+This file contains the following classes:
+    * ParallelSearch - a pool of processes that search positions together
+
+This file contains the following functions:
+    * negamax - return the score of a position for the player to move
+    * main - the main function of the script, which times a search of the empty board
+"""
+
+import multiprocessing
+import time
+
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/../tictactoe")
+import rules
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/..")
+import gameloader
+
+ORDER = (4, 0, 2, 6, 8, 1, 3, 5, 7) # the cells in the order that they are searched: center, corners, edges
+INFINITY = rules.CELLS + 2 # a score larger than any real score
+
+_bound = None # the best score found so far at the root, in a worker process
+_nodes = 0 # the number of positions searched by the current task
+
+def negamax(cells, player, empty, alpha=-INFINITY, beta=INFINITY):
+    """Return the score of the board (cells) for (player), who moves next, with (empty) empty spaces.
+
+    Scores outside of (alpha, beta) are only bounds: a score of at most (alpha) or at least (beta).
+    """
+    global _nodes
+    _nodes += 1
+    if empty == 0:
+        return 0
+
+    best = -INFINITY
+    for move in ORDER:
+        if cells[move] != 0:
+            continue
+        cells[move] = player
+        if rules.wins_at(cells, move):
+            score = empty
+        else:
+            score = -negamax(cells, 3 - player, empty - 1, -beta, -max(alpha, best))
+        cells[move] = 0
+
+        if score > best:
+            best = score
+            if best >= beta:
+                break
+    return best
+
+def _init_worker(bound):
+    """Keep the shared bound of the root in a worker process."""
+    global _bound
+    _bound = bound
+
+def _score_move(task):
+    """Return the move of (task), its score, and the number of positions searched for it.
+
+    Moves that cannot reach the best score found so far return a bound below it.
+    """
+    global _nodes
+    cells, player, move = task
+    _nodes = 0
+    cells = list(cells)
+    empty = cells.count(0) - 1
+    cells[move] = player
+    if rules.wins_at(cells, move):
+        score = empty + 1
+        _nodes += 1
+    else:
+        alpha = _bound.value - 1
+        score = -negamax(cells, 3 - player, empty, -INFINITY, -alpha)
+
+    with _bound.get_lock():
+        if score > _bound.value:
+            _bound.value = score
+    return move, score, _nodes
+
+class ParallelSearch:
+    """
+    A class used to represent a pool of processes that search positions together.
+    ...
+
+    Attributes
+    ----------
+
+    processes : int
+        the number of processes that search at once
+
+    Methods
+    -------
+    best_moves(cells, player)
+        Return the best score of a position, the cells of its best moves, and the number of positions searched.
+    close()
+        Shut down the processes.
+    """
+
+    @property
+    def processes(self):
+        """the number of processes that search at once"""
+        return self._processes
+
+    def __init__(self, processes=None):
+        """
+        Parameters
+        ----------
+        processes : int
+            The number of processes that search at once, which defaults to the number of cores, or
+            1 if no start method can run the workers (see gameloader.pool_context())
+        """
+        context = gameloader.pool_context(_init_worker, _score_move)
+        self._processes = (processes or os.cpu_count() or 1) if context is not None else 1
+        self._bound = (context or multiprocessing).Value("i", -INFINITY)
+        self._pool = None
+        if self._processes > 1:
+            self._pool = context.Pool(self._processes, initializer=_init_worker, initargs=(self._bound,))
+
+    def best_moves(self, cells, player):
+        """Return the best score of the board (cells) for (player), who moves next, the sorted
+        cells of every move that reaches it, and the number of positions searched.
+
+        A board whose game is over has no moves and scores zero.
+        """
+        if 0 not in cells or rules.winner_of(cells):
+            return 0, [], 0
+
+        self._bound.value = -INFINITY
+        tasks = [(tuple(cells), player, move) for move in ORDER if cells[move] == 0]
+        if self._pool is None:
+            _init_worker(self._bound)
+            results = [_score_move(task) for task in tasks]
+        else:
+            results = list(self._pool.imap_unordered(_score_move, tasks, chunksize=1))
+
+        best = max(score for _, score, _ in results)
+        return best, sorted(move for move, score, _ in results if score == best), sum(n for _, _, n in results)
+
+    def close(self):
+        """Shut down the processes."""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+def main():
+    processes = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    for count in sorted({1, processes or os.cpu_count() or 1}):
+        search = ParallelSearch(count)
+        start = time.perf_counter()
+        score, moves, nodes = search.best_moves([0] * rules.CELLS, 1)
+        elapsed = time.perf_counter() - start
+        search.close()
+        print(str(count)+" processes: score "+str(score)+", moves "+str(moves)+", "+str(nodes)+" positions in "
+              +"{:.3f}".format(elapsed)+" seconds")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Command-Line TicTacToe Retrograde Solver
+
+This file includes a bottom-up solver for TicTacToe game trees.
+
+Every position that can be reached from a state is labelled with its score for
+one player and its distance to the end of the game. The positions are first
+collected and grouped by ply, and then labelled in a single pass from the last
+ply back to the first, so every position is solved exactly once, after all of
+its children. A position reached by different orders of moves is only solved
+once.
+
+Scores follow the same rules as a min-max search in which both players use the
+same win, lose and draw values: the player maximizes their score and the
+opponent minimizes it. Distances prefer quick wins and slow losses: a side that
+reaches its best possible result takes the shortest way there, and any other
+side takes the longest.
+
+This file contains the following functions:
+    * key - return the key that a state is labelled under
+    * solve - label every position that can be reached from a state
+"""
+
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/../tictactoe")
+import variables as var
+import rules
+
+def key(state):
+    """Return the key that (state) is labelled under: the code of its board and the player to move."""
+    return rules.encode(state.board), state.player
+
+def solve(root, player, win=1, lose=-1, draw=0):
+    """Label every position that can be reached from the state (root) for (player).
+
+    Takes a win value, lose value, and draw value. Returns a dictionary from the key of
+    each position to its score for (player) with perfect play and its distance to the end.
+    States with no children are treated as the end of the game.
+    """
+    max_score = max(win, lose, draw)
+    min_score = min(win, lose, draw)
+
+    # Collect every position once, grouped by the number of taken spaces.
+    positions = {}
+    plies = {}
+    stack = [root]
+    while stack:
+        state = stack.pop()
+        k = key(state)
+        if k in positions:
+            continue
+
+        children = [] if state.is_terminal else state.children
+        positions[k] = (state, [key(child) for child in children])
+        ply = sum(symbol != var.EMPTY_SPACE for row in state.board for symbol in row)
+        plies.setdefault(ply, []).append(k)
+        stack.extend(children)
+
+    # Label the positions from the last ply back to the first.
+    labels = {}
+    for ply in sorted(plies, reverse=True):
+        for k in plies[ply]:
+            state, children = positions[k]
+            if not children:
+                winner = state.winner
+                score = draw if winner is None else (win if winner == player else lose)
+                labels[k] = (score, 0)
+                continue
+
+            maximize = state.player == player
+            scores = [labels[c] for c in children]
+            best = max(s for s, _ in scores) if maximize else min(s for s, _ in scores)
+            distances = [d for s, d in scores if s == best]
+            hurry = best == (max_score if maximize else min_score)
+            labels[k] = (best, 1 + (min(distances) if hurry else max(distances)))
+
+    return labels
@@ -0,0 +1,102 @@
+"""Command-Line TicTacToe Rules
+
+This file includes the rules shared by every representation of a TicTacToe board.
+
+Besides the 2D-list of symbols used by TicTacToe._State, a board can be written
+as a list of digits in reading order (0 for an empty space, 1 for player one and
+2 for player two), or as a code, the base-3 number with those digits.
+
+This file contains the following functions:
+    * encode - return the code of a board
+    * decode - return the board of a code
+    * digits - return the digits of a code
+    * to_move - return the player that moves next on a board in a normal game
+    * winner_of - return the winner of a board
+    * wins_at - return the winner of a board from the lines through its last move
+    * format_board - return an ASCII portrayal of a board
+"""
+
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/../tictactoe")
+import variables as var
+
+SIZE = 3 # the number of rows and columns on the board
+CELLS = SIZE * SIZE # the number of cells on the board
+NUM_CODES = 3 ** CELLS # the number of different codes
+
+SYMBOLS = (var.EMPTY_SPACE, var.PLAYER_ONE, var.PLAYER_TWO) # the symbol of each digit
+DIGITS = {symbol: digit for digit, symbol in enumerate(SYMBOLS)} # the digit of each symbol
+POWERS = tuple(3 ** i for i in range(CELLS)) # the place value of each cell in a code, in reading order
+
+# Every line of cells, in the order that TicTacToe._State tests them.
+LINES = tuple(line for i in range(SIZE) for line in (tuple(i * SIZE + j for j in range(SIZE)),
+                                                      tuple(j * SIZE + i for j in range(SIZE)))) \
+      + (tuple(i * SIZE + i for i in range(SIZE)), tuple(i * SIZE + SIZE - 1 - i for i in range(SIZE)))
+LINES_THROUGH = tuple(tuple(line for line in LINES if i in line) for i in range(CELLS)) # the lines through each cell
+
+def encode(board):
+    """Take a board as a 2D-list of symbols and return its code."""
+    code = 0
+    i = 0
+    for row in board:
+        for symbol in row:
+            code += DIGITS[symbol] * POWERS[i]
+            i += 1
+    return code
+
+def decode(code):
+    """Take a code and return its board as a 2D-list of symbols."""
+    cells = digits(code)
+    return [[SYMBOLS[cells[r * SIZE + c]] for c in range(SIZE)] for r in range(SIZE)]
+
+def digits(code):
+    """Take a code and return the list of its digits in reading order."""
+    ret = []
+    for _ in range(CELLS):
+        code, digit = divmod(code, 3)
+        ret.append(digit)
+    return ret
+
+def to_move(cells):
+    """Take the digits of a board and return the digit of the player that moves next in a normal game."""
+    return 1 if cells.count(1) == cells.count(2) else 2
+
+def winner_of(cells):
+    """Take the digits of a board and return the digit of the winner, or 0 if there is none."""
+    for line in LINES:
+        first = cells[line[0]]
+        if first != 0 and all(cells[i] == first for i in line):
+            return first
+    return 0
+
+def wins_at(cells, i):
+    """Take the digits of a board and the cell (i) of its last move, and return the digit of
+    the player on that cell if the move completed a line, else 0.
+
+    A move can only complete the lines through its own cell, so only those are tested.
+    """
+    player = cells[i]
+    if player != 0:
+        for line in LINES_THROUGH[i]:
+            if all(cells[j] == player for j in line):
+                return player
+    return 0
+
+def format_board(board):
+    """Take a board as a 2D-list of symbols and return an ASCII portrayal of it."""
+    ret = "  "
+    for c in range(len(board[0])):
+        ret += "  "+str(c+1)+" "
+    ret += "\n\n"
+
+    for r in range(len(board)):
+        ret += " "+str(r+1)+" "
+        for c in range(len(board[r])):
+            ret += " "+board[r][c]+" "
+            if (c < len(board[r]) - 1):
+                ret += "|"
+        ret += "\n"
+        if (r < len(board) - 1):
+            ret += "   " + "+".join(["---"] * len(board[r])) + "\n"
+    return ret[:-1]
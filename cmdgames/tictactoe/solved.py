@@ -0,0 +1,123 @@
+"""Command-Line TicTacToe Solved Table
+
+This file includes a flat table of every TicTacToe position and its solution.
+
+A position is stored at its code (see rules.py). Every position takes a single
+byte, so the whole table is one buffer of 3^9 bytes, which shareddata.py
+publishes once so that worker processes map it instead of copying it.
+
+This file contains the following classes:
+    * SolvedTable - a read-only view of a solved table
+
+This file contains the following functions:
+    * solve - build the solved table and return its bytes
+"""
+
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/../tictactoe")
+from rules import CELLS, NUM_CODES, POWERS, SYMBOLS, digits, to_move, winner_of
+
+# The bits of a table entry.
+REACHABLE = 0x01 # the position can be reached from the empty board
+TERMINAL = 0x02 # the position is the end of a game
+WINNER_SHIFT = 2 # the digit of the winner, or 0 if there is none, is stored in bits 2-3
+VALUE_SHIFT = 4 # the value for the player to move plus one is stored in bits 4-5
+
+def solve():
+    """Solve every position that can be reached from the empty board and return the table as bytes."""
+    table = bytearray(NUM_CODES)
+
+    def visit(code, cells):
+        """Fill in the entry of the position (code) and return its value for the player to move."""
+        if table[code]:
+            return (table[code] >> VALUE_SHIFT) - 1
+
+        winner = winner_of(cells)
+        player = to_move(cells)
+        if winner:
+            entry, value = REACHABLE | TERMINAL | (winner << WINNER_SHIFT), -1
+        elif 0 not in cells:
+            entry, value = REACHABLE | TERMINAL, 0
+        else:
+            value = -1
+            for i in range(CELLS):
+                if cells[i] == 0:
+                    cells[i] = player
+                    value = max(value, -visit(code + player * POWERS[i], cells))
+                    cells[i] = 0
+            entry = REACHABLE
+
+        table[code] = entry | ((value + 1) << VALUE_SHIFT)
+        return value
+
+    visit(0, [0] * CELLS)
+    return bytes(table)
+
+class SolvedTable:
+    """
+    A class used to represent a read-only view of a solved table.
+    ...
+
+    Methods
+    -------
+    is_reachable(code)
+        Return whether the position can be reached from the empty board.
+    is_terminal(code)
+        Return whether the position is the end of a game.
+    winner(code)
+        Return the symbol of the player that won the position, if one exists.
+    player(code)
+        Return the symbol of the player that moves next in the position.
+    value(code)
+        Return 1, 0 or -1 if the player to move wins, draws or loses with perfect play.
+    best_moves(code)
+        Return the cells, in reading order, of every move that keeps the best value.
+    """
+
+    def __init__(self, buffer=None):
+        """
+        Parameters
+        ----------
+        buffer : bytes-like
+            The bytes of a table returned by solve(), which is solved if not given
+        """
+        if buffer is None:
+            buffer = solve()
+        if len(buffer) != NUM_CODES:
+            raise ValueError("a solved table must have exactly "+str(NUM_CODES)+" bytes")
+        self._table = buffer
+
+    def is_reachable(self, code):
+        """Return whether the position (code) can be reached from the empty board."""
+        return bool(self._table[code] & REACHABLE)
+
+    def is_terminal(self, code):
+        """Return whether the position (code) is the end of a game."""
+        return bool(self._table[code] & TERMINAL)
+
+    def winner(self, code):
+        """Return the symbol of the player that won the position (code), if one exists."""
+        winner = (self._table[code] >> WINNER_SHIFT) & 0x03
+        return SYMBOLS[winner] if winner else None
+
+    def player(self, code):
+        """Return the symbol of the player that moves next in the position (code)."""
+        return SYMBOLS[to_move(digits(code))]
+
+    def value(self, code):
+        """Return 1, 0 or -1 if the player to move in the reachable position (code) wins, draws or loses."""
+        entry = self._table[code]
+        if not entry & REACHABLE:
+            raise KeyError(code)
+        return (entry >> VALUE_SHIFT) - 1
+
+    def best_moves(self, code):
+        """Return the cells, in reading order, of every move from the position (code) that keeps its value."""
+        if self.is_terminal(code):
+            return []
+
+        cells = digits(code)
+        player = to_move(cells)
+        target = -self.value(code)
+        return [i for i in range(CELLS) if cells[i] == 0 and self.value(code + player * POWERS[i]) == target]
@@ -2,7 +2,7 @@
 
 This script allows the user to play a game of TicTacToe.
 
-The user can play against three levels of rudimentary 
+The user can play against four levels of rudimentary 
 Artificial Intelligence or against a human player. 
 
 This file contains the following classes:
@@ -10,18 +10,31 @@ This file contains the following classes:
     and keeps track of the current game's state
 
 This file contains the following functions:
+    * play - the dialog of the game, for any gameio backend
     * main - the main function of the script, which activates the game
+
+Each screen of the game is drawn by render.py, as a single frame.
 """
 
 import random
-import threading
 import time
 
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/../tictactoe")
 import variables as var
+import rules
 import agents 
+import warmup
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/..")
+import render
+import gameio
+import records
+
+MCTS_TIME_LIMIT = 1.0 # the number of seconds that the MONTE CARLO level searches for each move
+LEVELS = ("EASY", "NORMAL", "HARD", "MONTE CARLO") # the names of the difficulty levels
+CPU_DELAY = 0 # the least number of seconds that each move of a CPU player takes, including its thinking
+CPU_BUDGET = 2 # the number of seconds that a CPU player may think about each move
 
 class TicTacToe:
     """
@@ -44,8 +57,14 @@ class TicTacToe:
         Print a representation of the current game board to the output. 
     take_turn(player)
         Take in a player agent and progress to the state that  the player agent chooses.
+    move_to(state)
+        Progress to a child state that has already been chosen.
     start_game()
         Reset the internal state. Must be called before a game can be played.
+    suspend()
+        Return the moves of the game so far as compact bytes (see sessions.py).
+    resume(data)
+        Return to the state reached by the moves returned by suspend().
     """
     class _State:
         """
@@ -98,7 +117,7 @@ class TicTacToe:
             """the symbol that represents the player that won, if one exists"""
             return self._win_state[1]
 
-        def __init__(self, board, next_player):
+        def __init__(self, board, next_player, last_move=None, empty=None):
             """
             Parameters
             ----------
@@ -106,10 +125,16 @@ class TicTacToe:
                 The representation of the game board as a 2D-list of symbols
             next_player : str
                 The symbol that represents the player that should take the next turn
+            last_move : tuple
+                The (row, column) of the move that led to this board, if it is known
+            empty : int
+                The number of empty spaces on the board, if it is known
             """
             self._board = board
             self._next_player = next_player
             self._children = []
+            self._last_move = last_move
+            self._empty = sum(r.count(var.EMPTY_SPACE) for r in board) if empty is None else empty
             self._win_state = self._is_terminal()
 
         def __eq__(self, other):
@@ -119,7 +144,18 @@ class TicTacToe:
                 return False
 
         def _is_terminal(self):
-            """Return whether the State represents the end of a game and the winner if True."""
+            """Return whether the State represents the end of a game and the winner if True.
+
+            If the last move is known, only the lines through it are tested, since no
+            other line can have been completed by it.
+            """
+            if self._last_move is not None:
+                r, c = self._last_move
+                p = self._board[r][c]
+                for line in rules.LINES_THROUGH[r * rules.SIZE + c]:
+                    if all(self._board[i // rules.SIZE][i % rules.SIZE] == p for i in line):
+                        return (True, p)
+                return (self._empty == 0, None)
 
             # Initialize values related to diagonals.
             p_neg = self._board[0][0]
@@ -165,38 +201,36 @@ class TicTacToe:
 
                         if child_board[r][c] == var.EMPTY_SPACE:
                             child_board[r][c] = self._next_player
-                            child = TicTacToe._State(child_board, child_player)
+                            child = TicTacToe._State(child_board, child_player, (r, c), self._empty - 1)
                             if child not in self._children:
                                 self._children.append(child)
             
 
+        def __str__(self):
+            """Return an ASCII portrayal of the TicTacToe State."""
+            return rules.format_board(self._board)
+
         def print_board(self):
             """Print an ASCII portrayal of the TicTacToe State."""
-            print("  ", end="")
-            for c in range(len(self._board[0])):
-                print("  "+str(c+1), end=" ")
-            print()
-            print()
-
-            for r in range(len(self._board)):
-                print(" "+str(r+1), end=" ")
-                for c in range(len(self._board[r])):
-                    print(" "+self._board[r][c], end=" ")
-                    if (c < len(self._board[r]) - 1):
-                        print("|", end="")
-                print()
-                if (r < len(self._board) - 1):
-                    print("   ---+---+---")
+            print(self)
 
     @property
     def board(self):
         """a representation of the game board as a 2D-list of symbols"""
         return self.state.board
 
-    def __init__(self):
-        self.root = TicTacToe._State(self._get_root(), var.PLAYER_ONE)
+    def __init__(self, root=None):
+        """
+        Parameters
+        ----------
+        root : TicTacToe._State
+            The root of an already generated game tree to share with other games, if one exists
+        """
+        if root is None:
+            root = TicTacToe._State(self._get_root(), var.PLAYER_ONE)
+            self._generate_tree(root)
+        self.root = root
         self.start_game()
-        self._generate_tree(self.root)
 
     def _generate_tree(self, node):
         """Recursively builds the subtree of States beginning with this State (node).
@@ -206,7 +240,8 @@ class TicTacToe:
         for child in node._children:
             self._generate_tree(child)
 
-    def _get_root(self):
+    @staticmethod
+    def _get_root():
         """Generates the root node as an entirely empty 3x3 board."""
         board = []
         for r in range(3):
@@ -248,19 +283,53 @@ class TicTacToe:
         """take_turn(player)
         Take in a player agent and progress to the state that  the player agent chooses.
         """
-        nxt = player.select_move(self.state)
-        assert nxt != None and nxt in self.state._children
-        self.state = nxt
+        self.move_to(player.select_move(self.state))
+
+    def move_to(self, state):
+        """move_to(state)
+        Progress to (state), which must be a child of the current state.
+
+        The game is recorded when it ends, if the process records games (see records.py).
+        """
+        assert state != None and state in self.state._children
+        before = self.state.board
+        after = state.board
+        self._moves.append(next(r * rules.SIZE + c for r in range(rules.SIZE) for c in range(rules.SIZE)
+                                if before[r][c] != after[r][c]))
+        self.state = state
+        if records.recording() and self.is_terminal():
+            records.record_tictactoe(rules.encode(self.root.board), rules.DIGITS[self.root.player], self._moves)
 
     def start_game(self):
         """start_game()
         Reset the internal state. Must be called before a game can be played.
         """
         self.state = self.root
+        self._moves = []
+
+    def suspend(self):
+        """suspend()
+        Return the moves of the game so far as compact bytes, the record of the game (see records.py).
+        The tree is shared, so there is nothing else to release.
+        """
+        ret = records.encode_tictactoe(rules.encode(self.root.board), rules.DIGITS[self.root.player], self._moves)
+        self.state = None
+        return ret
+
+    def resume(self, data):
+        """resume(data)
+        Return to the state reached from the root by the moves in (data), as returned by suspend().
+        """
+        self.start_game()
+        for move in records.decode(data)["moves"]:
+            row, col = divmod(move, rules.SIZE)
+            self.state = next(child for child in self.state._children
+                              if child.board[row][col] != var.EMPTY_SPACE)
+            self._moves.append(move)
 
 def _choose_ai(difficulty, name, turn):
     """Given a difficulty level (difficulty), return the appropriate Agent"""
-    assert(difficulty > 0 and difficulty <= 3)
+    assert(difficulty > 0 and difficulty <= 4)
 
     ret = None
     if difficulty == 1:
@@ -269,60 +338,62 @@ def _choose_ai(difficulty, name, turn):
         ret = agents.FlawedAgent(name, turn)
     elif difficulty == 3:
         ret = agents.UnbeatableAgent(name, turn)
+    elif difficulty == 4:
+        ret = agents.MCTSAgent(name, turn, time_limit=MCTS_TIME_LIMIT, processes=os.cpu_count() or 1)
     return ret
 
-def _ask_difficulty(message):
-    """Receive the difficulty as a user input and return it"""
-    ret = None
-    while True:
-        try:
-            ret = int(input(message + " (Enter 1 for EASY, 2 for NORMAL, 3 for HARD): "))
-            if ret <= 0 or ret > 3:
-                raise ValueError
-            break 
-        except ValueError:
-            print("Sorry, that is not a valid difficulty level.")
-
-    return ret
-
-global_tree = None
-def create_tree():
-    global global_tree
-    global_tree = TicTacToe()
-
-def main():
-    print("Welcome to the TicTacToe Player!")
-    print()
-
-    game_tree = None
-    t1 = threading.Thread(target=create_tree)
-    t1.start()
+def _ask_difficulty(message, levels=len(LEVELS)):
+    """Ask for a difficulty level up to (levels) with (message) and return it"""
+    options = ", ".join(str(i+1)+" for "+LEVELS[i] for i in range(levels))
+    return (yield from gameio.ask_number(message + " (Enter " + options + "): ", 1, levels,
+                                        "Sorry, that is not a valid difficulty level."))
+
+def _turn_frame(game, player):
+    """Return the frame shown before (player) takes a turn in the game (game)."""
+    return render.Frame().blank(2).add(game.state).blank().add(player.name+", it is your turn!")
+
+def _end_frame(game, player_1, player_2):
+    """Return the frame shown at the end of the game (game) between (player_1) and (player_2)."""
+    frame = render.Frame().blank(2).add(game.state).blank()
+    if game.get_winner() == var.PLAYER_ONE:
+        frame.add(player_1.name+" wins!!")
+    elif game.get_winner() == var.PLAYER_TWO:
+        frame.add(player_2.name+" wins!!")
+    else:
+        frame.add("It is a tie.")
+    return frame.blank()
+
+def play(load=None, levels=len(LEVELS), delay=CPU_DELAY, budget=CPU_BUDGET):
+    """Play games of TicTacToe until the user stops, as a dialog for any gameio backend.
+
+    (load) is called through the backend to get the TicTacToe game to play, and
+    defaults to building a new one. It can also be a warmup.Warmup, whose progress
+    is shown while the game is loading. Only the first (levels) difficulty levels are
+    offered. CPU players choose each move within (budget) seconds, or with no limit if it
+    is None, so the budget alone decides how long a move takes. If (delay) is given, they
+    take at least that many seconds over each move, counting the time they thought.
+    """
+    load = TicTacToe if load is None else load
+    yield gameio.say("Welcome to the TicTacToe Player!")
+    yield gameio.say()
 
     while True:
-        num_players = 0
-        while True:
-            try:
-                num_players = int(input("How many players? (Enter 1 or 2): "))
-                if num_players < 0 or num_players > 2:
-                    raise ValueError 
-                break
-
-            except ValueError:
-                print("Sorry, that is not a valid number of players.")
+        num_players = yield from gameio.ask_number("How many players? (Enter 1 or 2): ", 0, 2,
+                                                   "Sorry, that is not a valid number of players.")
 
         ai_level_bonus = 0
         ai_level = 0
         if num_players == 0: 
-            print()
-            print("You found the secret 0-player mode!")
-            ai_level_bonus = _ask_difficulty("What level should the first CPU be?")
-            ai_level = _ask_difficulty("What level should the second CPU be?")
+            yield gameio.say()
+            yield gameio.say("You found the secret 0-player mode!")
+            ai_level_bonus = yield from _ask_difficulty("What level should the first CPU be?", levels)
+            ai_level = yield from _ask_difficulty("What level should the second CPU be?", levels)
 
         if num_players == 1:
-            ai_level = _ask_difficulty("What level CPU do you want to play against?")
+            ai_level = yield from _ask_difficulty("What level CPU do you want to play against?", levels)
 
         assert num_players == 0 or num_players == 1 or num_players == 2
-        assert ai_level >= 0 and ai_level <= 3
+        assert ai_level >= 0 and ai_level <= levels
 
         p1_name = "Human" if num_players == 1 else "Player 1"
         p2_name = "CPU" if num_players == 1 else "Player 2"
@@ -350,59 +421,43 @@ def main():
         player_1 = p1 if p1.player == var.PLAYER_ONE else p2
         player_2 = p1 if p1.player == var.PLAYER_TWO else p2
 
-        print("Loading Game...")
-        if t1 is not None:
-            if t1.is_alive():
-                t1.join()
-            
-            game_tree = global_tree
-            t1 = None
+        yield gameio.say("Loading Game...")
+        if isinstance(load, warmup.Warmup):
+            game_tree = yield from load.dialog()
+        else:
+            game_tree = yield gameio.call(load)
         game_tree.start_game()
-        print("Done!")
+        for kept in (game_tree, player_1, player_2):
+            yield gameio.keep(kept)
+        yield gameio.say("Done!")
 
         while not game_tree.is_terminal():
-            print()
-            print()
-            
-            game_tree.print_board()
-            print()
-            print(player_1.name+", it is your turn!")
-            if not isinstance(player_1, agents.PlayerAgent):
-                time.sleep(2)
-
-            game_tree.take_turn(player_1)
-
-            if (game_tree.is_terminal()):
-                break
-
-            print()
-            print()
-
-            game_tree.print_board()
-            print()
-            print(player_2.name+", it is your turn!")
-            if not isinstance(player_2, agents.PlayerAgent):
-                time.sleep(2)
-
-            game_tree.take_turn(player_2)
-
-        print()
-        print()
-        game_tree.print_board()
-        print()
-
-        if game_tree.get_winner() == var.PLAYER_ONE:
-            print(player_1.name+" wins!!")
-        elif game_tree.get_winner() == var.PLAYER_TWO:
-            print(player_2.name+" wins!!")
-        else:
-            print("It is a tie.")
-
-        print()
-
-        y = input("Would you like to play again? Type 'y' for yes, and anything else for no. ")
-        if not (y[0] == 'y' or y[0] == 'Y'):
+            player = player_1 if game_tree.state.player == player_1.player else player_2
+            yield gameio.show(_turn_frame(game_tree, player))
+            if isinstance(player, agents.PlayerAgent):
+                game_tree.move_to((yield from player.move_dialog(game_tree.state)))
+                continue
+
+            start = time.monotonic()
+            deadline = None if budget is None else start + budget
+            move = yield from player.move_dialog(game_tree.state, deadline)
+            if delay:
+                yield gameio.wait(max(0, delay - (time.monotonic() - start)))
+            game_tree.move_to(move)
+
+        yield gameio.show(_end_frame(game_tree, player_1, player_2))
+        player_1.close()
+        player_2.close()
+
+        if not (yield from gameio.ask_again()):
             break
 
+def main():
+    loader = warmup.Warmup(TicTacToe).start()
+    try:
+        gameio.run(play(loader))
+    finally:
+        loader.cancel()
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
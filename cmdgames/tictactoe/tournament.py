@@ -0,0 +1,362 @@
+"""Command-Line TicTacToe Tournament
+
+This script plays tournaments between the TicTacToe agents and rates them.
+
+Every pairing of two agents plays both colors. A round-robin tournament pairs
+every agent with every other agent in every round. A Swiss tournament pairs
+agents with similar scores in each round, avoiding rematches where it can, so
+it needs far fewer games for many agents.
+
+Games are played by a pool of worker processes, which all attach to one
+FlatTree published before the pool starts (see shareddata.py), and are handed
+out one at a time so that a free worker always takes the next
+game. Every result is appended to a checkpoint file as soon as it arrives, and
+a tournament started with the same checkpoint skips the games it already has,
+dropping a last result that an interrupted run only wrote in part.
+Each game is seeded from its id, so a resumed tournament plays the same games.
+
+Agents are rated with Elo, replaying the games in order of their ids, and with
+Glicko, treating every round as one rating period. Both come with a 95%
+confidence interval.
+
+This file contains the following classes:
+    * Tournament - a tournament between agents
+
+This file contains the following functions:
+    * round_robin - return the pairings of a round-robin round
+    * swiss - return the pairings of a Swiss round
+    * elo - return the Elo rating of every agent and its confidence interval
+    * glicko - return the Glicko rating of every agent and its confidence interval
+    * main - the main function of the script, which runs a tournament from the command line
+"""
+
+import argparse
+import json
+import math
+import random
+import zlib
+
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/../tictactoe")
+import variables as var
+import agents
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/..")
+import gameloader
+import shareddata
+
+AGENTS = {
+    "random": agents.RandomAgent,
+    "flawed": agents.FlawedAgent,
+    "unbeatable": agents.UnbeatableAgent,
+    "mcts": lambda name, player: agents.MCTSAgent(name, player, iterations=MCTS_ITERATIONS),
+} # the agents that can play in a tournament, by name
+MCTS_ITERATIONS = 500 # the number of iterations of each search of the mcts agent
+
+ROUND_ROBIN = "round-robin" # the name of the round-robin format
+SWISS = "swiss" # the name of the Swiss format
+
+ELO_START = 1500 # the rating of an agent that has not played
+ELO_K = 16 # the largest change of an Elo rating in one game
+GLICKO_RD = 350 # the rating deviation of an agent that has not played
+Z95 = 1.96 # the half-width of a 95% confidence interval, in standard deviations
+
+_tree = None
+_players = {}
+
+def _init_worker(path):
+    """Attach a worker process to the game tree published at (path) by shareddata.publish_games()."""
+    global _tree
+    shareddata.init_worker(path)
+    _tree = shareddata.tree
+
+def _play(task):
+    """Play the game (task), an (id, round, x, o) tuple, and return its result as a dictionary."""
+    game_id, round_number, x_name, o_name = task
+    seed = zlib.crc32(game_id.encode("utf8"))
+    random.seed(seed)
+
+    players = {}
+    for name, symbol in ((x_name, var.PLAYER_ONE), (o_name, var.PLAYER_TWO)):
+        if (name, symbol) not in _players:
+            _players[(name, symbol)] = AGENTS[name](name, symbol)
+        players[symbol] = _players[(name, symbol)]
+        if hasattr(players[symbol], "_rng"):
+            players[symbol]._rng.seed(seed)
+
+    state = _tree.root
+    plies = 0
+    while not state.is_terminal:
+        state = players[state.player].select_move(state)
+        plies += 1
+
+    result = "draw" if state.winner is None else ("x" if state.winner == var.PLAYER_ONE else "o")
+    return {"id": game_id, "round": round_number, "x": x_name, "o": o_name, "result": result, "plies": plies}
+
+def _points(game, name):
+    """Return the points that (name) scored in (game): 1 for a win, 0.5 for a draw and 0 for a loss."""
+    if game["result"] == "draw":
+        return 0.5
+    return 1.0 if game[game["result"]] == name else 0.0
+
+def round_robin(names):
+    """Return the pairings of a round-robin round between the agents (names)."""
+    return [(names[i], names[j]) for i in range(len(names)) for j in range(i + 1, len(names))]
+
+def swiss(names, games):
+    """Return the pairings of a Swiss round between the agents (names), after the results (games).
+
+    Agents are ranked by their points and then by name, and each is paired with the next agent
+    in the ranking that it has not played yet, or the next agent if it has played them all.
+    With an odd number of agents, the lowest-ranked agent that has sat out the fewest rounds sits out.
+    """
+    points = {name: 0.0 for name in names}
+    played = set()
+    rounds = {}
+    for game in games:
+        points[game["x"]] += _points(game, game["x"])
+        points[game["o"]] += _points(game, game["o"])
+        played.add(frozenset((game["x"], game["o"])))
+        rounds.setdefault(game["round"], set()).update((game["x"], game["o"]))
+
+    ranking = sorted(names, key=lambda name: (-points[name], name))
+    if len(ranking) % 2 == 1:
+        byes = {name: sum(name not in playing for playing in rounds.values()) for name in names}
+        ranking.remove(min(reversed(ranking), key=lambda name: byes[name]))
+
+    ret = []
+    while ranking:
+        first = ranking.pop(0)
+        others = [name for name in ranking if frozenset((first, name)) not in played]
+        second = others[0] if others else ranking[0]
+        ranking.remove(second)
+        ret.append((first, second))
+    return ret
+
+def _expected(rating, other, g=1.0):
+    """Return the expected score of (rating) against (other)."""
+    return 1 / (1 + 10 ** (-g * (rating - other) / 400))
+
+def elo(names, games):
+    """Return a dictionary from every agent in (names) to its Elo rating and the half-width of
+    its 95% confidence interval, after the results (games)."""
+    ratings = {name: float(ELO_START) for name in names}
+    points = {name: 0.0 for name in names}
+    counts = {name: 0 for name in names}
+    for game in sorted(games, key=lambda g: g["id"]):
+        x, o = game["x"], game["o"]
+        score = _points(game, x)
+        change = ELO_K * (score - _expected(ratings[x], ratings[o]))
+        ratings[x] += change
+        ratings[o] -= change
+        points[x] += score
+        points[o] += 1 - score
+        counts[x] += 1
+        counts[o] += 1
+
+    ret = {}
+    for name in names:
+        n = counts[name]
+        if n == 0:
+            ret[name] = (ratings[name], float("inf"))
+            continue
+        s = min(max(points[name] / n, 0.5 / n), 1 - 0.5 / n)
+        ret[name] = (ratings[name], Z95 * 400 / math.log(10) / math.sqrt(n * s * (1 - s)))
+    return ret
+
+def glicko(names, games):
+    """Return a dictionary from every agent in (names) to its Glicko rating and the half-width of
+    its 95% confidence interval, after the results (games). Every round is one rating period."""
+    q = math.log(10) / 400
+    ratings = {name: (float(ELO_START), float(GLICKO_RD)) for name in names}
+    rounds = {}
+    for game in games:
+        rounds.setdefault(game["round"], []).append(game)
+
+    for round_number in sorted(rounds):
+        opponents = {name: [] for name in names}
+        for game in rounds[round_number]:
+            opponents[game["x"]].append((game["o"], _points(game, game["x"])))
+            opponents[game["o"]].append((game["x"], _points(game, game["o"])))
+
+        following = {}
+        for name in names:
+            rating, rd = ratings[name]
+            if not opponents[name]:
+                following[name] = (rating, rd)
+                continue
+
+            variance = 0.0
+            total = 0.0
+            for other, score in opponents[name]:
+                other_rating, other_rd = ratings[other]
+                g = 1 / math.sqrt(1 + 3 * q * q * other_rd * other_rd / math.pi ** 2)
+                e = _expected(rating, other_rating, g)
+                variance += q * q * g * g * e * (1 - e)
+                total += g * (score - e)
+            precision = 1 / (rd * rd) + variance
+            following[name] = (rating + q / precision * total, math.sqrt(1 / precision))
+        ratings = following
+
+    return {name: (rating, Z95 * rd) for name, (rating, rd) in ratings.items()}
+
+class Tournament:
+    """
+    A class used to represent a tournament between agents.
+    ...
+
+    Attributes
+    ----------
+
+    names : list
+        the names of the agents in the tournament
+    games : list
+        the result of every game played so far, as dictionaries
+
+    Methods
+    -------
+    run()
+        Play every game of the tournament that has not been played yet and return the results.
+    standings()
+        Return every agent's games, points, Elo rating and Glicko rating, best first.
+    """
+
+    @property
+    def names(self):
+        """the names of the agents in the tournament"""
+        return list(self._names)
+
+    @property
+    def games(self):
+        """the result of every game played so far, as dictionaries"""
+        return list(self._games.values())
+
+    def __init__(self, names, schedule=ROUND_ROBIN, rounds=1, processes=None, checkpoint=None):
+        """
+        Parameters
+        ----------
+        names : list
+            The names of the agents in the tournament, from AGENTS
+        schedule : str
+            ROUND_ROBIN or SWISS
+        rounds : int
+            The number of rounds to play
+        processes : int
+            The number of worker processes, which defaults to the number of cores
+        checkpoint : str
+            The path of a JSON Lines file to append results to and resume from, if one is wanted
+        """
+        for name in names:
+            if name not in AGENTS:
+                raise ValueError("unknown agent "+name)
+        if schedule not in (ROUND_ROBIN, SWISS):
+            raise ValueError("unknown schedule "+schedule)
+
+        self._names = list(names)
+        self._schedule = schedule
+        self._rounds = rounds
+        self._processes = processes or os.cpu_count() or 1
+        self._checkpoint = checkpoint
+        self._games = {}
+
+        if checkpoint is not None and os.path.exists(checkpoint):
+            self._load(checkpoint)
+
+    def _load(self, path):
+        """Read the results in the checkpoint file (path).
+
+        A last line that an interrupted run left unfinished is cut off, and the file is made to
+        end with a newline, so the results of the next run start on a line of their own.
+        """
+        with open(path, "rb+") as f:
+            data = f.read()
+            end = 0
+            for line in data.splitlines(keepends=True):
+                try:
+                    game = json.loads(line) if line.strip() else None
+                except ValueError:
+                    if end + len(line) < len(data):
+                        raise
+                    break
+                if game is not None:
+                    self._games[game["id"]] = game
+                end += len(line)
+            f.truncate(end)
+            if end and data[end - 1:end] != b"\n":
+                f.seek(end)
+                f.write(b"\n")
+
+    def _tasks(self, round_number):
+        """Return the games of round (round_number) that have not been played yet."""
+        if self._schedule == ROUND_ROBIN:
+            pairings = round_robin(self._names)
+        else:
+            pairings = swiss(self._names, [g for g in self._games.values() if g["round"] < round_number])
+
+        ret = []
+        for first, second in pairings:
+            for x, o in ((first, second), (second, first)):
+                game_id = "{:04d}-{}-{}".format(round_number, x, o)
+                if game_id not in self._games:
+                    ret.append((game_id, round_number, x, o))
+        return ret
+
+    def _play_rounds(self, play, checkpoint):
+        """Play the games of every round with (play), which maps a list of tasks to their results,
+        and append every result to the file (checkpoint), if it is given, as soon as it arrives."""
+        for round_number in range(self._rounds):
+            for game in play(self._tasks(round_number)):
+                self._games[game["id"]] = game
+                if checkpoint is not None:
+                    checkpoint.write(json.dumps(game) + "\n")
+                    checkpoint.flush()
+
+    def run(self):
+        """Play every game of the tournament that has not been played yet and return the results."""
+        checkpoint = None if self._checkpoint is None else open(self._checkpoint, "a", encoding="utf8")
+        path = shareddata.publish_games()
+        context = gameloader.pool_context(_init_worker, _play)
+        try:
+            if context is None:
+                _init_worker(path)
+                self._play_rounds(lambda tasks: map(_play, tasks), checkpoint)
+            else:
+                with context.Pool(self._processes, initializer=_init_worker, initargs=(path,)) as pool:
+                    self._play_rounds(lambda tasks: pool.imap_unordered(_play, tasks, chunksize=1), checkpoint)
+        finally:
+            shareddata.unpublish(path)
+            if checkpoint is not None:
+                checkpoint.close()
+        return self.games
+
+    def standings(self):
+        """Return a list of (name, games, points, elo, glicko) for every agent, best first,
+        where elo and glicko are (rating, half-width of the 95% confidence interval)."""
+        games = self.games
+        elos = elo(self._names, games)
+        glickos = glicko(self._names, games)
+        ret = []
+        for name in self._names:
+            mine = [g for g in games if name in (g["x"], g["o"])]
+            ret.append((name, len(mine), sum(_points(g, name) for g in mine), elos[name], glickos[name]))
+        return sorted(ret, key=lambda row: (-row[4][0], row[0]))
+
+def main():
+    parser = argparse.ArgumentParser(description="Play a tournament between TicTacToe agents.")
+    parser.add_argument("agents", nargs="*", default=sorted(AGENTS), help="the agents to play, from "
+                        +", ".join(sorted(AGENTS)))
+    parser.add_argument("--schedule", choices=(ROUND_ROBIN, SWISS), default=ROUND_ROBIN)
+    parser.add_argument("--rounds", type=int, default=10, help="the number of rounds to play")
+    parser.add_argument("--processes", type=int, default=None, help="the number of worker processes")
+    parser.add_argument("--checkpoint", default=None, help="a JSON Lines file to save results to and resume from")
+    args = parser.parse_args()
+
+    tournament = Tournament(args.agents, args.schedule, args.rounds, args.processes, args.checkpoint)
+    tournament.run()
+    print("{:<12}{:>7}{:>8}{:>16}{:>16}".format("agent", "games", "points", "elo", "glicko"))
+    for name, count, points, (elo_rating, elo_ci), (glicko_rating, glicko_ci) in tournament.standings():
+        print("{:<12}{:>7}{:>8.1f}{:>9.0f} +/-{:>4.0f}{:>9.0f} +/-{:>4.0f}".format(
+            name, count, points, elo_rating, elo_ci, glicko_rating, glicko_ci))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,345 @@
+"""Command-Line Ultimate TicTacToe
+
+This script allows the user to play a game of Ultimate TicTacToe.
+
+The board is a 3x3 grid of TicTacToe boards. Each move is made in one of the
+small boards, and the cell it takes decides which small board the opponent must
+play in next, unless that board is already won or full, in which case the
+opponent may play in any open board. Winning a small board claims its cell of
+the large board, and the first player to claim three cells in a row wins.
+
+The game tree is far too large to build, so the engine keeps a single position
+that is changed in place by play() and restored by undo(). Every small board is
+a pair of 9-bit masks, one per player, and the large board is a pair of masks of
+the boards each player has won. Whether a mask holds three in a row is read from
+a table built from the same lines as TicTacToe._State (see rules.py).
+
+The CPU plays with a Monte Carlo tree search (UCT) under a time budget, which
+walks the search tree by playing and undoing moves on one engine, and returns
+the best move it has found by the deadline of the move.
+
+This file contains the following classes:
+    * Ultimate - a class that represents a game of Ultimate TicTacToe
+
+This file contains the following functions:
+    * search - return the best move of a game with a Monte Carlo tree search
+    * play - the dialog of the game, for any gameio backend
+    * main - the main function of the script, which activates the game
+"""
+
+import math
+import random
+import time
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/../tictactoe")
+import variables as var
+import rules
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/..")
+import render
+import gameio
+
+FULL = (1 << rules.CELLS) - 1 # the mask of a full board
+WINS = bytes(any(mask & sum(1 << i for i in line) == sum(1 << i for i in line) for line in rules.LINES)
+             for mask in range(FULL + 1)) # whether each mask holds three in a row
+SIZE = rules.SIZE * rules.SIZE # the number of rows and columns of the whole grid
+LEVELS = ("EASY", "NORMAL", "HARD") # the names of the difficulty levels
+ITERATIONS = 1000 # the default number of iterations of a search
+NORMAL_ITERATIONS = 300 # the number of iterations that the NORMAL level searches for each move
+HARD_TIME_LIMIT = 2.0 # the number of seconds that the HARD level searches for each move
+EXPLORATION = math.sqrt(2) # the exploration constant of the upper confidence bound
+CPU_DELAY = 0 # the least number of seconds that each move of a CPU player takes, including its thinking
+CPU_BUDGET = HARD_TIME_LIMIT # the number of seconds that a CPU player may think about each move
+
+def _bits(mask):
+    """Return the positions of the set bits of (mask), from the lowest up."""
+    ret = []
+    while mask:
+        low = mask & -mask
+        ret.append(low.bit_length() - 1)
+        mask ^= low
+    return ret
+
+class Ultimate:
+    """
+    A class used to represent a game of Ultimate TicTacToe.
+    ...
+
+    A move is numbered board * 9 + cell, where the small boards and their cells are
+    both numbered in reading order.
+
+    Attributes
+    ----------
+
+    player : str
+        the symbol that represents the player that should take the next turn
+    target : int or None
+        the small board that must be played in next, or None if any open board may be
+    winner : str or None
+        the symbol that represents the player that won, if one exists
+    is_terminal : bool
+        whether the game has ended
+
+    Methods
+    -------
+    moves()
+        Return the moves that can be played next.
+    play(move)
+        Play (move) for the player to move.
+    undo()
+        Take back the last move.
+    cell(row, col)
+        Return the symbol at (row) and (col) of the whole grid.
+    """
+
+    @property
+    def player(self):
+        """the symbol that represents the player that should take the next turn"""
+        return rules.SYMBOLS[self._player + 1]
+
+    @property
+    def target(self):
+        """the small board that must be played in next, or None if any open board may be"""
+        return self._target
+
+    @property
+    def winner(self):
+        """the symbol that represents the player that won, if one exists"""
+        return None if self._winner is None else rules.SYMBOLS[self._winner + 1]
+
+    @property
+    def is_terminal(self):
+        """whether the game has ended"""
+        return self._winner is not None or self._closed == FULL
+
+    def __init__(self):
+        self._stones = ([0] * rules.CELLS, [0] * rules.CELLS)
+        self._won = [0, 0]
+        self._closed = 0
+        self._target = None
+        self._player = 0
+        self._winner = None
+        self._history = []
+
+    def moves(self):
+        """Return the moves that can be played next, or an empty list if the game has ended."""
+        if self.is_terminal:
+            return []
+        boards = [self._target] if self._target is not None else _bits(FULL ^ self._closed)
+        ret = []
+        for b in boards:
+            taken = self._stones[0][b] | self._stones[1][b]
+            ret.extend(b * rules.CELLS + c for c in _bits(FULL ^ taken))
+        return ret
+
+    def play(self, move):
+        """Play (move) for the player to move, which must be one of moves()."""
+        b, c = divmod(move, rules.CELLS)
+        p = self._player
+        self._history.append((move, self._target, self._won[p], self._closed, self._winner))
+
+        stones = self._stones[p][b] | (1 << c)
+        self._stones[p][b] = stones
+        if WINS[stones]:
+            self._won[p] |= 1 << b
+            self._closed |= 1 << b
+            if WINS[self._won[p]]:
+                self._winner = p
+        elif stones | self._stones[1 - p][b] == FULL:
+            self._closed |= 1 << b
+
+        self._target = None if self._closed >> c & 1 else c
+        self._player = 1 - p
+
+    def undo(self):
+        """Take back the last move."""
+        move, self._target, won, self._closed, self._winner = self._history.pop()
+        self._player = 1 - self._player
+        b, c = divmod(move, rules.CELLS)
+        self._stones[self._player][b] &= ~(1 << c)
+        self._won[self._player] = won
+
+    def cell(self, row, col):
+        """Return the symbol at (row) and (col) of the whole grid, counted from 0."""
+        b = (row // rules.SIZE) * rules.SIZE + col // rules.SIZE
+        c = (row % rules.SIZE) * rules.SIZE + col % rules.SIZE
+        for p in (0, 1):
+            if self._stones[p][b] >> c & 1:
+                return rules.SYMBOLS[p + 1]
+        return var.EMPTY_SPACE
+
+    def __str__(self):
+        """Return an ASCII portrayal of the whole grid."""
+        ret = "   " + "   ".join(" ".join(str(c + 1) for c in range(k, k + rules.SIZE))
+                                 for k in range(0, SIZE, rules.SIZE)) + "\n"
+        for row in range(SIZE):
+            if row and row % rules.SIZE == 0:
+                ret += "  " + "+".join(["-------"] * rules.SIZE) + "\n"
+            cells = [self.cell(row, col) for col in range(SIZE)]
+            ret += str(row + 1) + "  " + " | ".join(" ".join(cells[k:k + rules.SIZE])
+                                                   for k in range(0, SIZE, rules.SIZE)) + "\n"
+        return ret[:-1]
+
+class _Node:
+    """A private class used to represent a position in a search tree."""
+    __slots__ = ("move", "parent", "mover", "children", "untried", "visits", "wins")
+
+    def __init__(self, move, parent, mover, untried):
+        self.move = move
+        self.parent = parent
+        self.mover = mover
+        self.children = []
+        self.untried = untried
+        self.visits = 0
+        self.wins = 0.0
+
+def search(game, iterations=None, time_limit=None, rng=random, deadline=None, stats=None):
+    """Return the best move of (game) found by a Monte Carlo tree search.
+
+    The search runs for (iterations) iterations, for (time_limit) seconds or until the
+    time.monotonic() (deadline), whichever ends first, or for ITERATIONS iterations if
+    none is given, and always runs at least one. It plays and undoes moves on (game)
+    itself, leaving it as it was found. If (stats) is a dictionary, the depth of the
+    most visited line and the number of iterations are put in it as "depth" and "nodes".
+    """
+    if iterations is None and time_limit is None and deadline is None:
+        iterations = ITERATIONS
+    if time_limit is not None:
+        deadline = time.monotonic() + time_limit if deadline is None else \
+                   min(deadline, time.monotonic() + time_limit)
+    root = _Node(None, None, None, game.moves())
+    count = 0
+    while count == 0 or ((iterations is None or count < iterations)
+                         and (deadline is None or time.monotonic() < deadline)):
+        count += 1
+        node = root
+        depth = 0
+        while not node.untried and node.children:
+            log = math.log(node.visits)
+            node = max(node.children, key=lambda child: child.wins / child.visits
+                       + EXPLORATION * math.sqrt(log / child.visits))
+            game.play(node.move)
+            depth += 1
+
+        if node.untried:
+            move = node.untried.pop(rng.randrange(len(node.untried)))
+            mover = game._player
+            game.play(move)
+            depth += 1
+            child = _Node(move, node, mover, game.moves())
+            node.children.append(child)
+            node = child
+
+        while not game.is_terminal:
+            game.play(rng.choice(game.moves()))
+            depth += 1
+        winner = game._winner
+        for _ in range(depth):
+            game.undo()
+
+        while node is not None:
+            node.visits += 1
+            if winner is None:
+                node.wins += 0.5
+            elif winner == node.mover:
+                node.wins += 1
+            node = node.parent
+
+    if stats is not None:
+        depth = 0
+        node = root
+        while node.children:
+            node = max(node.children, key=lambda child: child.visits)
+            depth += 1
+        stats.update(depth=depth, nodes=count)
+    return max(root.children, key=lambda child: child.visits).move
+
+def _cpu_move(game, level, deadline=None):
+    """Return the move of a CPU player of the difficulty level (level) in (game), chosen by the
+    time.monotonic() (deadline) if one is given."""
+    if level == 1:
+        return random.choice(game.moves())
+    if level == 2:
+        return search(game, iterations=NORMAL_ITERATIONS, deadline=deadline)
+    return search(game, time_limit=HARD_TIME_LIMIT, deadline=deadline)
+
+def _ask_move(game):
+    """Ask the user for their move in (game) and return it."""
+    while True:
+        col = yield from gameio.ask_number("Select a column: ", 1, SIZE, "Sorry, that is not a valid column")
+        row = yield from gameio.ask_number("Select a row: ", 1, SIZE, "Sorry, that is not a valid row")
+        b = ((row - 1) // rules.SIZE) * rules.SIZE + (col - 1) // rules.SIZE
+        move = b * rules.CELLS + ((row - 1) % rules.SIZE) * rules.SIZE + (col - 1) % rules.SIZE
+        if move in game.moves():
+            return move
+        if game.cell(row - 1, col - 1) != var.EMPTY_SPACE:
+            yield gameio.say("Sorry, that space has already been taken!")
+        else:
+            yield gameio.say("Sorry, you must play in the board you were sent to!")
+        yield gameio.say()
+
+def _turn_frame(game, name):
+    """Return the frame shown before the player (name) takes a turn in the game (game)."""
+    frame = render.Frame().blank(2).add(game).blank()
+    if game.target is None:
+        frame.add("You may play in any open board.")
+    else:
+        row, col = divmod(game.target, rules.SIZE)
+        frame.add("You must play in the board at row", row + 1, "and column", str(col + 1) + ".")
+    return frame.add(name+", it is your turn!")
+
+def _end_frame(game, names):
+    """Return the frame shown at the end of the game (game) between the players (names)."""
+    frame = render.Frame().blank(2).add(game).blank()
+    if game.winner is None:
+        frame.add("It is a tie.")
+    else:
+        frame.add(names[game.winner]+" wins!!")
+    return frame.blank()
+
+def play(delay=CPU_DELAY, budget=CPU_BUDGET):
+    """Play games of Ultimate TicTacToe until the user stops, as a dialog for any gameio backend.
+
+    CPU players choose each move within (budget) seconds, or with no limit if it is None,
+    so the budget alone decides how long a move takes. If (delay) is given, they take at
+    least that many seconds over each move, counting the time they thought.
+    """
+    yield gameio.say("Welcome to the Ultimate TicTacToe Player!")
+    yield gameio.say()
+
+    while True:
+        num_players = yield from gameio.ask_number("How many players? (Enter 1 or 2): ", 1, 2,
+                                                   "Sorry, that is not a valid number of players.")
+        level = 0
+        if num_players == 1:
+            options = ", ".join(str(i+1)+" for "+LEVELS[i] for i in range(len(LEVELS)))
+            level = yield from gameio.ask_number("What level CPU do you want to play against? (Enter "
+                                                 + options + "): ", 1, len(LEVELS),
+                                                 "Sorry, that is not a valid difficulty level.")
+
+        names = {var.PLAYER_ONE: "Human" if num_players == 1 else "Player 1",
+                 var.PLAYER_TWO: "CPU" if num_players == 1 else "Player 2"}
+        game = Ultimate()
+        while not game.is_terminal:
+            yield gameio.show(_turn_frame(game, names[game.player]))
+            if level and game.player == var.PLAYER_TWO:
+                start = time.monotonic()
+                deadline = None if budget is None else start + budget
+                move = yield gameio.call(_cpu_move, game, level, deadline)
+                if delay:
+                    yield gameio.wait(max(0, delay - (time.monotonic() - start)))
+            else:
+                move = yield from _ask_move(game)
+            game.play(move)
+
+        yield gameio.show(_end_frame(game, names))
+
+        if not (yield from gameio.ask_again()):
+            break
+
+def main():
+    gameio.run(play())
+
+if __name__ == "__main__":
+    main()
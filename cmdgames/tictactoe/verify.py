@@ -0,0 +1,206 @@
+"""Command-Line TicTacToe Verification
+
+This script checks every position of the TicTacToe game tree against the
+reference, the tree of TicTacToe._State objects.
+
+The values of the reference are found by a negamax over the children of its
+States, and every position that can be reached from the empty board is then
+checked, once however many times it appears in the tree:
+
+    * the UnbeatableAgent never chooses a move that is worse than the best one
+    * the sub-optimal choices of the FlawedAgent, which score a win as 1 and a
+      draw or a loss as 0, take a forced win whenever there is one
+    * the flat tree (see flattree.py), the solved table (see solved.py), the
+      bitboards of Ultimate TicTacToe (see ultimate.py) and the negamax search
+      (see parallel.py) agree with the reference on the winner, whether the
+      game has ended, the children and the value of the position
+
+The positions are split between a pool of processes. The reference is worked
+out from the States once, before the pool is started, and handed to every
+worker as plain data, a tuple of numbers and symbols for every position. The
+flat tree and the solved table are published once (see shareddata.py), and
+every worker attaches to them instead of building its own. No State is ever
+sent to a worker, so the pool works with any start method.
+
+This file contains the following functions:
+    * verify - check every position and return the failures
+    * main - the main function of the script, which checks the whole tree
+"""
+
+import argparse
+import multiprocessing
+import time
+
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/../tictactoe")
+import rules
+import agents
+import parallel
+import ultimate
+from tictactoe import TicTacToe
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/..")
+import gameloader
+import shareddata
+
+CHUNK = 256 # the number of positions that a worker checks at a time
+
+_shared = None # the reference, the engines and the agents of this process, set by _init_worker()
+
+def _reference(game):
+    """Return a dictionary from the code of every position of the game (game) to its reference: the
+    player to move, the winner, whether the game has ended, the sorted codes of the children, the
+    value for the player to move and whether every game through the position is a tie."""
+    ret = {}
+
+    def visit(state):
+        code = rules.encode(state._board)
+        if code in ret:
+            return ret[code][4]
+        if state.is_terminal:
+            value = 0 if state.winner is None else (1 if state.winner == state.player else -1)
+        else:
+            value = max(-visit(child) for child in state._children)
+        children = sorted(rules.encode(child._board) for child in state._children)
+        ret[code] = (state.player, state.winner, state.is_terminal, children, value, game._will_tie(state))
+        return value
+
+    visit(game.root)
+    return ret
+
+def _init_worker(path, reference):
+    """Attach a worker process to the data published at (path) by shareddata.publish_games(), keep the
+    reference (reference) returned by _reference() and build the agents, solved for the whole tree."""
+    global _shared
+    shareddata.init_worker(path)
+    tree = shareddata.tree
+    players = (rules.SYMBOLS[1], rules.SYMBOLS[2])
+    unbeatable = {p: agents.UnbeatableAgent("V", p) for p in players}
+    flawed = {p: agents.FlawedAgent("V", p) for p in players}
+    for p in players:
+        unbeatable[p]._choose_from_solution(tree.root, 1, -1, 0, quick=True)
+        flawed[p]._choose_from_solution(tree.root, 1, 0, 0)
+    _shared = {"reference": reference, "codes": sorted(reference), "tree": tree, "table": shareddata.table,
+               "unbeatable": unbeatable, "flawed": flawed}
+
+def _engines(code, cells):
+    """Return the winner, whether the game has ended, the sorted codes of the children and the value of
+    the position (code) with the digits (cells), as each engine sees them, by the name of the engine."""
+    tree = _shared["tree"]
+    table = _shared["table"]
+    ret = {}
+
+    node = tree.find(rules.decode(code))
+    if node is None:
+        ret["flat tree"] = None
+    else:
+        ret["flat tree"] = (node.winner, node.is_terminal,
+                            sorted(tree._codes[child.index] for child in node._children), tree.value(node.index))
+
+    if table.is_reachable(code):
+        terminal = table.is_terminal(code)
+        children = [] if terminal else [code + rules.to_move(cells) * rules.POWERS[i]
+                                        for i in range(rules.CELLS) if cells[i] == 0]
+        ret["solved table"] = (table.winner(code), terminal, sorted(children), table.value(code))
+    else:
+        ret["solved table"] = None
+
+    masks = [sum(1 << i for i in range(rules.CELLS) if cells[i] == p) for p in (1, 2)]
+    winner = next((rules.SYMBOLS[p + 1] for p in (0, 1) if ultimate.WINS[masks[p]]), None)
+    terminal = winner is not None or masks[0] | masks[1] == ultimate.FULL
+    ret["bitboard"] = (winner, terminal)
+
+    if not terminal:
+        score = parallel.negamax(list(cells), rules.to_move(cells), cells.count(0))
+        ret["negamax"] = (score > 0) - (score < 0)
+    return ret
+
+def _check(start, stop):
+    """Check the positions from (start) up to (stop), in the order of their codes, and return the failures."""
+    ret = []
+    reference = _shared["reference"]
+    tree = _shared["tree"]
+    for code in _shared["codes"][start:stop]:
+        player, winner, terminal, children, value, tie = reference[code]
+        cells = rules.digits(code)
+
+        def fail(message):
+            ret.append("position " + str(code) + " (" + player + " to move): " + message)
+
+        expected = {"flat tree": (winner, terminal, children, value),
+                    "solved table": (winner, terminal, children, value),
+                    "bitboard": (winner, terminal),
+                    "negamax": value}
+        for name, seen in _engines(code, cells).items():
+            if seen != expected[name]:
+                fail("the " + name + " gives " + repr(seen) + " instead of " + repr(expected[name]))
+
+        node = tree.find(rules.decode(code))
+        if node is None:
+            continue
+        if tie != tree.will_tie(node.index):
+            fail("the flat tree does not agree on whether every game is a tie")
+
+        if terminal:
+            continue
+
+        choice = reference[tree._codes[_shared["unbeatable"][player].select_move(node).index]][4]
+        if -choice != value:
+            fail("the UnbeatableAgent chooses a move worth " + str(-choice) + " instead of " + str(value))
+
+        choice = reference[tree._codes[_shared["flawed"][player]._choose_successor(node, 1, 0, 0).index]][4]
+        wins = any(reference[child][4] == -1 for child in children)
+        if wins and choice != -1:
+            fail("the FlawedAgent misses a forced win")
+    return ret
+
+def _check_task(task):
+    """Check the positions of (task), a pair of a start and a stop, in a worker process."""
+    return _check(*task)
+
+def verify(game=None, processes=None, context=None):
+    """Check every position of the TicTacToe game (game), which is built if not given, with (processes)
+    processes, which defaults to the number of cores, started by the multiprocessing context (context),
+    which defaults to one that can run them (see gameloader.pool_context()). Return the number of
+    positions and the failures."""
+    game = TicTacToe() if game is None else game
+    processes = processes or os.cpu_count() or 1
+    context = gameloader.pool_context(_init_worker, _check_task) if context is None else context
+    reference = _reference(game)
+    size = len(reference)
+    tasks = [(start, min(start + CHUNK, size)) for start in range(0, size, CHUNK)]
+    path = shareddata.publish_games()
+    try:
+        if processes == 1 or context is None:
+            _init_worker(path, reference)
+            results = [_check_task(task) for task in tasks]
+        else:
+            with context.Pool(processes, initializer=_init_worker, initargs=(path, reference)) as pool:
+                results = pool.map(_check_task, tasks)
+        return size, [failure for result in results for failure in result]
+    finally:
+        _release()
+        shareddata.unpublish(path)
+
+def _release():
+    """Forget the reference and the engines."""
+    global _shared
+    _shared = None
+
+def main():
+    parser = argparse.ArgumentParser(description="Check every TicTacToe position against the game tree.")
+    parser.add_argument("--processes", type=int, default=None, help="the number of processes that check positions")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    game = TicTacToe()
+    built = time.perf_counter()
+    size, failures = verify(game, args.processes)
+    for failure in failures:
+        print(failure)
+    print("Built the tree in %.2f seconds and checked %d positions in %.2f seconds: %d failures"
+          % (built - start, size, time.perf_counter() - built, len(failures)))
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
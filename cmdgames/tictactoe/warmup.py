@@ -0,0 +1,225 @@
+"""Command-Line TicTacToe Warm-Up
+
+This script builds the TicTacToe game tree in the background while the user
+chooses how to play.
+
+The tree below each of the nine opening moves is built as its own task by a
+pool of processes, as a flat tree (see flattree.py). Each worker sends back
+only the buffer of its tree, which the build attaches under the root as it is,
+so no States are pickled or rebuilt, and the tasks only hold plain boards, so
+the pool works with any start method. With only one processor, the openings
+are built one at a time by a thread instead. Either way, the build reports how
+many openings are done, and it can be cancelled, for example when the user
+leaves before the game is needed.
+
+This file contains the following classes:
+    * Warmup - a build of the game tree that runs in the background
+
+This file contains the following functions:
+    * main - the main function of the script, which times a build
+"""
+
+import multiprocessing
+import sys
+import threading
+import time
+
+import os
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/../tictactoe")
+import variables as var
+import flattree
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/..")
+import gameio
+
+POLL = 0.25 # the number of seconds between checks of the progress while waiting for a build
+
+def _root(game):
+    """Return the root State of the game class (game), with its children but nothing below them."""
+    root = game._State(game._get_root(), var.PLAYER_ONE)
+    root._generate_children()
+    return root
+
+def _build_opening(task):
+    """Return the index of the opening of (task), a tuple of the index, the board and the player to
+    move, and the buffer of the flat tree below it, built in a worker process."""
+    i, board, player = task
+    return i, flattree.build(board, player).buffer
+
+class Warmup:
+    """
+    A class used to represent a build of the TicTacToe game tree that runs in the background.
+    ...
+
+    Calling a Warmup waits for the build and returns the game, so a Warmup can be
+    given to tictactoe.play() wherever a function that loads the game is expected.
+
+    Attributes
+    ----------
+
+    progress : tuple
+        the number of openings that have been built and the number of openings
+    done : bool
+        whether the build has finished or been cancelled
+
+    Methods
+    -------
+    start()
+        Start the build.
+    cancel()
+        Stop the build and release its processes.
+    result(timeout=None)
+        Wait for the build and return the game, or None if it was cancelled.
+    dialog()
+        The dialog of result(), which reports the progress through any gameio backend.
+    """
+
+    @property
+    def progress(self):
+        """the number of openings that have been built and the number of openings"""
+        with self._changed:
+            return self._built, self._total
+
+    @property
+    def done(self):
+        """whether the build has finished or been cancelled"""
+        return self._finished.is_set()
+
+    def __init__(self, game, processes=None):
+        """
+        Parameters
+        ----------
+        game : type
+            The TicTacToe class, whose game tree is built
+        processes : int
+            The number of processes that build subtrees, which defaults to the number of
+            processors, or 1 to build them in a thread of this process
+        """
+        self._game = game
+        self._processes = (os.cpu_count() or 1) if processes is None else processes
+        self._root = _root(game)
+        self._built = 0
+        self._total = len(self._root._children)
+        self._result = None
+        self._pool = None
+        self._thread = None
+        self._cancelled = threading.Event()
+        self._finished = threading.Event()
+        self._changed = threading.Condition()
+
+    def __call__(self):
+        return self.result()
+
+    def start(self):
+        """Start the build, and return the Warmup."""
+        if self._thread is None and not self._finished.is_set():
+            if self._processes > 1:
+                self._pool = multiprocessing.Pool(min(self._processes, self._total))
+            self._thread = threading.Thread(target=self._build, daemon=True)
+            self._thread.start()
+        return self
+
+    def _build(self):
+        """Build every opening and make the game from them, unless the build is cancelled."""
+        try:
+            for i, buffer in self._openings():
+                if self._cancelled.is_set():
+                    return
+                self._root._children[i] = flattree.FlatTree(buffer).root
+                with self._changed:
+                    self._built += 1
+                    self._changed.notify_all()
+            if not self._cancelled.is_set():
+                self._result = self._game(self._root)
+        finally:
+            self._close()
+            with self._changed:
+                self._finished.set()
+                self._changed.notify_all()
+
+    def _openings(self):
+        """Yield the index of each opening and the buffer of its flat tree, as they are built.
+
+        Results from the pool are waited for POLL seconds at a time, and a build in this
+        process checks for a cancel before every opening, so that a cancelled build stops
+        without waiting for the rest.
+        """
+        tasks = [(i, opening.board, opening.player) for i, opening in enumerate(self._root._children)]
+        if self._pool is None:
+            for task in tasks:
+                if self._cancelled.is_set():
+                    return
+                yield _build_opening(task)
+            return
+
+        results = self._pool.imap_unordered(_build_opening, tasks)
+        for _ in range(self._total):
+            while True:
+                try:
+                    yield results.next(POLL)
+                    break
+                except multiprocessing.TimeoutError:
+                    if self._cancelled.is_set():
+                        return
+
+    def _close(self):
+        """Release the processes of the build, if there are any."""
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+
+    def cancel(self):
+        """Stop the build and release its processes. A build that has finished keeps its game."""
+        if self._finished.is_set():
+            return
+        self._cancelled.set()
+        if self._thread is None:
+            with self._changed:
+                self._finished.set()
+                self._changed.notify_all()
+        else:
+            self._thread.join()
+
+    def result(self, timeout=None):
+        """Wait up to (timeout) seconds, or for as long as it takes, for the build and return the game.
+
+        Return None if the build was cancelled or is still running when the time is up.
+        """
+        self.start()
+        self._finished.wait(timeout)
+        return self._result
+
+    def _wait_progress(self, built, timeout):
+        """Wait up to (timeout) seconds for more than (built) openings to be built, and return the progress."""
+        with self._changed:
+            self._changed.wait_for(lambda: self._built > built or self._finished.is_set(), timeout)
+            return self._built, self._total
+
+    def dialog(self):
+        """Wait for the build while reporting its progress through any gameio backend, and return the game.
+
+        Nothing is reported if the game is already built.
+        """
+        self.start()
+        built, total = self.progress
+        while not self.done:
+            now, total = yield gameio.call(self._wait_progress, built, POLL)
+            if now > built:
+                built = now
+                yield gameio.say("Built " + str(built) + " of " + str(total) + " openings...")
+        return self._result
+
+def main():
+    sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/../tictactoe")
+    from tictactoe import TicTacToe
+
+    start = time.perf_counter()
+    TicTacToe()
+    print("one process: %.2f seconds" % (time.perf_counter() - start))
+
+    start = time.perf_counter()
+    Warmup(TicTacToe).result()
+    print("%d processes: %.2f seconds" % (os.cpu_count() or 1, time.perf_counter() - start))
+
+if __name__ == "__main__":
+    main()
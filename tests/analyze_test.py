@@ -0,0 +1,97 @@
+"""Command-Line TicTacToe Analysis Unit Tests
+
+This script allows the user to perform unit tests on the bulk
+analysis of TicTacToe positions.
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import unittest
+
+import sys
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/../cmdgames/tictactoe")
+import analyze
+import flattree
+import rules
+from tictactoe import TicTacToe
+from variables import PLAYER_ONE as x, PLAYER_TWO as o, EMPTY_SPACE as e
+
+tree = flattree.build()
+analyzer = analyze.Analyzer(tree)
+
+class AnalyzeTests(unittest.TestCase):
+
+    def test_table_matches_search(self):
+        # test that every reachable position is answered the same by the table and by search
+        for i in range(len(tree)):
+            cells = rules.digits(tree._codes[i])
+            expected = analyzer.analyze(cells, tree.mover(i))
+            self.assertTrue(expected["reachable"])
+            actual = analyze._solve(cells, tree.mover(i))
+            self.assertFalse(actual.pop("reachable"))
+            expected.pop("reachable")
+            self.assertEqual(actual, expected)
+
+    def test_state_semantics(self):
+        # test that winners and terminal states agree with TicTacToe._State
+        for board in ([[x,x,x],[o,o,e],[e,e,e]], [[x,o,x],[x,o,o],[o,x,x]], [[x,o,e],[e,e,e],[e,e,e]]):
+            state = TicTacToe._State(board, rules.SYMBOLS[rules.to_move(rules.digits(rules.encode(board)))])
+            result = analyzer.analyze(rules.digits(rules.encode(board)), rules.DIGITS[state.player])
+            self.assertEqual(result["terminal"], state.is_terminal)
+            self.assertEqual(result["winner"], state.winner)
+
+    def test_batch(self):
+        # test the fields that are written for good and bad lines
+        lines = ['{"id": 7, "board": "xx_/oo_/___"}',
+                 '{"board": [["X","X","O"],["O","O","X"],["X"," "," "]], "player": "X"}',
+                 '{"board": "_________", "player": "O"}',
+                 '',
+                 '{"board": "xx"}',
+                 'not json',
+                 '{"board": "#________"}']
+        out = [json.loads(line) for line in analyze.analyze_batch(list(enumerate(lines, 1)), analyzer).splitlines()]
+        self.assertEqual(len(out), 6)
+        self.assertEqual(out[0], {"id": 7, "board": "xx_/oo_/___", "player": x, "value": 1, "best_moves": [2],
+                                  "forced_draw": False, "terminal": False, "winner": None, "reachable": True})
+        self.assertEqual(out[1]["best_moves"], [7, 8])
+        self.assertTrue(out[1]["forced_draw"])
+        self.assertEqual(out[2]["value"], 0)
+        self.assertFalse(out[2]["reachable"])
+        self.assertEqual([r["line"] for r in out[3:]], [5, 6, 7])
+
+    def test_run(self):
+        # test that a file is analyzed in batches, in order, with several processes
+        with tempfile.TemporaryDirectory() as folder:
+            source = os.path.join(folder, "positions.jsonl")
+            sink = os.path.join(folder, "analysis.jsonl")
+            codes = tree._codes[:1000]
+            with open(source, "w", encoding="utf8") as f:
+                for code in codes:
+                    f.write(json.dumps({"board": "".join(rules.SYMBOLS[d] for d in rules.digits(code))}) + "\n")
+
+            parser = argparse.ArgumentParser()
+            analyze.add_arguments(parser)
+            for processes in (1, 2):
+                analyze.run(parser.parse_args([source, "-o", sink, "--batch", "64", "--processes", str(processes)]))
+                with open(sink, encoding="utf8") as f:
+                    out = [json.loads(line) for line in f]
+                self.assertEqual(len(out), len(codes))
+                self.assertEqual([rules.encode([list(r["board"][3*i:3*i+3]) for i in range(3)]) for r in out],
+                                 list(codes))
+                self.assertTrue(all(r["reachable"] for r in out))
+
+    def test_worker(self):
+        # test that a worker answers from the published tree instead of building its own
+        path = analyze.shareddata.publish_games(os.path.join(tempfile.gettempdir(), "analyze-test.dat"))
+        try:
+            analyze._init_worker(path)
+            self.assertIs(analyze._analyzer._tree, analyze.shareddata.tree)
+            self.assertEqual(analyze._analyzer.analyze([0] * rules.CELLS, 1), analyzer.analyze([0] * rules.CELLS, 1))
+        finally:
+            analyze._analyzer = None
+            analyze.shareddata.unpublish(path)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+"""Command-Line TicTacToe Anytime Search Unit Tests
+
+This script allows the user to perform unit tests on the anytime
+search of the TicTacToe agents and their move deadlines.
+"""
+
+import time
+import unittest
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/../cmdgames/tictactoe")
+import anytime
+import parallel
+import flattree
+from agents import FlawedAgent, MCTSAgent, RandomAgent, UnbeatableAgent
+from variables import PLAYER_ONE as x, PLAYER_TWO as o, EMPTY_SPACE as e
+
+tree = flattree.build()
+
+def cells_of(node):
+    return [anytime.rules.DIGITS[s] for row in node.board for s in row]
+
+class AnytimeTests(unittest.TestCase):
+
+    def test_matches_negamax(self):
+        # test that a search with no deadline solves every position like the full negamax
+        search = parallel.ParallelSearch(1)
+        for i in range(len(tree)):
+            node = tree.node(i)
+            if node.is_terminal:
+                continue
+            cells = cells_of(node)
+            player = anytime.rules.DIGITS[node.player]
+            score, moves, depth, nodes, solved = anytime.search(cells, player)
+            self.assertTrue(solved)
+            self.assertGreater(nodes, 0)
+            self.assertEqual((score, moves), search.best_moves(cells, player)[:2])
+
+    def test_deadline(self):
+        # test that a search whose deadline has passed still finishes the first ply
+        score, moves, depth, _, solved = anytime.search([0] * 9, 1, time.monotonic() - 1)
+        self.assertGreaterEqual(depth, 1)
+        self.assertFalse(solved)
+        self.assertTrue(moves)
+        self.assertEqual(anytime.search([1,1,1, 2,2,0, 0,0,0], 2), (0, [], 0, 0, True))
+
+    def test_agents(self):
+        # test that the agents move within a deadline and report their searches
+        for agent in (UnbeatableAgent("1", x), FlawedAgent("1", x), MCTSAgent("1", x, iterations=10 ** 6, seed=1)):
+            state = tree.find([[x,o,e],[e,o,e],[e,e,x]])
+            while agent.last_search is None:
+                start = time.monotonic()
+                child = agent.select_move(state, start + 0.2)
+                self.assertLess(time.monotonic() - start, 1.5)
+                self.assertIn(child.board, [c.board for c in state.children])
+            self.assertGreater(agent.last_search["nodes"], 0)
+            self.assertIsNone(RandomAgent("2", x).last_search)
+
+    def test_unbeatable(self):
+        # test that the agent never loses when every move is searched to the end
+        state = tree.root
+        agent = UnbeatableAgent("1", o)
+        while not state.is_terminal:
+            state = (agent if state.player == o else RandomAgent("2", x)).select_move(state, time.monotonic() + 10)
+        self.assertNotEqual(state.winner, x)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+"""Command-Line TicTacToe Opening Book Unit Tests
+
+This script allows the user to perform unit tests on the opening
+book and the endgame table of the TicTacToe agents.
+"""
+
+import unittest
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/../cmdgames/tictactoe")
+import book
+import flattree
+from agents import FlawedAgent, UnbeatableAgent
+from variables import PLAYER_ONE as x, PLAYER_TWO as o, EMPTY_SPACE as e
+
+tree = flattree.build()
+
+class BookTests(unittest.TestCase):
+
+    def test_opening(self):
+        # test that the shipped book agrees with the solved tree
+        for i in range(len(tree)):
+            node = tree.node(i)
+            outcomes = book.lookup(node.board, node.player)
+            if tree._plies[i] < book.OPENING_PLIES:
+                self.assertIsNotNone(book.opening([book.rules.DIGITS[s] for r in node.board for s in r],
+                                                  book.rules.DIGITS[node.player]))
+            if outcomes is None:
+                continue
+            for child in node._children:
+                move = [r * 3 + c for r in range(3) for c in range(3) if child.board[r][c] != node.board[r][c]][0]
+                self.assertEqual(outcomes[move], {1: book.LOSE, 0: book.DRAW, -1: book.WIN}[tree.value(child.index)])
+
+    def test_endgame(self):
+        # test the endgame table on positions near the end of a game
+        self.assertEqual(book.lookup([[x,x,e],[o,o,e],[e,e,e]], x), None)
+        self.assertEqual(book.lookup([[x,x,e],[o,o,e],[x,o,e]], x), "--W--D--L")
+        self.assertEqual(book.lookup([[x,o,x],[x,o,o],[o,x,x]], o), None)
+
+    def test_agents(self):
+        # test that agents choose only best moves from the book
+        unbeatable = UnbeatableAgent("1", o)
+        flawed = FlawedAgent("2", o)
+        state = tree.find([[x,e,e],[e,e,e],[e,e,e]])
+        for _ in range(20):
+            self.assertEqual(unbeatable.select_move(state).board, [[x,e,e],[e,o,e],[e,e,e]])
+
+        state = tree.find([[x,x,e],[o,o,e],[x,e,e]])
+        for _ in range(20):
+            self.assertEqual(unbeatable._choose_successor(state, 1, -1, 0).board, [[x,x,e],[o,o,o],[x,e,e]])
+            self.assertEqual(flawed._choose_successor(state, 1, 0, 0).board, [[x,x,e],[o,o,o],[x,e,e]])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+"""Command-Line Connect Four Unit Tests
+
+This script allows the user to perform unit tests on the bitboards,
+the solver and the game of Connect Four.
+"""
+
+import random
+import time
+import unittest
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/../cmdgames")
+import gameio
+import gameloader
+
+connectfour = gameloader.load_game("connectfour")
+bitboard = gameloader.load_game("connectfour", "bitboard")
+solver = gameloader.load_game("connectfour", "solver")
+
+x = connectfour.var.PLAYER_ONE
+o = connectfour.var.PLAYER_TWO
+
+def brute_force(position):
+    """Return 1, 0 or -1 if the player to move wins, draws or loses (position) by trying every line of play."""
+    if position.is_terminal:
+        return 0 if position.winner is None else -1
+    return max(-brute_force(position.play(col)) for col in position.columns())
+
+def sign(score):
+    return (score > 0) - (score < 0)
+
+def endgame(rng, moves):
+    """Return a position reached by (moves) random moves that has not ended."""
+    while True:
+        position = bitboard.Position()
+        for _ in range(moves):
+            if position.is_terminal:
+                break
+            position = position.play(rng.choice(position.columns()))
+        if not position.is_terminal:
+            return position
+
+class BitboardTests(unittest.TestCase):
+
+    def test_lines(self):
+        # test that four in a row is found in every direction, and only then
+        self.assertEqual(bitboard.Position.from_moves("1212121").winner, x)
+        self.assertEqual(bitboard.Position.from_moves("1122334").winner, x)
+        self.assertEqual(bitboard.Position.from_moves("12233434474").winner, x)
+        self.assertEqual(bitboard.Position.from_moves("76655454414").winner, x)
+        self.assertIsNone(bitboard.Position.from_moves("123456").winner)
+        self.assertIsNone(bitboard.Position.from_moves("1112223").winner)
+
+    def test_board(self):
+        # test the board, the player to move and the columns that can be played
+        position = bitboard.Position.from_moves("444444")
+        self.assertEqual(position.player, x)
+        self.assertEqual([row[3] for row in position.board], [o, x, o, x, o, x])
+        self.assertNotIn(3, position.columns())
+        self.assertEqual(position.columns()[:2], [2, 4])
+        self.assertEqual(position, bitboard.Position.from_moves("444444"))
+        self.assertEqual(str(position).splitlines()[1], "|   |   |   | O |   |   |   |")
+        with self.assertRaises(ValueError):
+            bitboard.Position.from_moves("4444444")
+
+class SolverTests(unittest.TestCase):
+
+    def test_matches_brute_force(self):
+        # test that solved endgames agree with trying every line of play
+        rng = random.Random(4)
+        search = solver.Solver(table_size=4099)
+        for _ in range(15):
+            position = endgame(rng, 32)
+            col, score, _ = search.best_move(position)
+            value = brute_force(position)
+            self.assertEqual(sign(score), value)
+            self.assertEqual(sign(search.solve(position)), value)
+            self.assertEqual(-brute_force(position.play(col)), value)
+
+    def test_tactics(self):
+        # test that a win is taken and a loss is stopped at any depth
+        search = solver.Solver()
+        col, score, _ = search.best_move(bitboard.Position.from_moves("121212"), max_depth=1)
+        self.assertEqual(col, 0)
+        self.assertEqual(score, solver.WIN + bitboard.CELLS - 7)
+        col, score, _ = search.best_move(bitboard.Position.from_moves("12131"), max_depth=2)
+        self.assertEqual(col, 0)
+
+    def test_time_limit(self):
+        # test that a deepening search stops close to its time limit with a legal move
+        search = solver.Solver()
+        start = time.monotonic()
+        col, _, depth = search.best_move(bitboard.Position(), time_limit=0.3)
+        self.assertLess(time.monotonic() - start, 1.5)
+        self.assertTrue(bitboard.Position().can_play(col))
+        self.assertGreater(depth, 1)
+        self.assertGreater(search.nodes, 0)
+
+    def test_deadline(self):
+        # test that an agent without a time limit stops its search at the deadline and reports it
+        agent = connectfour.agents.SearchAgent("CPU", x)
+        start = time.monotonic()
+        position = agent.select_move(bitboard.Position(), start + 0.3)
+        self.assertLess(time.monotonic() - start, 1.5)
+        self.assertEqual(position.moves, 1)
+        self.assertGreater(agent.last_search["depth"], 1)
+        self.assertGreater(agent.last_search["nodes"], 0)
+
+class ConnectFourTests(unittest.TestCase):
+
+    def test_play(self):
+        # test that a scripted two-player game ends with a win, and that a full column is refused
+        io = gameio.ScriptedIO(["2"] + ["1"] * 7 + ["8", "2", "3", "2", "3", "5", "3", "6", "3", "n"])
+        gameio.run(connectfour.play(delay=0), io)
+        self.assertIn("Sorry, that column is full!", io.output)
+        self.assertIn("Sorry, that is not a valid column", io.output)
+        self.assertIn("Player 2 wins!!", io.output)
+
+    def test_cpu(self):
+        # test that the strongest CPU beats the weakest
+        random.seed(1)
+        game = connectfour.ConnectFour()
+        players = {x: connectfour._choose_ai(1, "CPU_1", x), o: connectfour.agents.SearchAgent("CPU_2", o, max_depth=6)}
+        while not game.is_terminal():
+            game.take_turn(players[game.state.player])
+        self.assertEqual(game.get_winner(), o)
+
+if __name__ == "__main__":
+    unittest.main()
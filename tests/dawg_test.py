@@ -0,0 +1,93 @@
+"""Command-Line Hangman Word Graph Unit Tests
+
+This script allows the user to perform unit tests on the word graph
+of the Hangman dictionary.
+"""
+
+import random
+import unittest
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/../cmdgames")
+import gameio
+import gameloader
+
+hangman = gameloader.load_game("hangman")
+dawg = gameloader.load_game("hangman", "dawg")
+wordindex = gameloader.load_game("hangman", "wordindex")
+
+agent = hangman.agents.HangmanAgent()
+words = sorted(set(hangman.agents.ingest.read_words(hangman.var.DICTIONARY, agent)))
+
+class DawgTests(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.graph = dawg.load(hangman.var.DICTIONARY, agent)
+
+    def test_words(self):
+        # test that the graph holds exactly the words of the dictionary, in order, with their ids
+        self.assertEqual(len(self.graph), len(words))
+        self.assertEqual(list(self.graph.words()), words)
+        for i in range(0, len(words), 7):
+            self.assertEqual(self.graph.word(i), words[i])
+            self.assertEqual(self.graph.index(words[i]), i)
+        self.assertIn("ability", self.graph)
+        self.assertNotIn("abilit", self.graph)
+        self.assertNotIn("abilityz", self.graph)
+        with self.assertRaises(ValueError):
+            self.graph.index("abilit")
+        with self.assertRaises(IndexError):
+            self.graph.word(len(words))
+
+    def test_prefixes(self):
+        # test that the words are enumerated by prefix and by length
+        self.assertTrue(self.graph.has_prefix("abil"))
+        self.assertFalse(self.graph.has_prefix("abx"))
+        self.assertEqual(list(self.graph.words("ab")), [w for w in words if w.startswith("ab")])
+        self.assertEqual(list(self.graph.words("abx")), [])
+        for size in range(1, 16):
+            self.assertEqual(self.graph.words_of_length(size), [w for w in words if len(w) == size])
+
+    def test_case(self):
+        # test that membership can ignore case
+        graph = dawg.build(["AIDS", "Bible", "cat"])
+        self.assertTrue(graph.contains("aids", ignore_case=True))
+        self.assertTrue(graph.contains("bIBLE", ignore_case=True))
+        self.assertFalse(graph.contains("aids"))
+        self.assertFalse(graph.contains("dog", ignore_case=True))
+
+    def test_matches(self):
+        # test that the words matching a pattern agree with a scan of the words
+        rng = random.Random(7)
+        for _ in range(200):
+            word = rng.choice(words)
+            agent._guesses_made = set(rng.sample("abcdefghijklmnopqrstuvwxyz", rng.randrange(8)))
+            pattern = agent._get_pattern(word)
+            expected = [w for w in words if len(w) == len(pattern)
+                        and agent._get_pattern(w).lower() == pattern.lower()]
+            self.assertEqual(self.graph.matches(pattern, agent._guesses_made), expected)
+
+    def test_shared_endings(self):
+        # test that words share the nodes of their endings, and that the graph is smaller than a word index
+        small = dawg.build(["bake", "cake", "lake", "bakes", "cakes", "lakes"])
+        _, _, nodes, edges, _ = dawg.HEADER.unpack_from(small.buffer, 0)
+        self.assertEqual((nodes, edges), (6, 7))
+        many = [a + b + c + "ing" for a in "bcdfg" for b in "aeiou" for c in "lmnrst"]
+        self.assertLess(len(dawg.build(many).buffer), len(wordindex.build(many).buffer) / 2)
+
+    def test_agents(self):
+        # test that the graph can be the dictionary of the agents, and that real words can be required
+        evil = hangman.agents.EvilAgent(self.graph)
+        evil.start_game()
+        self.assertIn(evil.secret_word, words)
+
+        player = hangman.agents.PlayerAgent(self.graph)
+        io = gameio.ScriptedIO(["abilityz", "Ability", "3"])
+        gameio.run(player.start_dialog(), io)
+        self.assertIn("Sorry, that secret word is not a real word.", io.output)
+        self.assertEqual(player.secret_word, "Ability")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+"""Command-Line TicTacToe Flat Tree Unit Tests
+
+This script allows the user to perform unit tests on the
+flat store of the TicTacToe game tree.
+"""
+
+import unittest
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/../cmdgames/tictactoe")
+import flattree
+from agents import UnbeatableAgent
+from tictactoe import TicTacToe
+from variables import PLAYER_ONE as x, PLAYER_TWO as o, EMPTY_SPACE as e
+
+tree = flattree.build()
+
+class FlatTreeTests(unittest.TestCase):
+
+    def test_matches_state(self):
+        # test that every node agrees with the TicTacToe._State of the same board
+        self.assertEqual(len(tree), 5478)
+        for i in range(len(tree)):
+            node = tree.node(i)
+            state = TicTacToe._State(node.board, node.player)
+            state._generate_children()
+            self.assertEqual(node.is_terminal, state.is_terminal)
+            self.assertEqual(node.winner, state.winner)
+            self.assertEqual(sorted(c.board for c in node.children), sorted(c.board for c in state.children))
+            for child in node._children:
+                self.assertGreater(child.index, i)
+                self.assertNotEqual(child.player, node.player)
+
+    def test_incremental(self):
+        # test that checking the lines through the last move agrees with checking every line
+        for i in range(len(tree)):
+            node = tree.node(i)
+            state = TicTacToe._State(node.board, node.player)
+            state._generate_children()
+            for child in state._children:
+                full = TicTacToe._State(child.board, child.player)
+                self.assertEqual((child.is_terminal, child.winner, child._empty),
+                                 (full.is_terminal, full.winner, full._empty))
+                r, c = child._last_move
+                cells = [flattree.rules.DIGITS[s] for row in child.board for s in row]
+                self.assertEqual(flattree.rules.wins_at(cells, r * 3 + c), flattree.rules.winner_of(cells))
+
+    def test_values(self):
+        # test the solved values and forced ties of a few positions
+        self.assertEqual(tree.value(0), 0)
+        self.assertFalse(tree.will_tie(0))
+        self.assertEqual(tree.value(tree.find([[x,x,e],[o,o,e],[e,e,e]]).index), 1)
+        self.assertEqual(tree.value(tree.find([[x,e,e],[e,e,e],[e,e,o]]).index), 1)
+        self.assertEqual(tree.value(tree.find([[x,o,x],[x,o,e],[o,x,e]]).index), 0)
+        self.assertTrue(tree.will_tie(tree.find([[x,o,x],[x,o,o],[o,x,e]]).index))
+        self.assertIsNone(tree.find([[x,x,x],[x,e,e],[e,e,e]]))
+
+    def test_subtree(self):
+        # test that a tree can be built from any board and player
+        small = flattree.build([[x,o,x],[o,x,o],[e,e,e]], x)
+        self.assertEqual(small.root.player, x)
+        self.assertEqual(small.value(0), 1)
+        self.assertEqual(len(small.root.children), 3)
+
+    def test_serialize(self):
+        # test that a tree survives a round trip through bytes
+        copy = flattree.FlatTree(bytes(tree.buffer))
+        self.assertEqual(len(copy), len(tree))
+        self.assertEqual(copy.root, tree.root)
+        self.assertEqual(copy.root.children[0].board in [c.board for c in tree.root.children], True)
+        with self.assertRaises(ValueError):
+            flattree.FlatTree(b"\0" * 64)
+
+    def test_play(self):
+        # test that agents and games run on the flat tree unchanged
+        game = TicTacToe(tree.root)
+        player_1 = UnbeatableAgent("1", x)
+        player_2 = UnbeatableAgent("2", o)
+        for i in range(3):
+            game.start_game()
+            while not game.is_terminal():
+                game.take_turn(player_1)
+                if game.is_terminal():
+                    break
+                game.take_turn(player_2)
+            self.assertIsNone(game.get_winner())
+
+if __name__ == "__main__":
+    unittest.main()
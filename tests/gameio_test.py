@@ -0,0 +1,90 @@
+"""Command-Line Game I/O Unit Tests
+
+This script allows the user to perform unit tests on the dialogs
+and backends that the games talk to users through.
+"""
+
+import asyncio
+import unittest
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/../cmdgames")
+import gameio
+import gameloader
+
+tictactoe = gameloader.load_game("tictactoe")
+hangman = gameloader.load_game("hangman")
+wordindex = gameloader.load_game("hangman", "wordindex")
+
+x = tictactoe.var.PLAYER_ONE
+o = tictactoe.var.PLAYER_TWO
+e = tictactoe.var.EMPTY_SPACE
+
+def _small_game():
+    """Return a TicTacToe game whose tree starts three moves before the end."""
+    root = tictactoe.TicTacToe._State([[x,o,x],[o,x,o],[e,e,e]], x)
+    game = tictactoe.TicTacToe(root)
+    game._generate_tree(root)
+    return game
+
+class _AsyncIO(gameio.ScriptedIO):
+    """A scripted backend whose prompts must be awaited."""
+
+    async def ask(self, prompt):
+        await asyncio.sleep(0)
+        return super().ask(prompt)
+
+class GameIOTests(unittest.TestCase):
+
+    def test_ask_number(self):
+        # test that a number is asked for until it is in range
+        io = gameio.ScriptedIO(["seven", "0", "3"])
+        self.assertEqual(gameio.run(gameio.ask_number("n? ", 1, 3, "no"), io), 3)
+        self.assertEqual(io.output, "n? no\nn? no\nn? ")
+        with self.assertRaises(EOFError):
+            gameio.run(gameio.ask_again(), gameio.ScriptedIO())
+
+    def test_tictactoe(self):
+        # test that a scripted player can win a game of TicTacToe without waiting for the CPU
+        game = _small_game()
+        io = gameio.ScriptedIO(["1", "3", "7", "1", "3", "n"])
+        gameio.run(tictactoe.play(lambda: game), io)
+        self.assertIn("Human, it is your turn!", io.output)
+        self.assertIn("Sorry, that is not a valid column", io.output)
+        self.assertIn("Human wins!!", io.output)
+        self.assertIn("MONTE CARLO", io.output)
+
+        io = gameio.ScriptedIO(["0", "3", "3", "n"])
+        gameio.run(tictactoe.play(lambda: game, levels=3), io)
+        self.assertIn("CPU_1, it is your turn!", io.output)
+        self.assertNotIn("MONTE CARLO", io.output)
+
+    def test_hangman(self):
+        # test that a scripted player can win a game of Hangman
+        io = gameio.ScriptedIO(["1", "2", "a", "a", "7", "b", "c", "n"])
+        gameio.run(hangman.play(wordindex.build(["abc"])), io)
+        self.assertIn("You already guessed that!", io.output)
+        self.assertIn("Sorry, that is not a valid input", io.output)
+        self.assertIn("You win!!", io.output)
+
+    def test_two_player(self):
+        # test that the secret word of a two-player game is asked for as a secret
+        agent = hangman.agents.PlayerAgent()
+        io = gameio.ScriptedIO(["a*", "ab1", "y", "40", "4"])
+        gameio.run(agent.start_dialog(), io)
+        self.assertIn("Sorry, that secret word contained an illegal character.", io.output)
+        self.assertIn("Sorry, that is not a valid number of guesses.", io.output)
+        self.assertEqual(agent.guesses_left, 4)
+        self.assertEqual(agent.secret_word, "ab1")
+        self.assertTrue(agent._is_valid_guess("1"))
+
+    def test_async(self):
+        # test that a dialog can be driven from a coroutine with an asynchronous backend
+        io = _AsyncIO(["1", "2", "a", "b", "c", "n"])
+        asyncio.run(gameio.arun(hangman.play(wordindex.build(["abc"]), two_player=False), io))
+        self.assertIn("You win!!", io.output)
+        self.assertNotIn("How many players?", io.output)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+"""Command-Line Hangman Dictionary Ingestion Unit Tests
+
+This script allows the user to perform unit tests on the streaming
+of word lists into the Hangman game.
+"""
+
+import os
+import tempfile
+import unittest
+
+import sys
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/../cmdgames")
+import gameloader
+
+hangman = gameloader.load_game("hangman")
+ingest = gameloader.load_game("hangman", "ingest")
+
+class IngestTests(unittest.TestCase):
+
+    def setUp(self):
+        self._folder = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self._folder.cleanup()
+
+    def _write(self, text):
+        """Write (text) to a word list and return its path."""
+        path = os.path.join(self._folder.name, "words.txt")
+        with open(path, "w", encoding="utf8") as f:
+            f.write(text)
+        return path
+
+    def test_normalize(self):
+        # test that words are lowercased and their spaces collapsed, so every letter can be guessed
+        self.assertEqual(ingest.normalize("  New   York\n"), "new york")
+        path = self._write("AIDS\nCafé\n")
+        self.assertEqual(list(ingest.read_words(path, hangman.agents.HangmanAgent())), ["aids", "café"])
+
+    def test_empty(self):
+        # test that choosing from a word list with no valid words raises a clear error
+        with self.assertRaises(ValueError):
+            ingest.choose_word([])
+        path = self._write("\n123\n*-*\n")
+        for agent in (hangman.agents.HangmanAgent(path), hangman.agents.EvilAgent(path)):
+            with self.assertRaisesRegex(ValueError, "no valid words"):
+                agent.start_game()
+
+if __name__ == "__main__":
+    unittest.main()
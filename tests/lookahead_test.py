@@ -0,0 +1,99 @@
+"""Command-Line Hangman Lookahead Unit Tests
+
+This script allows the user to perform unit tests on the adversarial
+search of the Expert mode of Hangman.
+"""
+
+import random
+import unittest
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/../cmdgames")
+import gameloader
+
+hangman = gameloader.load_game("hangman")
+oracle = gameloader.load_game("hangman", "oracle")
+lookahead = gameloader.load_game("hangman", "lookahead")
+wordindex = gameloader.load_game("hangman", "wordindex")
+
+WORDS = ["bake", "bike", "cake", "coke", "duke", "fake", "lake", "like", "make", "mike", "poke", "rake", "take", "tike"]
+
+def ids(bits):
+    return [k for k in range(bits.bit_length()) if bits >> k & 1]
+
+def brute_force(words, guessed, depth, cap):
+    """Return the number of wrong guesses that can be forced within (depth) guesses by trying every line of play."""
+    if cap <= 0 or depth == 0 or len(words) == 1:
+        return 0
+    letters = sorted({c for w in words for c in w} - guessed)
+    best = cap if letters else 0
+    for letter in letters:
+        families = {}
+        for w in words:
+            families.setdefault(tuple(i for i, c in enumerate(w) if c == letter), []).append(w)
+        worst = max((0 if key else 1) + brute_force(family, guessed | {letter}, depth - 1, cap - (0 if key else 1))
+                    for key, family in families.items())
+        best = min(best, worst)
+    return best
+
+class LookaheadTests(unittest.TestCase):
+
+    def setUp(self):
+        self.bitsets = oracle.Bitsets(WORDS)
+        self.search = lookahead.Search(self.bitsets, time_limit=5)
+
+    def test_split(self):
+        # test that the families of a guess match the patterns of their words
+        agent = hangman.agents.EvilAgent()
+        agent._guesses_made = {"k", "e"}
+        for letter in "abm":
+            agent._guesses_made.add(letter)
+            expected = {}
+            for w in WORDS:
+                expected.setdefault(agent._get_pattern(w), []).append(w)
+            families = self.search.split(self.bitsets.all, (0, 1), letter)
+            self.assertEqual(sorted(sorted(WORDS[k] for k in ids(words)) for _, words in families),
+                             sorted(expected.values()))
+            self.assertEqual(families[0][0] == (), any(letter not in w for w in WORDS))
+            agent._guesses_made.remove(letter)
+
+    def test_matches_brute_force(self):
+        # test that the pruned and memoized search finds the same values as trying every line of play
+        self.search._deadline = float("inf")
+        rng = random.Random(2)
+        for _ in range(20):
+            words = rng.sample(WORDS, rng.randrange(2, len(WORDS)))
+            bits = sum(1 << WORDS.index(w) for w in words)
+            guessed = {"k", "e"}
+            for depth in range(1, 4):
+                for cap in range(1, 4):
+                    value = self.search._value(bits, (0, 1), self.search.mask(guessed), depth, cap)
+                    self.assertEqual(value, brute_force(words, guessed, depth, cap))
+
+    def test_choose(self):
+        # test that a guess keeps a family that forces the most wrong guesses, even without any time to search
+        revealed, words = self.search.choose(self.bitsets.all, (0, 1, 2, 3), {"a"}, "a", 2)
+        self.assertEqual(revealed, ())
+        self.assertEqual(ids(words), [k for k, w in enumerate(WORDS) if "a" not in w])
+
+        hurried = lookahead.Search(self.bitsets, time_limit=0)
+        revealed, words = hurried.choose(self.bitsets.all, (0, 1, 2, 3), {"k"}, "k", 2)
+        self.assertEqual(revealed, (2,))
+        self.assertEqual(words, self.bitsets.all)
+
+    def test_agent(self):
+        # test that an expert game can be played to the end with a consistent secret word
+        agent = hangman.agents.LookaheadAgent(wordindex.build(WORDS), time_limit=0.1)
+        agent.start_game()
+        self.assertEqual(agent.pattern, "****")
+        for letter in "etaoinsrkbc":
+            if agent.is_terminal():
+                break
+            agent.take_guess(letter)
+        word = agent.secret_word
+        self.assertIn(word, WORDS)
+        self.assertEqual(agent._get_pattern(word), agent.pattern)
+
+if __name__ == "__main__":
+    unittest.main()
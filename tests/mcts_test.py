@@ -0,0 +1,82 @@
+"""Command-Line TicTacToe Monte Carlo Tree Search Unit Tests
+
+This script allows the user to perform unit tests on the Monte
+Carlo tree search and the MCTSAgent.
+"""
+
+import time
+import unittest
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/../cmdgames/tictactoe")
+import mcts
+import flattree
+from agents import MCTSAgent, RandomAgent, UnbeatableAgent
+from tictactoe import TicTacToe
+from variables import PLAYER_ONE as x, PLAYER_TWO as o, EMPTY_SPACE as e
+
+tree = flattree.build()
+
+def play(player_1, player_2, state=tree.root):
+    while not state.is_terminal:
+        state = (player_1 if state.player == player_1.player else player_2).select_move(state)
+    return state.winner
+
+class MCTSTests(unittest.TestCase):
+
+    def test_search(self):
+        # test that the search finds a winning move and a forced block
+        stats = mcts.rollouts([1,1,0, 2,2,0, 0,0,0], 1, iterations=500, seed=1)
+        self.assertEqual(mcts.best_move(stats), 2)
+        stats = mcts.rollouts([1,1,0, 2,0,0, 0,0,0], 2, iterations=2000, seed=1)
+        self.assertEqual(mcts.best_move(stats), 2)
+        self.assertEqual(sum(v for v, _ in stats.values()), 2000)
+
+    def test_merge(self):
+        # test that statistics of several searches add together
+        merged = mcts.merge([{0: (2, 1.0), 4: (3, 1.5)}, {4: (1, 1.0)}])
+        self.assertEqual(merged, {0: (2, 1.0), 4: (4, 2.5)})
+        self.assertEqual(mcts.best_move({0: (2, 1.0), 4: (2, 0.0)}), 0)
+
+    def test_agent(self):
+        # test that the agent holds its own against perfect and random play
+        for seed in range(3):
+            self.assertIsNone(play(MCTSAgent("1", x, iterations=2000, seed=seed), UnbeatableAgent("2", o)))
+            self.assertNotEqual(play(RandomAgent("1", x), MCTSAgent("2", o, iterations=2000, seed=seed)), x)
+
+    def test_reuse(self):
+        # test that the search of the last move is reused for the next one
+        agent = MCTSAgent("1", x, iterations=500, seed=1)
+        agent.select_move(tree.root)
+        reply = next(iter(agent._root.children.values()))
+        self.assertGreater(reply.visits, 0)
+        self.assertIs(agent._find_root(reply.cells[:], reply.player, None), reply)
+        self.assertIsNone(reply.parent)
+
+    def test_deadline(self):
+        # test that every move is tried once, and a move is chosen, when the deadline has already passed
+        stats = mcts.rollouts([1,1,0, 2,2,0, 0,0,0], 1, time_limit=0, seed=1)
+        self.assertEqual(sorted(stats), [2, 5, 6, 7, 8])
+        self.assertEqual(mcts.best_move({}), None)
+        for agent in [MCTSAgent("1", x, seed=1), MCTSAgent("1", x, time_limit=0, seed=1)]:
+            self.assertIn(agent.select_move(tree.root, time.monotonic() - 1), tree.root._children)
+            self.assertEqual(agent.last_search["nodes"], 9)
+
+    def test_processes(self):
+        # test that a search split between processes still plays legal moves
+        agent = MCTSAgent("1", o, iterations=1000, processes=2, seed=1)
+        try:
+            self.assertNotEqual(play(RandomAgent("2", x), agent), x)
+        finally:
+            agent.close()
+
+    def test_partial_tree(self):
+        # test that the agent only chooses moves from the children it is given
+        state = TicTacToe._State([[x,o,x],[o,x,e],[e,e,e]], o)
+        child = TicTacToe._State([[x,o,x],[o,x,o],[e,e,e]], x)
+        state._children.append(child)
+        self.assertIs(MCTSAgent("1", o, iterations=100, seed=1).select_move(state), child)
+
+if __name__ == "__main__":
+    unittest.main()
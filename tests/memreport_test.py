@@ -0,0 +1,49 @@
+"""Command-Line Game Memory Report Unit Tests
+
+This script allows the user to perform unit tests on the memory report.
+"""
+
+import json
+import os
+import tempfile
+import unittest
+
+import sys
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/../cmdgames")
+import memreport
+
+class Leaf:
+    pass
+
+def make_leaves():
+    return [Leaf() for _ in range(1000)], ["word " + str(i) for i in range(2000)]
+
+class MemoryReportTests(unittest.TestCase):
+
+    def test_measure(self):
+        # test that retained objects are counted by type, including strings that the garbage collector
+        # does not track, and that their memory is traced to its line
+        result = memreport.measure(make_leaves)
+        self.assertGreaterEqual(result["objects"]["Leaf"], 1000)
+        self.assertGreaterEqual(result["objects"]["str"], 1000)
+        self.assertGreater(result["peak_bytes"], 0)
+        self.assertGreaterEqual(result["peak_bytes"], result["retained_bytes"])
+        self.assertTrue(result["hotspots"][0]["line"].startswith("tests/memreport_test.py:"))
+
+    def test_write_report(self):
+        # test that a report is written as JSON with one entry per scenario
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "report.json")
+            memreport.write_report(path, [("setup", make_leaves, len)])
+            with open(path, encoding="utf8") as f:
+                report = json.load(f)
+        self.assertEqual(list(report["scenarios"]), ["setup"])
+        self.assertNotIn("Leaf", report["scenarios"]["setup"]["objects"])
+
+    def test_scenarios(self):
+        # test the names of the built-in scenarios
+        self.assertEqual([name for name, _, _ in memreport._scenarios()],
+                         ["tictactoe_tree", "tictactoe_game", "hangman_evil"])
+
+if __name__ == "__main__":
+    unittest.main()
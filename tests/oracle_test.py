@@ -0,0 +1,65 @@
+"""Command-Line Hangman Oracle Unit Tests
+
+This script allows the user to perform unit tests on the oracle
+that answers which words of a dictionary fit a game of Hangman.
+"""
+
+import random
+import unittest
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/../cmdgames")
+import gameloader
+
+hangman = gameloader.load_game("hangman")
+oracle = gameloader.load_game("hangman", "oracle")
+wordindex = gameloader.load_game("hangman", "wordindex")
+
+agent = hangman.agents.HangmanAgent()
+index = wordindex.load(hangman.var.DICTIONARY, agent)
+
+def scan(pattern, guessed):
+    """Return the words of the index that match (pattern) after (guessed) by checking every word."""
+    agent._guesses_made = set(guessed)
+    return [w for w in index.words_of_length(len(pattern)) if agent._get_pattern(w).lower() == pattern.lower()]
+
+class OracleTests(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.oracle = oracle.Oracle(index)
+
+    def test_matches_scan(self):
+        # test that the oracle agrees with a scan of the words for patterns taken from real games
+        rng = random.Random(5)
+        for _ in range(200):
+            word = index.choose_word(rng)
+            guessed = set(rng.sample("abcdefghijklmnopqrstuvwxyz", rng.randrange(8)))
+            agent._guesses_made = guessed
+            pattern = agent._get_pattern(word)
+            expected = scan(pattern, guessed)
+            answer = self.oracle.query(pattern, guessed, sample=3)
+            self.assertIn(word, expected)
+            self.assertEqual(answer["count"], len(expected))
+            self.assertEqual(answer["sample"], expected[:3])
+            self.assertEqual(self.oracle.matches(pattern, guessed), expected)
+
+            for letter, n in answer["frequencies"].items():
+                self.assertNotIn(letter, guessed)
+                self.assertEqual(n, sum(letter in w.lower() for w in expected))
+
+    def test_frequencies(self):
+        # test that the letters are counted from most to least common
+        small = oracle.Oracle(wordindex.build(["cat", "cot", "cut", "dog", "ice cream"]))
+        answer = small.query("c*t", "c")
+        self.assertEqual(answer, {"count": 3, "sample": ["cat", "cot", "cut"],
+                                  "frequencies": {"a": 1, "o": 1, "u": 1}})
+        self.assertEqual(small.query("***", "c")["sample"], ["dog"])
+        self.assertEqual(small.query("***", "")["frequencies"]["c"], 3)
+        self.assertEqual(small.matches("***_*****", "z"), ["ice cream"])
+        self.assertEqual(small.query("c**", "cat")["count"], 0)
+        self.assertEqual(small.query("*****", "")["count"], 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+"""Command-Line TicTacToe Parallel Search Unit Tests
+
+This script allows the user to perform unit tests on the parallel
+negamax search of the TicTacToe agents.
+"""
+
+import multiprocessing
+import unittest
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/../cmdgames/tictactoe")
+import parallel
+import retrograde
+import flattree
+from agents import RandomAgent, UnbeatableAgent
+from variables import PLAYER_ONE as x, PLAYER_TWO as o, EMPTY_SPACE as e
+
+tree = flattree.build()
+
+def cells_of(node):
+    return [parallel.rules.DIGITS[s] for row in node.board for s in row]
+
+class ParallelTests(unittest.TestCase):
+
+    def test_matches_retrograde(self):
+        # test that the best moves agree with the quickest wins and slowest losses of the solution
+        search = parallel.ParallelSearch(1)
+        labels = {p: retrograde.solve(tree.root, p) for p in (x, o)}
+        for i in range(len(tree)):
+            node = tree.node(i)
+            if node.is_terminal:
+                continue
+            cells = cells_of(node)
+            score, moves, nodes = search.best_moves(cells, parallel.rules.DIGITS[node.player])
+            value, distance = labels[node.player][retrograde.key(node)]
+            self.assertEqual(score, value * (cells.count(0) - distance + 1))
+            self.assertGreater(nodes, 0)
+
+            expected = []
+            for child in node._children:
+                if labels[node.player][retrograde.key(child)] == (value, distance - 1):
+                    expected.extend(j for j, d in enumerate(cells_of(child)) if d != cells[j])
+            self.assertEqual(moves, sorted(expected))
+
+    def test_processes(self):
+        # test that splitting the root between processes gives the same answer
+        single = parallel.ParallelSearch(1)
+        split = parallel.ParallelSearch(3)
+        try:
+            for board in ([0]*9, [1,0,0, 0,0,0, 0,0,0], [1,1,0, 2,2,0, 0,0,0], [1,0,0, 0,2,0, 0,0,1]):
+                player = parallel.rules.to_move(board)
+                self.assertEqual(split.best_moves(board, player)[:2], single.best_moves(board, player)[:2])
+            self.assertEqual(split.best_moves([1,1,1, 2,2,0, 0,0,0], 2), (0, [], 0))
+        finally:
+            split.close()
+
+    def test_start_method(self):
+        # test that workers of a module loaded by the game loader are forked, and others use the default start method
+        gameloader = parallel.gameloader
+        private = gameloader.load_game("tictactoe", "parallel")
+        context = gameloader.pool_context(private._init_worker, private._score_move)
+        if "fork" in multiprocessing.get_all_start_methods():
+            self.assertEqual(context.get_start_method(), "fork")
+            search = private.ParallelSearch(2)
+            try:
+                self.assertEqual(search.best_moves([1,1,0, 2,2,0, 0,0,0], 1)[:2], (5, [2]))
+            finally:
+                search.close()
+        else:
+            self.assertIsNone(context)
+            self.assertEqual(private.ParallelSearch(2).processes, 1)
+        context = gameloader.pool_context(parallel._init_worker, parallel._score_move)
+        self.assertEqual(context.get_start_method(), multiprocessing.get_start_method())
+
+    def test_agent(self):
+        # test that the agent plays perfectly with a process pool
+        agent = UnbeatableAgent("1", o, processes=2)
+        try:
+            for _ in range(3):
+                state = tree.root
+                while not state.is_terminal:
+                    state = (agent if state.player == o else RandomAgent("2", x)).select_move(state)
+                self.assertNotEqual(state.winner, x)
+        finally:
+            agent.close()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+"""Command-Line Game Records Unit Tests
+
+This script allows the user to perform unit tests on the log of
+recorded games.
+"""
+
+import os
+import tempfile
+import unittest
+
+import sys
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/../cmdgames")
+import gameio
+import gameloader
+import records
+
+tictactoe = gameloader.load_game("tictactoe")
+hangman = gameloader.load_game("hangman")
+wordindex = gameloader.load_game("hangman", "wordindex")
+
+x = tictactoe.var.PLAYER_ONE
+o = tictactoe.var.PLAYER_TWO
+e = tictactoe.var.EMPTY_SPACE
+
+class RecordsTests(unittest.TestCase):
+
+    def setUp(self):
+        self._folder = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._folder.name, "games.rec")
+
+    def tearDown(self):
+        recorder = records.use(None)
+        if recorder is not None:
+            recorder.close()
+        self._folder.cleanup()
+
+    def test_encoding(self):
+        # test that games survive being encoded, with moves packed two to a byte
+        record = records.encode_tictactoe(0, 1, [4, 0, 8, 2, 6])
+        self.assertEqual(len(record), 7)
+        self.assertEqual(records.decode(record), {"game": "tictactoe", "root": 0, "player": 1, "moves": [4, 0, 8, 2, 6]})
+        self.assertEqual(records.decode(records.encode_tictactoe(637, 2, []))["player"], 2)
+
+        index = wordindex.build(["cat", "dog"])
+        record = records.encode_hangman("dog", ["o", "7", "é"], 5, index)
+        self.assertEqual(records.decode(record, index),
+                         {"game": "hangman", "allowed": 5, "word_id": 1, "word": "dog", "guesses": ["o", "7", "é"]})
+        record = records.encode_hangman("emu", ["u"], 7, index)
+        self.assertEqual(records.decode(record), {"game": "hangman", "allowed": 7, "word": "emu", "guesses": ["u"]})
+
+        # test that secret words longer than a byte can count survive, whatever their characters
+        for word in ["é" * 200, "ü" * 70000]:
+            record = records.encode_hangman(word, ["é"], 6)
+            self.assertEqual(records.decode(record), {"game": "hangman", "allowed": 6, "word": word, "guesses": ["é"]})
+
+    def test_word_ids(self):
+        # test that the ids of a word index are looked up once for every game recorded with it
+        index = wordindex.build(["cat", "dog", "emu"])
+        records.encode_hangman("dog", ["o"], 5, index)
+        hits = records._word_ids.cache_info().hits
+        record = records.encode_hangman("emu", ["u"], 5, index)
+        self.assertEqual(records._word_ids.cache_info().hits, hits + 1)
+        self.assertEqual(records.decode(record, index)["word_id"], 2)
+
+    def test_batches(self):
+        # test that records are written a batch at a time and looked up by number
+        recorder = records.Recorder(self.path, batch=3)
+        for i in range(4):
+            recorder.append(records.encode_tictactoe(0, 1, list(range(i + 1))))
+        with records.GameLog(self.path) as log:
+            self.assertEqual(len(log), 3)
+        recorder.close()
+
+        with records.Recorder(self.path) as recorder:
+            recorder.append(records.encode_hangman("emu", ["e"], 7))
+        with records.GameLog(self.path) as log:
+            self.assertEqual(len(log), 5)
+            self.assertEqual(log.game(3)["moves"], [0, 1, 2, 3])
+            self.assertEqual(log.replay(4), ["***", "e**"])
+            with self.assertRaises(IndexError):
+                log.game(5)
+
+    def test_games(self):
+        # test that finished games are recorded as they are played, and only once the process records
+        root = tictactoe.TicTacToe._State([[x,o,x],[o,x,o],[e,e,e]], x)
+        game = tictactoe.TicTacToe(root)
+        game._generate_tree(root)
+        gameio.run(tictactoe.play(lambda: game), gameio.ScriptedIO(["0", "1", "1", "n"]))
+
+        records.configure(self.path)
+        gameio.run(tictactoe.play(lambda: game), gameio.ScriptedIO(["1", "3", "1", "3", "n"]))
+        index = wordindex.build(["abc"])
+        gameio.run(hangman.play(index), gameio.ScriptedIO(["1", "2", "z", "a", "b", "c", "n"]))
+        records.use(None).close()
+
+        with records.GameLog(self.path, index) as log:
+            self.assertEqual(len(log), 2)
+            self.assertEqual(log.game(0)["root"], 637)
+            self.assertEqual(log.replay(0)[1][6], 1)
+            self.assertEqual(log.game(1), {"game": "hangman", "allowed": 7, "word_id": 0, "word": "abc",
+                                           "guesses": ["z", "a", "b", "c"]})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+"""Command-Line Game Renderer Unit Tests
+
+This script allows the user to perform unit tests on the frames
+and sinks that draw the screens of the games.
+"""
+
+import io
+import os
+import unittest
+
+import sys
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/../cmdgames")
+import render
+import gameloader
+
+tictactoe = gameloader.load_game("tictactoe")
+hangman = gameloader.load_game("hangman")
+
+class _CountingStream(io.StringIO):
+    """A stream that counts its writes."""
+    writes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return super().write(text)
+
+class RenderTests(unittest.TestCase):
+
+    def tearDown(self):
+        render.use(None)
+
+    def test_frame(self):
+        # test that frames lay out lines like print() would
+        frame = render.Frame().blank(2).add("a", 1, [2]).add("b\nc").blank()
+        self.assertEqual(frame.lines, ["", "", "a 1 [2]", "b", "c", ""])
+        self.assertEqual(str(frame), "\n\na 1 [2]\nb\nc\n\n")
+
+    def test_stream_sink(self):
+        # test that a whole frame is written at once
+        stream = _CountingStream()
+        render.use(render.StreamSink(stream))
+        render.show(render.Frame().add("one").add("two").add("three"))
+        self.assertEqual(stream.getvalue(), "one\ntwo\nthree\n")
+        self.assertEqual(stream.writes, 1)
+
+    def test_null_sink(self):
+        # test that the null sink draws nothing
+        render.configure(render.NONE)
+        stream = io.StringIO()
+        sys.stdout, saved = stream, sys.stdout
+        try:
+            render.show(render.Frame().add("hidden"))
+        finally:
+            sys.stdout = saved
+        self.assertEqual(stream.getvalue(), "")
+        with self.assertRaises(ValueError):
+            render.configure("color")
+
+    def test_ansi_sink(self):
+        # test that only the lines that changed are repainted
+        stream = io.StringIO()
+        sink = render.AnsiSink(stream)
+        sink.show(render.Frame().add("board").add("guesses: a").add("word: _a_"))
+        self.assertTrue(stream.getvalue().startswith(render.CLEAR_SCREEN))
+
+        stream.seek(0)
+        stream.truncate()
+        sink.show(render.Frame().add("board").add("guesses: a, b").add("word: _a_"))
+        text = stream.getvalue()
+        self.assertIn("\x1b[2;1H" + render.CLEAR_LINE + "guesses: a, b", text)
+        self.assertNotIn("board", text)
+        self.assertNotIn("word", text)
+        self.assertTrue(text.endswith("\x1b[4;1H" + render.CLEAR_BELOW))
+
+    def test_game_frames(self):
+        # test the frames of both games
+        game = tictactoe.TicTacToe(tictactoe.TicTacToe._State(
+            [[tictactoe.var.EMPTY_SPACE] * 3 for _ in range(3)], tictactoe.var.PLAYER_ONE))
+        frame = tictactoe._turn_frame(game, tictactoe.agents.RandomAgent("CPU", tictactoe.var.PLAYER_ONE))
+        self.assertEqual(frame.lines[:2], ["", ""])
+        self.assertEqual("\n".join(frame.lines[2:-2]), str(game.state))
+        self.assertEqual(frame.lines[-1], "CPU, it is your turn!")
+
+        agent = hangman.agents.HangmanAgent()
+        agent.start_game()
+        lines = hangman._status_frame(agent).lines
+        self.assertEqual(lines[2], "guesses left: "+str(agent.guesses_left))
+        self.assertEqual(lines[4], "current word : "+agent.pattern)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+"""Command-Line TicTacToe Retrograde Solver Unit Tests
+
+This script allows the user to perform unit tests on the retrograde
+solver of the TicTacToe agents.
+"""
+
+import unittest
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/../cmdgames/tictactoe")
+import retrograde
+import flattree
+from agents import UnbeatableAgent
+from variables import PLAYER_ONE as x, PLAYER_TWO as o, EMPTY_SPACE as e
+
+tree = flattree.build()
+
+class RetrogradeTests(unittest.TestCase):
+
+    def test_values(self):
+        # test that the solution agrees with the solved tree
+        labels = retrograde.solve(tree.root, x)
+        self.assertEqual(len(labels), len(tree))
+        for i in range(len(tree)):
+            node = tree.node(i)
+            score, distance = labels[retrograde.key(node)]
+            self.assertEqual(score, tree.value(i) if node.player == x else -tree.value(i))
+            self.assertEqual(distance == 0, node.is_terminal)
+        self.assertEqual(labels[retrograde.key(tree.root)], (0, 9))
+
+    def test_distances(self):
+        # test distances on positions that are won or lost
+        labels = retrograde.solve(tree.root, o)
+        self.assertEqual(labels[retrograde.key(tree.find([[o,o,e],[x,x,e],[x,e,e]]))], (1, 1))
+        self.assertEqual(labels[retrograde.key(tree.find([[x,e,e],[e,o,e],[e,e,x]]))], (0, 6))
+        self.assertEqual(labels[retrograde.key(tree.find([[x,x,e],[o,e,e],[o,e,e]]))], (-1, 1))
+        self.assertEqual(labels[retrograde.key(tree.find([[x,e,e],[e,e,e],[e,e,e]]))], (0, 8))
+
+    def test_agents(self):
+        # test that agents win as quickly and lose as slowly as they can
+        agents = {x: UnbeatableAgent("1", x), o: UnbeatableAgent("2", o)}
+        labels = {p: retrograde.solve(tree.root, p) for p in agents}
+        for i in range(len(tree)):
+            node = tree.node(i)
+            if node.is_terminal:
+                continue
+            player = node.player
+            score, distance = labels[player][retrograde.key(node)]
+            child = agents[player].select_move(node)
+            self.assertEqual(labels[player][retrograde.key(child)], (score, distance - 1))
+
+if __name__ == "__main__":
+    unittest.main()
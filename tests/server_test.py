@@ -0,0 +1,93 @@
+"""Command-Line Game Server Unit Tests
+
+This script allows the user to perform unit tests on the
+Command-Line Game Server with local clients.
+"""
+
+import asyncio
+import concurrent.futures
+import unittest
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/../cmdgames")
+import server
+
+x = server.tictactoe.var.PLAYER_ONE
+o = server.tictactoe.var.PLAYER_TWO
+e = server.tictactoe.var.EMPTY_SPACE
+
+def _small_tree():
+    """Return a TicTacToe game whose tree starts three moves before the end."""
+    root = server.tictactoe.TicTacToe._State([[x,o,x],[o,x,o],[e,e,e]], x)
+    game = server.tictactoe.TicTacToe(root)
+    game._generate_tree(root)
+    return game
+
+async def _play(port, lines):
+    """Connect to the server on (port), send (lines) and return everything the server sent back."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(("\n".join(lines) + "\n").encode("utf8"))
+    writer.write_eof()
+    await writer.drain()
+    ret = (await reader.read()).decode("utf8")
+    writer.close()
+    await writer.wait_closed()
+    return ret
+
+class GameServerTests(unittest.TestCase):
+
+    def _run_clients(self, scripts, store=None, executor=None):
+        """Run one client per script against a fresh server, whose sessions are kept in (store)
+        and whose agents work in (executor) if they are given, and return their transcripts."""
+        async def run():
+            game_server = server.GameServer(_small_tree(), server.wordindex.build(["abc"]), executor, store)
+            listener = await game_server.start("127.0.0.1", 0)
+            port = listener.sockets[0].getsockname()[1]
+            async with listener:
+                ret = await asyncio.gather(*(_play(port, script) for script in scripts))
+            self.assertEqual(game_server.sessions, 0)
+            return ret
+        return asyncio.run(run())
+
+    def test_tictactoe(self):
+        # test that a remote player can win a game of TicTacToe and leave
+        output, = self._run_clients([["0", "1", "3", "1", "3", "n", "x"]])
+        self.assertIn("Human, it is your turn!", output)
+        self.assertIn("Human wins!!", output)
+        self.assertTrue(output.rstrip().endswith("Goodbye!"))
+
+    def test_tictactoe_cpu(self):
+        # test that the CPU takes its turn through the executor and that leaving mid-game is handled
+        output, = self._run_clients([["0", "1", "3", "5", "2", "3"]])
+        self.assertIn("Sorry, that is not a valid column", output)
+        self.assertIn("CPU, it is your turn!", output)
+        self.assertEqual(output.count("Human, it is your turn!"), 2)
+
+    def test_hangman(self):
+        # test that a remote player can win a game of Hangman
+        output, = self._run_clients([["1", "2", "a", "a", "7", "b", "c", "n", "x"]])
+        self.assertIn("You already guessed that!", output)
+        self.assertIn("Sorry, that is not a valid input", output)
+        self.assertIn("You win!!", output)
+        self.assertIn("The word was abc.", output)
+
+    def test_concurrent(self):
+        # test that many sessions can be played at the same time in one process
+        scripts = [["0", "1", "3", "1", "3", "n", "x"], ["1", "2", "a", "b", "c", "n", "x"]] * 100
+        outputs = self._run_clients(scripts)
+        for i, output in enumerate(outputs):
+            self.assertIn("Human wins!!" if i % 2 == 0 else "You win!!", output)
+
+    def test_idle_sessions(self):
+        # test that sessions moved to disk while their players are idle go on where they stopped
+        scripts = [["0", "1", "3", "1", "3", "n", "x"], ["1", "3", "a", "b", "c", "n", "x"]] * 20
+        with concurrent.futures.ThreadPoolExecutor() as executor:
+            with server.sessions.SessionStore(capacity=2, executor=executor) as store:
+                outputs = self._run_clients(scripts, store, executor)
+                self.assertEqual((store.resident, store.suspended), (0, 0))
+        for i, output in enumerate(outputs):
+            self.assertIn("Human wins!!" if i % 2 == 0 else "You win!!", output)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,167 @@
+"""Command-Line Game Sessions Unit Tests
+
+This script allows the user to perform unit tests on the compact
+states of games and on the store that moves idle sessions to disk.
+"""
+
+import asyncio
+import concurrent.futures
+import gc
+import os
+import random
+import unittest
+
+import sys
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/../cmdgames")
+import gameio
+import gameloader
+import sessions
+
+tictactoe = gameloader.load_game("tictactoe")
+hangman = gameloader.load_game("hangman")
+wordindex = gameloader.load_game("hangman", "wordindex")
+
+WORDS = ["bake", "bike", "cake", "coke", "duke", "fake", "lake", "like", "make", "mike", "poke", "rake",
+         "take", "tike", "at", "it", "cat"]
+
+x = tictactoe.var.PLAYER_ONE
+o = tictactoe.var.PLAYER_TWO
+e = tictactoe.var.EMPTY_SPACE
+
+class _Kept:
+    """An object that counts how often it is suspended and resumed."""
+
+    def __init__(self, value):
+        self.value = value
+        self.suspends = 0
+
+    def suspend(self):
+        self.suspends += 1
+        ret, self.value = self.value.encode("utf8"), None
+        return ret
+
+    def resume(self, data):
+        self.value = str(data, "utf8")
+
+class _CountingStore(sessions.SessionStore):
+    """A store that counts how often it moves a session to disk."""
+
+    count = 0
+
+    def _suspend(self, session):
+        self.count += 1
+        super()._suspend(session)
+
+class SessionsTests(unittest.TestCase):
+
+    def test_encoding(self):
+        # test that bitsets and Hangman states survive being encoded
+        self.assertEqual(sessions.members(sessions.bitset([0, 3, 17])), [0, 3, 17])
+        self.assertEqual(sessions.bitset([]), 0)
+        data = sessions.encode_hangman(5, ["a", "é"], "*a**", sessions.bitset([2, 9]))
+        self.assertEqual(sessions.decode_hangman(data), (5, ["a", "é"], "*a**", sessions.bitset([2, 9])))
+        data = sessions.encode_hangman(7, [], "***", ["cat", "dog"])
+        self.assertEqual(sessions.decode_hangman(data), (7, [], "***", ["cat", "dog"]))
+
+    def test_hangman(self):
+        # test that every agent goes on with the same remaining words after it is suspended
+        random.seed(3)
+        index = wordindex.build(WORDS)
+        for make in (hangman.agents.HangmanAgent, hangman.agents.EvilAgent, hangman.agents.HelpAgent,
+                     hangman.agents.LookaheadAgent):
+            for dictionary in (index, os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "cmdgames",
+                                                   "hangman", "dictionary.txt")):
+                agent = make(dictionary)
+                agent.start_game()
+                for guess in "ek":
+                    if not agent.is_terminal():
+                        agent.take_guess(guess)
+                before = (agent.pattern, agent.guesses_left, agent.guesses_made)
+
+                data = agent.suspend()
+                self.assertIsNone(agent._secret_word)
+                agent.resume(data)
+                self.assertEqual((agent.pattern, agent.guesses_left, agent.guesses_made), before)
+                self.assertEqual(agent.suspend(), data)
+                agent.resume(data)
+                if not agent.is_terminal():
+                    agent.take_guess("a")
+
+    def test_tictactoe(self):
+        # test that a game returns to its state and that agents forget their solutions
+        root = tictactoe.TicTacToe._State([[x,o,x],[o,x,o],[e,e,e]], x)
+        game = tictactoe.TicTacToe(root)
+        game._generate_tree(root)
+        agent = tictactoe.agents.UnbeatableAgent("CPU", x)
+        game.take_turn(agent)
+        state, moves = game.state, list(game._moves)
+        self.assertTrue(agent._solutions)
+
+        data = game.suspend()
+        self.assertLessEqual(len(data), 6)
+        self.assertEqual(agent.suspend(), b"")
+        self.assertEqual(agent._solutions, {})
+        game.resume(data)
+        self.assertIs(game.state, state)
+        self.assertEqual(game._moves, moves)
+
+    def test_store(self):
+        # test that the sessions idle the longest are moved to disk and read back when they are restored
+        with sessions.SessionStore(capacity=1) as store:
+            first, second = store.open(), store.open()
+            kept = [_Kept("one"), _Kept("two")]
+            store.keep(first, kept[0])
+            store.keep(second, kept[1])
+
+            store.idle(first)
+            self.assertEqual((store.resident, store.suspended), (1, 1))
+            self.assertIsNone(kept[0].value)
+            self.assertEqual(os.listdir(store.folder), ["0" + sessions.SUFFIX])
+
+            store.restore(first)
+            self.assertEqual(kept[0].value, "one")
+            self.assertEqual(os.listdir(store.folder), [])
+            store.idle(second)
+            self.assertEqual((kept[0].value, kept[1].value), ("one", None))
+            store.discard(second)
+            self.assertEqual((store.resident, store.suspended, os.listdir(store.folder)), (1, 0, []))
+            folder = store.folder
+        self.assertFalse(os.path.exists(folder))
+
+    def test_weak(self):
+        # test that the store does not keep the objects of a session alive while it is on disk
+        with sessions.SessionStore(capacity=0) as store:
+            session = store.open()
+            kept = [_Kept("one"), _Kept("two")]
+            store.keep(session, kept[0])
+            store.keep(session, kept[1])
+            store.idle(session)
+            del kept[0]
+            gc.collect()
+            store.restore(session)
+            self.assertEqual(kept[0].value, "two")
+
+    def test_dialog(self):
+        # test that a dialog goes on after its game has been moved to disk between every guess,
+        # whether the files are read and written at once or in an executor
+        async def run(executor):
+            with _CountingStore(capacity=0, executor=executor) as store:
+                session = store.open()
+                io = sessions.SessionIO(_AsyncIO(["3", "z", "a", "b", "c", "n"]), store, session)
+                await gameio.arun(hangman.play(wordindex.build(["abc", "xyz"]), two_player=False), io)
+                self.assertEqual((store.resident, store.suspended), (1, 0))
+                return io.output, store.count
+        with concurrent.futures.ThreadPoolExecutor(1) as executor:
+            for output, count in [asyncio.run(run(None)), asyncio.run(run(executor))]:
+                self.assertIn("You win!!", output)
+                self.assertEqual(count, 6)
+
+class _AsyncIO(gameio.ScriptedIO):
+    """A scripted backend whose prompts must be awaited."""
+
+    async def ask(self, prompt):
+        await asyncio.sleep(0)
+        return super().ask(prompt)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+"""Command-Line Game Shared Data Unit Tests
+
+This script allows the user to perform unit tests on the data that
+the games publish for worker processes.
+"""
+
+import multiprocessing
+import os
+import tempfile
+import time
+import unittest
+
+import sys
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/../cmdgames")
+import shareddata
+
+def _worker_task(code):
+    """Return what a worker process can see of the shared data."""
+    return shareddata.table.best_moves(code), len(shareddata.words), len(shareddata.tree)
+
+def _worker_startup(path):
+    """Return how long a worker process takes to attach to the shared data."""
+    start = time.perf_counter()
+    shareddata.init_worker(path)
+    return time.perf_counter() - start
+
+class SharedDataTests(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.path = shareddata.publish_games(os.path.join(cls.directory.name, "games.dat"))
+
+    @classmethod
+    def tearDownClass(cls):
+        shareddata.unpublish(cls.path)
+        cls.directory.cleanup()
+
+    def test_sections(self):
+        # test that sections are written and read back aligned and intact
+        path = shareddata.publish({"a": b"xyz", "b": bytes(range(10))}, os.path.join(self.directory.name, "ab.dat"))
+        data = shareddata.attach(path)
+        self.assertEqual(data.names, ["a", "b"])
+        self.assertEqual(bytes(data.section("a")), b"xyz")
+        self.assertEqual(bytes(data.section("b")), bytes(range(10)))
+        self.assertTrue(data.section("b").readonly)
+        data.close()
+        shareddata.unpublish(path)
+
+    def test_games(self):
+        # test that the published games match freshly built data
+        data, table, tree, words = shareddata.attach_games(self.path)
+        solved = shareddata.gameloader.load_game("tictactoe", "solved")
+        self.assertEqual(bytes(data.section(shareddata.TICTACTOE)), solved.solve())
+        self.assertEqual(table.value(0), 0)
+        self.assertEqual(len(tree), 5478)
+        self.assertEqual(len(words), 2995)
+        self.assertTrue(all(len(w) == 5 for w in words.words_of_length(5)))
+        del table, tree, words
+        data.close()
+
+    def test_workers(self):
+        # test that worker processes attach to one copy of the data and see the same values
+        context = multiprocessing.get_context("spawn")
+        with context.Pool(2, initializer=shareddata.init_worker, initargs=(self.path,)) as pool:
+            results = pool.map(_worker_task, [0, 1])
+        self.assertEqual(results[0][0], list(range(9)))
+        self.assertEqual(results[1][0], [4])
+        self.assertEqual(results[0][1:], results[1][1:])
+
+        with context.Pool(1) as pool:
+            self.assertLess(pool.apply(_worker_startup, (self.path,)), 0.5)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -8,13 +8,11 @@ import unittest
 
 import sys
 import os
-sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/../src/tictactoe")
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/../cmdgames/tictactoe")
 from agents import PlayerAgent, RandomAgent, FlawedAgent, UnbeatableAgent
 from tictactoe import TicTacToe
 from variables import PLAYER_ONE as x, PLAYER_TWO as o, EMPTY_SPACE as e
 
-test_game = TicTacToe()
-
 ex0 = [[e,e,e],[e,e,e],[e,e,e]], x
 
 ex00 = [[x,e,e],[e,e,e],[e,e,e]], o
@@ -147,6 +145,11 @@ ex10b = ([[x,o,x],[e,o,e],[x,o,e]], x)
 
 class UnbeatableAgentTests(unittest.TestCase):
     # the unbeatable agent should use a minmax tree to optimize its play
+
+    @classmethod
+    def setUpClass(cls):
+        cls.test_game = TicTacToe()
+
     def test_basic(self):
         # test 0: basic functionality
         player_1 = UnbeatableAgent("1",x)
@@ -175,14 +178,14 @@ class UnbeatableAgentTests(unittest.TestCase):
         player_2 = UnbeatableAgent("2",o)
         for i in range(20):
             
-            test_game.start_game()
-            while not test_game.is_terminal():
-                test_game.take_turn(player_1)
-                if (test_game.is_terminal()):
+            self.test_game.start_game()
+            while not self.test_game.is_terminal():
+                self.test_game.take_turn(player_1)
+                if (self.test_game.is_terminal()):
                     break
-                test_game.take_turn(player_2)
+                self.test_game.take_turn(player_2)
         
-            if test_game.get_winner() is not None:
+            if self.test_game.get_winner() is not None:
                 loss += 1
 
         self.assertTrue(loss == 0)
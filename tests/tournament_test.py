@@ -0,0 +1,94 @@
+"""Command-Line TicTacToe Tournament Unit Tests
+
+This script allows the user to perform unit tests on the
+tournaments between the TicTacToe agents.
+"""
+
+import json
+import os
+import tempfile
+import unittest
+
+import sys
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/../cmdgames/tictactoe")
+import tournament
+
+def game(round_number, x, o, result):
+    return {"id": "{:04d}-{}-{}".format(round_number, x, o), "round": round_number, "x": x, "o": o,
+            "result": result, "plies": 9}
+
+class TournamentTests(unittest.TestCase):
+
+    def test_schedules(self):
+        # test the pairings of round-robin and Swiss rounds
+        self.assertEqual(tournament.round_robin(["a", "b", "c"]), [("a", "b"), ("a", "c"), ("b", "c")])
+        self.assertEqual(tournament.swiss(["a", "b", "c", "d"], []), [("a", "b"), ("c", "d")])
+
+        games = [game(0, "a", "b", "o"), game(0, "b", "a", "x"), game(0, "c", "d", "x"), game(0, "d", "c", "draw")]
+        self.assertEqual(tournament.swiss(["a", "b", "c", "d"], games), [("b", "c"), ("d", "a")])
+
+        first = tournament.swiss(["a", "b", "c"], [])
+        self.assertEqual(first, [("a", "b")])
+        games = [game(0, "a", "b", "draw"), game(0, "b", "a", "draw")]
+        self.assertEqual(len(tournament.swiss(["a", "b", "c"], games)), 1)
+        self.assertIn("c", tournament.swiss(["a", "b", "c"], games)[0])
+
+    def test_ratings(self):
+        # test that ratings favor the winner and are narrower with more games
+        games = [game(r, "a", "b", "x") for r in range(10)] + [game(r, "b", "a", "draw") for r in range(10)]
+        elos = tournament.elo(["a", "b"], games)
+        glickos = tournament.glicko(["a", "b"], games)
+        self.assertGreater(elos["a"][0], elos["b"][0])
+        self.assertAlmostEqual(elos["a"][0] + elos["b"][0], 2 * tournament.ELO_START)
+        self.assertGreater(glickos["a"][0], glickos["b"][0])
+        self.assertLess(glickos["a"][1], tournament.Z95 * tournament.GLICKO_RD)
+        self.assertLess(tournament.elo(["a", "b"], games * 2)["a"][1], elos["a"][1])
+
+    def test_run(self):
+        # test that a tournament is checkpointed and resumed without replaying games
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "results.jsonl")
+            first = tournament.Tournament(["random", "unbeatable"], rounds=2, processes=2, checkpoint=path)
+            games = first.run()
+            self.assertEqual(len(games), 4)
+            self.assertTrue(all(g["result"] != "x" or g["x"] == "unbeatable" for g in games))
+            self.assertTrue(all(g["result"] != "o" or g["o"] == "unbeatable" for g in games))
+
+            with open(path, "r", encoding="utf8") as f:
+                lines = [json.loads(line) for line in f]
+            self.assertEqual(sorted(g["id"] for g in lines), sorted(g["id"] for g in games))
+
+            second = tournament.Tournament(["random", "unbeatable"], rounds=3, processes=2, checkpoint=path)
+            self.assertEqual(len(second.games), 4)
+            self.assertEqual(len(second.run()), 6)
+            standings = second.standings()
+            self.assertEqual(standings[0][0], "unbeatable")
+            self.assertEqual(standings[0][1], 6)
+
+        with self.assertRaises(ValueError):
+            tournament.Tournament(["nobody"])
+
+    def test_truncated(self):
+        # test that a checkpoint whose last result was cut off resumes, and that later results stay readable
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "results.jsonl")
+            games = tournament.Tournament(["random", "flawed"], processes=1, checkpoint=path).run()
+            with open(path, "r", encoding="utf8") as f:
+                text = f.read()
+            with open(path, "w", encoding="utf8") as f:
+                f.write(text[:-10])
+
+            resumed = tournament.Tournament(["random", "flawed"], rounds=2, processes=1, checkpoint=path)
+            self.assertEqual(len(resumed.games), len(games) - 1)
+            self.assertEqual(len(resumed.run()), 2 * len(games))
+            with open(path, "r", encoding="utf8") as f:
+                self.assertEqual(len([json.loads(line) for line in f]), 2 * len(games))
+
+            with open(path, "a", encoding="utf8") as f:
+                f.write(text.splitlines()[0])
+            self.assertEqual(len(tournament.Tournament(["random", "flawed"], checkpoint=path).games), 2 * len(games))
+            with open(path, "r", encoding="utf8") as f:
+                self.assertTrue(f.read().endswith("\n"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+"""Command-Line Ultimate TicTacToe Unit Tests
+
+This script allows the user to perform unit tests on the engine
+and the search of Ultimate TicTacToe.
+"""
+
+import random
+import time
+import unittest
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/../cmdgames")
+import gameio
+import gameloader
+
+tictactoe = gameloader.load_game("tictactoe")
+ultimate = gameloader.load_game("tictactoe", "ultimate")
+
+x = tictactoe.var.PLAYER_ONE
+o = tictactoe.var.PLAYER_TWO
+e = tictactoe.var.EMPTY_SPACE
+
+def snapshot(game):
+    return ([list(s) for s in game._stones], list(game._won), game._closed, game._target, game.player, game.winner)
+
+class UltimateTests(unittest.TestCase):
+
+    def test_win_table(self):
+        # test that the win table agrees with the rules of a TicTacToe._State for every board
+        for mask in range(ultimate.FULL + 1):
+            board = [[x if mask >> (r * 3 + c) & 1 else e for c in range(3)] for r in range(3)]
+            state = tictactoe.TicTacToe._State(board, o)
+            self.assertEqual(bool(ultimate.WINS[mask]), state.winner == x)
+
+    def test_forced_board(self):
+        # test that a move sends the opponent to the board of its cell, unless that board is closed
+        game = ultimate.Ultimate()
+        self.assertEqual(len(game.moves()), 81)
+        game.play(4 * 9 + 2)
+        self.assertEqual(game.target, 2)
+        self.assertEqual(game.moves(), list(range(18, 27)))
+        for move in (2 * 9 + 4, 4 * 9 + 1, 1 * 9 + 4, 4 * 9 + 0, 0 * 9 + 4):
+            game.play(move)
+        self.assertEqual(game._won[0], 1 << 4)
+        self.assertIsNone(game.target)
+        self.assertEqual(len(game.moves()), 81 - 9 - 3)
+        self.assertEqual(game.cell(3, 3), x)
+        self.assertEqual(game.cell(1, 1), o)
+        self.assertEqual(str(game).splitlines()[5], "4        | X X X |      ")
+
+    def test_undo(self):
+        # test that undoing every move of random games restores every position
+        rng = random.Random(3)
+        game = ultimate.Ultimate()
+        for _ in range(50):
+            snapshots = []
+            while not game.is_terminal:
+                snapshots.append(snapshot(game))
+                game.play(rng.choice(game.moves()))
+            self.assertTrue(game.winner is not None or game._closed == ultimate.FULL)
+            while snapshots:
+                game.undo()
+                self.assertEqual(snapshot(game), snapshots.pop())
+
+    def test_search(self):
+        # test that the search leaves the game as it was and wins when it can
+        game = ultimate.Ultimate()
+        for move in (4 * 9 + 2, 2 * 9 + 4, 4 * 9 + 1, 1 * 9 + 4):
+            game.play(move)
+        before = snapshot(game)
+        move = ultimate.search(game, iterations=200, rng=random.Random(1))
+        self.assertEqual(snapshot(game), before)
+        self.assertIn(move, game.moves())
+        self.assertIn(ultimate.search(game, time_limit=0), game.moves())
+
+        # a search whose deadline has passed still returns a move after one iteration
+        stats = {}
+        move = ultimate.search(game, deadline=time.monotonic() - 1, stats=stats)
+        self.assertIn(move, game.moves())
+        self.assertEqual(stats["nodes"], 1)
+        self.assertGreaterEqual(stats["depth"], 1)
+        self.assertEqual(snapshot(game), before)
+
+        # X has won the first two small boards and can take the third.
+        game = ultimate.Ultimate()
+        game._stones[0][0], game._stones[0][1], game._stones[0][2] = 0b111, 0b111, 0b011
+        game._stones[1][3], game._stones[1][5], game._stones[1][7] = 0b011, 0b011, 0b011
+        game._won[0] = game._closed = 0b11
+        game._target = 2
+        self.assertEqual(ultimate.search(game, iterations=500, rng=random.Random(1)), 2 * 9 + 2)
+
+    def test_play(self):
+        # test the messages of a scripted two-player game
+        io = gameio.ScriptedIO(["2", "5", "5", "5", "5", "1", "1", "4", "6"])
+        with self.assertRaises(EOFError):
+            gameio.run(ultimate.play(delay=0), io)
+        self.assertIn("You must play in the board at row 2 and column 2.", io.output)
+        self.assertIn("Sorry, that space has already been taken!", io.output)
+        self.assertIn("Sorry, you must play in the board you were sent to!", io.output)
+        self.assertIn("You must play in the board at row 3 and column 1.", io.output)
+
+if __name__ == "__main__":
+    unittest.main()
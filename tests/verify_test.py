@@ -0,0 +1,48 @@
+"""Command-Line TicTacToe Verification Unit Tests
+
+This script allows the user to perform unit tests on the check of
+every TicTacToe position against the game tree.
+"""
+
+import multiprocessing
+import random
+import unittest
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/../cmdgames/tictactoe")
+import agents
+import verify
+from tictactoe import TicTacToe
+
+class VerifyTests(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.game = TicTacToe()
+
+    def test_every_position(self):
+        # test that every reachable position passes in parallel, and that the workers are given back
+        size, failures = verify.verify(self.game, processes=2)
+        self.assertEqual(size, 5478)
+        self.assertEqual(failures, [])
+        self.assertIsNone(verify._shared)
+
+    def test_spawn(self):
+        # test that the workers only need plain data and the published games, so they can be spawned
+        size, failures = verify.verify(self.game, processes=2, context=multiprocessing.get_context("spawn"))
+        self.assertEqual((size, failures), (5478, []))
+
+    def test_failures(self):
+        # test that an agent that plays randomly is caught
+        select_move = agents.UnbeatableAgent.select_move
+        agents.UnbeatableAgent.select_move = lambda agent, state: random.choice(state.children)
+        try:
+            _, failures = verify.verify(self.game, processes=1)
+        finally:
+            agents.UnbeatableAgent.select_move = select_move
+        self.assertTrue(failures)
+        self.assertTrue(all("UnbeatableAgent" in failure for failure in failures))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+"""Command-Line TicTacToe Warm-Up Unit Tests
+
+This script allows the user to perform unit tests on the background
+build of the TicTacToe game tree.
+"""
+
+import pickle
+import time
+import unittest
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.realpath(__file__)) + "/../cmdgames")
+import gameio
+import gameloader
+
+tictactoe = gameloader.load_game("tictactoe")
+warmup = tictactoe.warmup
+
+STATES = 549946 # the number of States in the whole game tree
+
+def count(state):
+    """Return the number of States in the subtree of (state)."""
+    return 1 + sum(count(child) for child in state._children)
+
+def shape(state):
+    """Return the boards and winners of the subtree of (state), in order."""
+    return state.board, state.winner, [shape(child) for child in state._children]
+
+class WarmupTests(unittest.TestCase):
+
+    def test_dialog(self):
+        # test that the progress of a build is shown while the game loads, and that the whole tree is built
+        loader = warmup.Warmup(tictactoe.TicTacToe, processes=1)
+        io = gameio.ScriptedIO(["0", "1", "1", "n"])
+        gameio.run(tictactoe.play(loader), io)
+        self.assertIn("Built 9 of 9 openings...", io.output)
+        self.assertTrue(loader.done)
+        self.assertEqual(loader.progress, (9, 9))
+        self.assertEqual(count(loader.result().root), STATES)
+
+        io = gameio.ScriptedIO(["0", "1", "1", "n"])
+        gameio.run(tictactoe.play(loader), io)
+        self.assertNotIn("openings...", io.output)
+
+    def test_opening(self):
+        # test that an opening built by a worker is sent back as a plain buffer and matches one built in place
+        expected = warmup._root(tictactoe.TicTacToe)._children[4]
+        task = (4, expected.board, expected.player)
+        i, buffer = warmup._build_opening(pickle.loads(pickle.dumps(task)))
+        self.assertEqual(i, 4)
+        self.assertIsInstance(buffer, bytes)
+        tictactoe.TicTacToe(expected)._generate_tree(expected)
+        self.assertEqual(shape(warmup.flattree.FlatTree(buffer).root), shape(expected))
+
+    def test_game(self):
+        # test that a game on a built tree can be played, suspended and resumed
+        game = warmup.Warmup(tictactoe.TicTacToe, processes=2).result()
+        game.move_to(game.state._children[4])
+        game.move_to(game.state._children[0])
+        state = game.state
+        game.resume(game.suspend())
+        self.assertEqual(game.state, state)
+        self.assertEqual(game._moves, [4, 0])
+
+    def test_cancel(self):
+        # test that a build stops soon after it is cancelled and leaves no game
+        for processes in (1, 2):
+            loader = warmup.Warmup(tictactoe.TicTacToe, processes=processes).start()
+            start = time.monotonic()
+            loader.cancel()
+            self.assertLess(time.monotonic() - start, 2)
+            self.assertTrue(loader.done)
+            self.assertIsNone(loader.result())
+
+if __name__ == "__main__":
+    unittest.main()